@@ -0,0 +1,146 @@
+"""Benchmarks of the core hot paths, run with pytest-benchmark.
+
+Run from the repository root with:
+    python -m benchmarks.regression
+
+See benchmarks/regression.py for saving baselines and regression gating.
+"""
+
+from functools import partial
+import random
+import pytest
+from src.core import ActionType, Battle, Character, Menu
+from src.core.battle_log import BattleLog, LogEvent
+from src.core.instrumentation import Instrumentation
+from src.core.rng import CounterRandom
+from src.core.team import TeamBattle
+from src.core.roster import Archetype, SpecialEffect
+
+pytest.importorskip("pytest_benchmark")
+
+# Characters that never fall and can use their heal every turn, so repeated
+# turns keep exercising the same code path
+_ENDLESS = Archetype(
+    "Endless",
+    20,
+    10,
+    10**9,
+    "Regenerate",
+    special_cooldown=0,
+    special_effect=SpecialEffect.HEAL,
+    special_amount=1,
+)
+
+
+@pytest.fixture
+def battle():
+    """A battle between two endless characters that never prints."""
+
+    battle = Battle(
+        False,
+        Character.from_archetype(_ENDLESS, True),
+        Character.from_archetype(_ENDLESS),
+        rng=CounterRandom(0),
+    )
+    battle.print_outcome = False
+    return battle
+
+
+@pytest.mark.benchmark(group="handle_turn")
+@pytest.mark.parametrize(
+    "action",
+    [ActionType.ATTACK, ActionType.DEFEND, ActionType.SPECIAL, ActionType.SKIP],
+    ids=lambda action: action.value,
+)
+def test_handle_turn(benchmark, battle, action):
+    benchmark(battle.handle_turn, action)
+
+
+@pytest.mark.benchmark(group="handle_turn")
+def test_handle_turn_instrumented(benchmark, battle):
+    battle.instrumentation = Instrumentation()
+    benchmark(battle.handle_turn, ActionType.DEFEND)
+
+
+@pytest.mark.benchmark(group="battle")
+@pytest.mark.parametrize("log_capacity", [0, 100], ids=["headless", "logged"])
+def test_full_battle(benchmark, log_capacity):
+    """A whole battle between roster characters, both played by the enemy AI."""
+
+    seeds = iter(range(10**9))
+
+    def play():
+        battle = Battle(
+            False,
+            Menu.characters[0](player_character=True),
+            Menu.characters[-1](),
+            rng=CounterRandom(next(seeds)),
+            log_capacity=log_capacity,
+        )
+        battle.print_outcome = False
+        while not battle._game_over:
+            battle.enemy_turn()
+
+    benchmark(play)
+
+
+@pytest.mark.benchmark(group="battle")
+def test_raid_turn(benchmark):
+    """A turn of a 50v50 battle between endless characters."""
+
+    raid = TeamBattle(
+        [[Character.from_archetype(_ENDLESS) for _ in range(50)] for _ in range(2)],
+        rng=CounterRandom(0),
+    )
+    benchmark(raid.handle_turn)
+
+
+@pytest.mark.benchmark(group="character")
+def test_take_damage(benchmark):
+    character = Character.from_archetype(_ENDLESS)
+    benchmark(character.take_damage, 7)
+
+
+@pytest.mark.benchmark(group="character")
+def test_take_damage_defending(benchmark):
+    character = Character.from_archetype(_ENDLESS)
+
+    def defended_hit():
+        character.is_defending = True
+        character.take_damage(7)
+
+    benchmark(defended_hit)
+
+
+@pytest.mark.benchmark(group="character")
+def test_heal(benchmark):
+    character = Character.from_archetype(_ENDLESS)
+    character.current_hp = 1
+    benchmark(character.heal, 1)
+
+
+@pytest.mark.benchmark(group="character")
+@pytest.mark.parametrize("hp", [100, 10], ids=["offensive", "defensive"])
+def test_get_enemy_action(benchmark, hp):
+    character = Character.from_archetype(_ENDLESS)
+    character.current_hp = hp
+    benchmark(character.get_enemy_action, CounterRandom(0))
+
+
+@pytest.mark.benchmark(group="battle_log")
+@pytest.mark.parametrize("capacity", [None, 100], ids=["unbounded", "bounded"])
+def test_battle_log_growth(benchmark, capacity):
+    """Recording 1000 events, the log of a long battle."""
+
+    def grow():
+        log = BattleLog(capacity)
+        for _ in range(1000):
+            log.record(LogEvent.ATTACK, "Rust", "C++", 12)
+
+    benchmark(grow)
+
+
+@pytest.mark.benchmark(group="menu")
+def test_character_selection(benchmark):
+    menu = Menu()
+    benchmark(partial(menu.character_selection, 0, random.Random(0)))
@@ -0,0 +1,75 @@
+"""Measure frames per second of the battle screen without a display.
+
+Run from the repository root with:
+    python -m benchmarks.gui_fps
+    python -m benchmarks.gui_fps --full-redraw
+
+Uses the SDL dummy video driver unless SDL_VIDEODRIVER is set, and renders
+frames as fast as possible while both sides are played by the enemy AI, one
+turn every --turn-every frames. --full-redraw repaints the whole window every
+frame, to compare against the dirty rect updates.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import time
+import pygame
+from src.core import Battle, Menu
+from src.ui.screens.battle_screen import BattleScreen
+from src.utils.asset_loader import AssetLoader
+from src.utils.constants import SCREEN_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the battle screen.")
+    parser.add_argument("--frames", type=int, default=6000)
+    # A turn every half second at 60 FPS, like a player on a kiosk
+    parser.add_argument("--turn-every", type=int, default=30)
+    parser.add_argument("--full-redraw", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    surface = pygame.display.set_mode(SCREEN_SIZE)
+    assets = AssetLoader()
+    characters = Menu.characters
+    seed = args.seed
+    screen = None
+    frames = dirty_pixels = 0
+
+    start = time.perf_counter()
+    for frame in range(args.frames):
+        if screen is None or screen.battle._game_over:
+            if screen is not None:
+                frames += screen.frames
+                dirty_pixels += screen.dirty_pixels
+            battle = Battle(
+                False,
+                characters[seed % len(characters)](player_character=True),
+                characters[(seed + 1) % len(characters)](),
+                rng=seed,
+            )
+            battle.print_outcome = False
+            screen = BattleScreen(battle, surface, assets, args.full_redraw)
+            seed += 1
+        pygame.event.pump()
+        if frame % args.turn_every == 0:
+            screen.play(battle.player_character.get_enemy_action(battle.rng))
+        screen.render()
+    elapsed = time.perf_counter() - start
+    frames += screen.frames
+    dirty_pixels += screen.dirty_pixels
+    pygame.quit()
+
+    width, height = SCREEN_SIZE
+    lookups = assets.text_hits + assets.text_misses
+    print(f"{frames} frames in {elapsed:.2f} s: {frames / elapsed:,.0f} FPS")
+    print(f"Pushed to the display: {dirty_pixels / frames / (width * height):.1%}")
+    print(f"Text cache hit rate: {assets.text_hits / lookups:.1%}")
+
+
+if __name__ == "__main__":
+    main()
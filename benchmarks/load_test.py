@@ -0,0 +1,293 @@
+"""Drive many concurrent simulated players and report throughput and latency.
+
+Players either run in this process, each picking characters through
+Menu.character_selection and playing through Battle.handle_turn, or connect to
+the asyncio battle server. Run from the repository root with:
+    python -m benchmarks.load_test --players 1000
+    python -m benchmarks.load_test --players 1000 --server
+    python -m benchmarks.load_test --players 1000 --port 8765
+
+The last form targets a server that is already running; the --server form
+starts one in this process.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from src.core import ActionType, Battle, Menu
+from src.core.rng import CounterRandom
+from src.core.server import SESSION_LOG_CAPACITY, BattleClient, BattleServer
+
+# Actions the simulated players pick from
+ACTIONS = (ActionType.ATTACK, ActionType.DEFEND, ActionType.SPECIAL)
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Per-turn latencies, in seconds, with percentiles and power of two buckets."""
+
+    def __init__(self):
+        self.samples = array("d")
+        self._sorted: Optional[List[float]] = None
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self._sorted = None
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, percent: float) -> float:
+        """Latency below which the given percentage of turns completed."""
+
+        if not self.samples:
+            return 0.0
+        if self._sorted is None:
+            self._sorted = sorted(self.samples)
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * percent / 100))
+        return self._sorted[index]
+
+    def buckets(self) -> List[tuple]:
+        """Count turns by latency, in buckets from 2**k to 2**(k+1) microseconds."""
+
+        counts = {}
+        for seconds in self.samples:
+            bucket = max(0, int(seconds * 1e6)).bit_length()
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return [
+            (1 << bucket >> 1, 1 << bucket, counts.get(bucket, 0))
+            for bucket in range(min(counts, default=0), max(counts, default=-1) + 1)
+        ]
+
+    def format(self, width: int = 40) -> str:
+        """Render the histogram as text bars."""
+
+        rows = self.buckets()
+        peak = max((count for _, _, count in rows), default=0)
+        lines = []
+        for low, high, count in rows:
+            bar = "#" * (round(width * count / peak) if peak else 0)
+            lines.append(f"{low:>9} - {high:<9} us {count:>9}  {bar}")
+        return "\n".join(lines)
+
+
+@dataclass
+class LoadReport:
+    """Results of one load test."""
+
+    mode: str
+    players: int
+    battles: int
+    turns: int
+    seconds: float
+    latency: LatencyHistogram
+    # Traced allocations per connected player, None when not measurable
+    bytes_per_session: Optional[float]
+
+    def turns_per_second(self) -> float:
+        return self.turns / self.seconds if self.seconds else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"mode: {self.mode}, players: {self.players}, battles: {self.battles}",
+            f"turns: {self.turns} in {self.seconds:.2f} s "
+            f"({self.turns_per_second():.0f} turns/s)",
+            "latency: "
+            + ", ".join(
+                f"p{percent} {self.latency.percentile(percent) * 1e3:.3f} ms"
+                for percent in PERCENTILES
+            ),
+        ]
+        if self.bytes_per_session is not None:
+            lines.append(f"memory per session: {self.bytes_per_session:.0f} bytes")
+        lines.append(self.latency.format())
+        return "\n".join(lines)
+
+
+class _Swarm:
+    """Shared state of the simulated players of one load test.
+
+    Memory is traced only while players connect and select their characters,
+    so tracing never slows down the timed turns. The clock starts once every
+    player is ready to play.
+    """
+
+    def __init__(self, players: int, seed: int, trace_memory: bool):
+        self.players = players
+        self.rng = random.Random(seed)
+        self.latency = LatencyHistogram()
+        self.turns = 0
+        self.battles = 0
+        self.trace_memory = trace_memory
+        self.bytes_per_session: Optional[float] = None
+        self.started = 0.0
+        self._ready = asyncio.Barrier(players + 1)
+
+    async def start(self):
+        """Wait until every player is ready, then start the clock."""
+
+        if self.trace_memory:
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+        await self._ready.wait()
+        if self.trace_memory:
+            traced = tracemalloc.get_traced_memory()[0] - baseline
+            tracemalloc.stop()
+            self.bytes_per_session = traced / self.players
+        self.started = time.perf_counter()
+
+    async def ready(self):
+        await self._ready.wait()
+
+    def action(self) -> ActionType:
+        return self.rng.choice(ACTIONS)
+
+
+async def _in_process_player(swarm: _Swarm, battles: int, think_time: float):
+    """Play battles through Menu.character_selection and Battle.handle_turn."""
+
+    def new_battle() -> Battle:
+        menu = Menu()
+        menu.character_selection(swarm.rng.randrange(len(Menu.characters)), swarm.rng)
+        battle = Battle(
+            False,
+            menu.player_character,
+            menu.non_player_character,
+            rng=CounterRandom(swarm.rng.getrandbits(64)),
+            log_capacity=SESSION_LOG_CAPACITY,
+        )
+        battle.print_outcome = False
+        return battle
+
+    battle = new_battle()
+    await swarm.ready()
+    for played in range(battles):
+        if played:
+            battle = new_battle()
+        while not battle._game_over:
+            # Yield to the other players, as a session waiting on its client would
+            await asyncio.sleep(think_time)
+            action = swarm.action()
+            start = time.perf_counter()
+            battle.handle_turn(action)
+            if not battle._game_over:
+                battle.enemy_turn()
+            swarm.latency.record(time.perf_counter() - start)
+            swarm.turns += 1
+        swarm.battles += 1
+
+
+async def _client_player(
+    swarm: _Swarm, battles: int, think_time: float, host: str, port: int, path
+):
+    """Play battles against a server, timing every request and reply."""
+
+    client = await BattleClient.connect(host, port, path)
+    characters = (await client.receive())["characters"]
+    reply = await client.request(
+        {"type": "select", "character": swarm.rng.choice(characters)}
+    )
+    await swarm.ready()
+    for played in range(battles):
+        if played:
+            reply = await client.request(
+                {"type": "select", "character": swarm.rng.choice(characters)}
+            )
+        while reply["type"] != "end":
+            await asyncio.sleep(think_time)
+            message = {"type": "action", "action": swarm.action().value}
+            start = time.perf_counter()
+            reply = await client.request(message)
+            swarm.latency.record(time.perf_counter() - start)
+            swarm.turns += 1
+        swarm.battles += 1
+    await client.close()
+
+
+async def run_load_test(
+    players: int,
+    battles: int = 1,
+    think_time: float = 0.0,
+    seed: int = 0,
+    server: bool = False,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+    path: Optional[str] = None,
+    trace_memory: bool = True,
+) -> LoadReport:
+    """Run players concurrently until each has played the given number of battles.
+
+    Players run in this process unless server is set, which starts a battle
+    server here, or a port or Unix socket path of a running server is given.
+    Memory per session is only measured for players in this process or an
+    in-process server, in which case it includes the client side.
+    """
+
+    remote = port is not None or path is not None
+    swarm = _Swarm(players, seed, trace_memory and not remote)
+    local_server = None
+    if server and not remote:
+        local_server = BattleServer(seed=seed)
+        listener = await local_server.start(host)
+        port = listener.sockets[0].getsockname()[1]
+    clock = asyncio.create_task(swarm.start())
+
+    if server or remote:
+        mode = "server" if local_server else "remote server"
+        tasks = [
+            _client_player(swarm, battles, think_time, host, port, path)
+            for _ in range(players)
+        ]
+    else:
+        mode = "in process"
+        tasks = [_in_process_player(swarm, battles, think_time) for _ in range(players)]
+    await asyncio.gather(clock, *tasks)
+    seconds = time.perf_counter() - swarm.started
+
+    if local_server is not None:
+        await local_server.close()
+    return LoadReport(
+        mode,
+        players,
+        swarm.battles,
+        swarm.turns,
+        seconds,
+        swarm.latency,
+        swarm.bytes_per_session,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the battle loop.")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--battles", type=int, default=1, help="battles per player")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--server", action="store_true", help="start a server here")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--unix", default=None, help="Unix socket of a server")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_load_test(
+            args.players,
+            args.battles,
+            args.think_time,
+            args.seed,
+            args.server,
+            args.host,
+            args.port,
+            args.unix,
+        )
+    )
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Measure the memory held by live battles and characters.
+
+Run from the repository root with:
+    python -m benchmarks.memory_per_battle
+"""
+
+from typing import Callable
+import argparse
+import gc
+import tracemalloc
+from src.core import Battle, Menu
+from src.core.rng import PythonRandom
+
+
+def bytes_per_object(factory: Callable[[int], object], count: int) -> float:
+    """Average traced allocation size of count live objects built by factory."""
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory per battle.")
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    characters = Menu.characters
+    shared_rng = PythonRandom(0)
+
+    def character(index: int):
+        return characters[index % len(characters)]()
+
+    def battle(index: int, rng=None):
+        return Battle(False, character(index), character(index + 1), rng=rng)
+
+    measurements = {
+        "character": character,
+        "battle": battle,
+        "battle (shared rng)": lambda index: battle(index, shared_rng),
+    }
+    for name, factory in measurements.items():
+        print(f"{name:>20}: {bytes_per_object(factory, args.count):8.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
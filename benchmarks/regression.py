@@ -0,0 +1,83 @@
+"""Run the core benchmarks and fail when they regress against a saved baseline.
+
+Needs pytest-benchmark (pip install pytest-benchmark). Run from the
+repository root with:
+    python -m benchmarks.regression --save
+    python -m benchmarks.regression
+    python -m benchmarks.regression --threshold 30
+
+The first form records a baseline for this machine. Later runs compare every
+benchmark with it and fail when its fastest round gets slower by more than the
+threshold, in percent. Every run is also kept in .benchmarks, so numbers can
+be tracked over time with pytest-benchmark compare.
+"""
+
+from pathlib import Path
+from typing import List
+import argparse
+import sys
+import pytest
+
+BENCHMARKS = Path(__file__).with_name("bench_core.py")
+STORAGE = Path(__file__).resolve().parents[1] / ".benchmarks"
+# Allowed slowdown of a benchmark's fastest round, in percent. The minimum is
+# compared because it is the statistic least affected by a busy machine
+DEFAULT_THRESHOLD = 20
+# Shortest round, in seconds. Most hot paths take a few microseconds, so each
+# round repeats them enough times to rise well above the timer's resolution
+MIN_ROUND_TIME = 0.001
+
+
+def baseline_path() -> Path:
+    """Baseline of this machine, since timings only compare on the same machine."""
+
+    from pytest_benchmark.utils import get_machine_id
+
+    return STORAGE / get_machine_id() / "baseline.json"
+
+
+def pytest_args(save: bool, threshold: float) -> List[str]:
+    """Arguments running the benchmarks and either saving or checking a baseline."""
+
+    args = [
+        str(BENCHMARKS),
+        f"--benchmark-storage=file://{STORAGE}",
+        "--benchmark-autosave",
+        "--benchmark-warmup=on",
+        f"--benchmark-min-time={MIN_ROUND_TIME}",
+        "--benchmark-columns=min,median,mean,stddev,ops",
+        "--benchmark-sort=name",
+    ]
+    baseline = baseline_path()
+    if save:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        return args + [f"--benchmark-json={baseline}"]
+    return args + [
+        f"--benchmark-compare={baseline}",
+        f"--benchmark-compare-fail=min:{threshold:g}%",
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the core hot paths.")
+    parser.add_argument("--save", action="store_true", help="record a new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    try:
+        from pytest_benchmark.session import PerformanceRegression
+    except ImportError:
+        print("The benchmarks need pytest-benchmark: pip install pytest-benchmark")
+        return 2
+    if not args.save and not baseline_path().is_file():
+        print("No baseline for this machine yet, record one with --save")
+        return 2
+    try:
+        return pytest.main(pytest_args(args.save, args.threshold))
+    except PerformanceRegression:
+        # The regressed benchmarks are listed above the exception
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Measure the import time of the game's entry points and check it against budgets.
+
+Run from the repository root with:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 20 --budget-scale 2
+
+Each entry point is imported in a fresh interpreter under python -X importtime,
+the way a text battle or a process pool worker starts. Interpreter startup is
+measured separately and subtracted. Fails when an entry point loads pygame,
+which only the GUI needs, or when its median import time is over budget.
+"""
+
+from pathlib import Path
+from statistics import median
+from typing import Dict, Set, Tuple
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+# Code importing each entry point, and its import time budget in milliseconds.
+# The budgets leave room for slow machines, pygame alone takes several times
+# longer to import
+ENTRY_POINTS: Dict[str, Tuple[str, float]] = {
+    "src/main.py": ("import sys; sys.path.insert(0, 'src'); import main", 60.0),
+    "simulation": ("import src.core.simulation", 60.0),
+    "tournament worker": ("import src.core.tournament", 80.0),
+}
+# Modules that must never be imported outside the GUI
+FORBIDDEN = ("pygame",)
+
+
+def import_times(code: str) -> Tuple[Dict[str, int], Set[str]]:
+    """Import time of code's top level imports, in microseconds, and every module.
+
+    Top level imports are those not nested under another import, and their
+    cumulative time includes the modules they import.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules.add(name.strip())
+        # Nested imports are indented under the module importing them
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times, modules
+
+
+def measure(code: str, startup: Set[str]) -> Tuple[float, Set[str]]:
+    """Import time of code in milliseconds, and every module it loaded."""
+
+    times, modules = import_times(code)
+    elapsed = sum(time for name, time in times.items() if name not in startup)
+    return elapsed / 1000, modules - startup
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure entry point import time.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="multiply every budget"
+    )
+    args = parser.parse_args()
+
+    # Modules loaded by the interpreter itself before running any code
+    startup = import_times("pass")[1]
+    failed = False
+    for label, (code, budget) in ENTRY_POINTS.items():
+        samples = []
+        for _ in range(args.repeat):
+            elapsed, loaded = measure(code, startup)
+            samples.append(elapsed)
+        budget *= args.budget_scale
+        forbidden = sorted({name.split(".")[0] for name in loaded} & set(FORBIDDEN))
+        elapsed = median(samples)
+        status = "ok"
+        if forbidden:
+            status = "FAIL: imports " + ", ".join(forbidden)
+        elif elapsed > budget:
+            status = "FAIL: over budget"
+        failed = failed or status != "ok"
+        print(f"{label:<20} {elapsed:7.1f} ms (budget {budget:.0f} ms)  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,32 @@
-from .character import Character, cPlusPlus, Python, Rust
-from .battle import Battle
-from .action import ActionType
-from .character_selection import Menu
+from importlib import import_module
 
-__all__ = ["Character", "Battle", "ActionType", "cPlusPlus", "Python", "Rust", "Menu"]
+# Public names and the modules defining them. Modules are only imported when
+# one of their names is first used, so e.g. simulation workers never load the
+# battle or menu code
+_EXPORTS = {
+    "Character": ".character",
+    "Battle": ".battle",
+    "ActionType": ".action",
+    "cPlusPlus": ".character",
+    "Python": ".character",
+    "Rust": ".character",
+    "Menu": ".character_selection",
+    "simulate": ".simulation",
+    "SimulationResult": ".simulation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Cache the name so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,217 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional, Tuple
+from .battle import Battle
+from .rng import CounterRandom
+from .roster import Archetype, default_roster
+from .simulation import DEFAULT_MAX_TURNS, CharacterFactory, SimulationResult
+from .snapshot import (
+    FORMAT_VERSION,
+    HEADER,
+    MAGIC,
+    RNG_COUNTER,
+    SnapshotReader,
+    pack_into,
+    snapshot_size,
+)
+
+# Battles stepped per task
+DEFAULT_SHARD_SIZE = 1000
+# Distance between the random streams of consecutive battles. Every battle
+# shares the seed as its CounterRandom key, and no battle draws this many
+# numbers
+STREAM_STRIDE = 1 << 32
+
+
+class BattleArena:
+    """Combat state of many battles in one shared memory block.
+
+    The block is laid out as a snapshot of CounterRandom battles, so every
+    battle is a fixed-size record. Any process attaching to the block by name
+    can restore a battle, step it and write it back in place: only the name
+    and index ranges cross process boundaries, never Battle objects.
+    """
+
+    def __init__(self, memory: SharedMemory, owner: bool = False):
+        self.memory = memory
+        # Whether this arena created the block and unlinks it on exit
+        self.owner = owner
+        self._reader: Optional[SnapshotReader] = SnapshotReader(memory.buf)
+
+    @classmethod
+    def create(cls, count: int, name: Optional[str] = None) -> "BattleArena":
+        """Allocate a shared memory block for count battles."""
+
+        memory = SharedMemory(name, create=True, size=snapshot_size(count))
+        HEADER.pack_into(memory.buf, 0, MAGIC, FORMAT_VERSION, RNG_COUNTER, count)
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "BattleArena":
+        """Open an arena created by another process."""
+
+        return cls(SharedMemory(name))
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def __len__(self) -> int:
+        return len(self._reader)
+
+    def store(self, index: int, battle: Battle):
+        """Write a battle into its record."""
+
+        pack_into(self.memory.buf, index, battle)
+
+    def load(
+        self,
+        index: int,
+        roster: Optional[Dict[str, Archetype]] = None,
+        log_capacity: Optional[int] = 0,
+    ) -> Battle:
+        """Restore the battle in a record, headless unless log_capacity is set."""
+
+        return self._reader.restore(index, roster, log_capacity)
+
+    def step(
+        self,
+        start: int,
+        stop: int,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        roster: Optional[Dict[str, Archetype]] = None,
+    ) -> int:
+        """Play battles start to stop with the enemy AI on both sides, in place.
+
+        Each battle runs until it is over or reaches max_turns, so stepping
+        in several calls with growing limits gives the same battles as one
+        call. Records only keep combat state, so characters get their special
+        ability from the archetype of the same name in the roster, which
+        defaults to config/characters.json. Returns the number of turns played.
+        """
+
+        roster = default_roster() if roster is None else roster
+        played = 0
+        for index in range(start, stop):
+            battle = self.load(index, roster)
+            turn = battle.current_turn
+            while not battle._game_over and battle.current_turn < max_turns:
+                battle.enemy_turn()
+            if battle.current_turn != turn:
+                played += battle.current_turn - turn
+                self.store(index, battle)
+        return played
+
+    def result(self, start: int = 0, stop: Optional[int] = None) -> SimulationResult:
+        """Outcomes of a range of battles, read from the records in place.
+
+        Battles that are not over count as timeouts. Only the battle and
+        turn statistics are filled in.
+        """
+
+        reader = self._reader
+        stop = len(reader) if stop is None else stop
+        names = reader.record(start)[3::9][:2] if stop > start else (b"", b"")
+        result = SimulationResult(
+            matchup=tuple(name.rstrip(b"\0").decode() for name in names)
+        )
+        for index in range(start, stop):
+            turn, game_over = reader.record(index)[:2]
+            player_hp, enemy_hp = reader.hit_points(index)
+            if not game_over:
+                result.timeouts += 1
+            elif enemy_hp <= 0:
+                result.wins[0] += 1
+            elif player_hp <= 0:
+                result.wins[1] += 1
+            result.turn_counts[turn] += 1
+        result.battles = stop - start
+        return result
+
+    def close(self):
+        """Detach from the block, unlinking it if this arena created it."""
+
+        if self._reader is not None:
+            self._reader.release()
+            self._reader = None
+            self.memory.close()
+            if self.owner:
+                self.memory.unlink()
+
+    def __enter__(self) -> "BattleArena":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _step_shard(
+    task: Tuple[str, int, int, int, Optional[Dict[str, Archetype]]],
+) -> int:
+    """Step a range of arena battles in a worker process, so it must stay top level."""
+
+    name, start, stop, max_turns, roster = task
+    arena = BattleArena.attach(name)
+    try:
+        return arena.step(start, stop, max_turns, roster)
+    finally:
+        arena.close()
+
+
+def step_arena(
+    arena: BattleArena,
+    workers: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    roster: Optional[Dict[str, Archetype]] = None,
+) -> int:
+    """Step every battle of an arena across a process pool.
+
+    A workers value of None uses every available core; 1 runs in this
+    process. The roster, as in BattleArena.step, is sent once per task.
+    Returns the number of turns played.
+    """
+
+    tasks = [
+        (arena.name, start, min(start + shard_size, len(arena)), max_turns, roster)
+        for start in range(0, len(arena), shard_size)
+    ]
+    if workers == 1:
+        return sum(arena.step(*task[1:]) for task in tasks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_step_shard, tasks))
+
+
+def simulate_shared(
+    matchup: Tuple[CharacterFactory, CharacterFactory],
+    n: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> SimulationResult:
+    """Play n Battles between two characters in a shared memory arena.
+
+    Unlike simulate, every turn runs through Battle.handle_turn. Battle i
+    draws from CounterRandom(seed) starting at i * STREAM_STRIDE, so the
+    result is identical for any number of workers. Battles are restored with
+    the archetypes of the matchup's characters, which may differ from the
+    default roster.
+    """
+
+    first, second = matchup[0](), matchup[1]()
+    roster = {character.name: character.archetype for character in (second, first)}
+    if first.name == second.name and first.archetype != second.archetype:
+        raise ValueError(f"Both sides are named {first.name!r} but differ in stats")
+    with BattleArena.create(n) as arena:
+        for index in range(n):
+            battle = Battle(
+                False,
+                matchup[0](),
+                matchup[1](),
+                rng=CounterRandom(seed, index * STREAM_STRIDE),
+                log_capacity=0,
+            )
+            arena.store(index, battle)
+        step_arena(arena, workers, max_turns, shard_size, roster)
+        return arena.result()
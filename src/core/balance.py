@@ -0,0 +1,312 @@
+from dataclasses import dataclass, replace
+from functools import partial
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+from .character import Character
+from .roster import Archetype, default_roster
+from .simulation import DEFAULT_MAX_TURNS, simulate
+
+# Tuned stats and their inclusive bounds
+DEFAULT_BOUNDS: Dict[str, Tuple[int, int]] = {
+    "attack_points": (10, 30),
+    "defense_points": (0, 20),
+    "max_hp": (60, 160),
+    "special_cooldown": (1, 5),
+}
+# Results of every evaluated matchup, kept between sweeps
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".balance_cache.json"
+# Bump whenever the game rules change, since cached results no longer apply
+CACHE_VERSION = 1
+
+# Tuned stats of every archetype, in the order of DEFAULT_BOUNDS
+Config = Tuple[Tuple[int, ...], ...]
+
+
+class ResultCache:
+    """Battle counts of matchups between stat settings, stored as JSON.
+
+    Entries are keyed by both characters' tuned stats and special ability, so
+    a matchup is reused by every config containing it. Asking for more
+    battles than an entry has only simulates the difference.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = DEFAULT_CACHE_PATH):
+        self.path = Path(path) if path is not None else None
+        # Key to [battles, first side wins, second side wins]
+        self.entries: Dict[str, List[int]] = {}
+        # Battles simulated since the cache was loaded
+        self.simulated = 0
+        if self.path is not None:
+            try:
+                data = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                self.entries = data["entries"]
+
+    def counts(
+        self,
+        first: Archetype,
+        second: Archetype,
+        battles: int,
+        max_turns: int = DEFAULT_MAX_TURNS,
+    ) -> List[int]:
+        """At least battles results of first moving against second."""
+
+        key = json.dumps([max_turns, _describe(first), _describe(second)])
+        entry = self.entries.setdefault(key, [0, 0, 0])
+        if entry[0] < battles:
+            missing = battles - entry[0]
+            # Seeded by the entry's content and size, so the results never
+            # depend on which sweep asked for them
+            digest = hashlib.blake2b(f"{key}:{entry[0]}".encode(), digest_size=8)
+            result = simulate(
+                (
+                    partial(Character.from_archetype, first),
+                    partial(Character.from_archetype, second),
+                ),
+                missing,
+                seed=int.from_bytes(digest.digest(), "big"),
+                max_turns=max_turns,
+            )
+            entry[0] += missing
+            entry[1] += result.wins[0]
+            entry[2] += result.wins[1]
+            self.simulated += missing
+        return entry
+
+    def save(self):
+        """Atomically write the cache, ignoring unwritable locations."""
+
+        if self.path is None:
+            return
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            temporary.write_text(
+                json.dumps({"version": CACHE_VERSION, "entries": self.entries})
+            )
+            os.replace(temporary, self.path)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+
+
+def _describe(archetype: Archetype) -> list:
+    """Everything about an archetype that affects its battles."""
+
+    return [
+        archetype.name,
+        *(getattr(archetype, stat) for stat in DEFAULT_BOUNDS),
+        list(vars(archetype.compiled_special).values()),
+    ]
+
+
+def apply_config(
+    archetypes: Sequence[Archetype], config: Config, stats: Sequence[str]
+) -> List[Archetype]:
+    """Copies of the archetypes with the tuned stats of a config."""
+
+    return [
+        replace(archetype, **dict(zip(stats, values)))
+        for archetype, values in zip(archetypes, config)
+    ]
+
+
+@dataclass
+class BalanceResult:
+    """Best stats found by a sweep and how they were evaluated."""
+
+    names: List[str]
+    stats: List[str]
+    config: Config
+    # Root mean square distance of the pairwise win rates from 50%, plus the
+    # share of battles that timed out
+    score: float
+    # Win rate of the first character of each pair, over both move orders
+    win_rates: Dict[Tuple[str, str], float]
+    # Battles the best config was scored with, per move order of every pair
+    battles: int
+    # Configs scored at least once
+    evaluated: int
+    # Battles simulated by this sweep, the rest came from the cache
+    simulated: int
+
+    def archetypes(self, archetypes: Sequence[Archetype]) -> List[Archetype]:
+        """The given archetypes with the best stats found."""
+
+        return apply_config(archetypes, self.config, self.stats)
+
+    def to_roster(self) -> List[dict]:
+        """The best stats as roster entries, to merge into config/characters.json."""
+
+        entries = []
+        for name, values in zip(self.names, self.config):
+            entry = {"name": name}
+            for stat, value in zip(self.stats, values):
+                if stat == "special_cooldown":
+                    entry["special_ability"] = {"cooldown": value}
+                else:
+                    entry[stat] = value
+            entries.append(entry)
+        return entries
+
+
+class _Sweep:
+    """Scores configs of a roster with the shared result cache."""
+
+    def __init__(self, archetypes, stats, cache: ResultCache, max_turns: int):
+        self.archetypes = archetypes
+        self.stats = stats
+        self.cache = cache
+        self.max_turns = max_turns
+
+    def evaluate(self, config: Config, battles: int):
+        """Score of a config with battles per move order, and its win rates."""
+
+        archetypes = apply_config(self.archetypes, config, self.stats)
+        squares = 0.0
+        timeouts = total = 0
+        win_rates = {}
+        for first, second in combinations(archetypes, 2):
+            forward = self.cache.counts(first, second, battles, self.max_turns)
+            backward = self.cache.counts(second, first, battles, self.max_turns)
+            wins = forward[1] + backward[2]
+            decisive = wins + forward[2] + backward[1]
+            rate = wins / decisive if decisive else 0.5
+            win_rates[(first.name, second.name)] = rate
+            squares += (rate - 0.5) ** 2
+            timeouts += forward[0] + backward[0] - decisive
+            total += forward[0] + backward[0]
+        score = math.sqrt(squares / len(win_rates)) + timeouts / total
+        return score, win_rates
+
+
+def optimize(
+    archetypes: Optional[Sequence[Archetype]] = None,
+    bounds: Optional[Dict[str, Tuple[int, int]]] = None,
+    candidates: int = 27,
+    min_battles: int = 200,
+    eta: int = 3,
+    rounds: int = 2,
+    seed: Optional[int] = 0,
+    cache: Optional[ResultCache] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> BalanceResult:
+    """Search stats bringing every pairwise win rate of a roster close to 50%.
+
+    Each round scores candidate configs with successive halving: all of them
+    with min_battles battles per matchup, then the best 1/eta with eta times
+    more battles, and so on until one is left. The first round starts from
+    the current stats and random configs; later rounds mix random configs
+    with small changes to the best so far. Results come from, and are saved
+    to, the cache, so repeating or extending a sweep only simulates new
+    battles. Raises ValueError for rosters of fewer than two archetypes.
+    """
+
+    if candidates < 1 or min_battles < 1 or rounds < 1:
+        raise ValueError("candidates, min_battles and rounds must be at least 1")
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    archetypes = list(archetypes or default_roster().values())
+    if len(archetypes) < 2:
+        raise ValueError("Balancing needs at least two archetypes")
+    bounds = bounds or DEFAULT_BOUNDS
+    stats = list(bounds)
+    cache = cache if cache is not None else ResultCache()
+    sweep = _Sweep(archetypes, stats, cache, max_turns)
+    rng = random.Random(seed)
+    evaluated = set()
+
+    def sample() -> Config:
+        return tuple(
+            tuple(rng.randint(*bounds[stat]) for stat in stats) for _ in archetypes
+        )
+
+    # Largest change to a stat when perturbing a config
+    steps = [max(1, (high - low) // 10) for low, high in bounds.values()]
+
+    def perturb(config: Config) -> Config:
+        return tuple(
+            tuple(
+                min(max(value + rng.randint(-step, step), low), high)
+                for value, (low, high), step in zip(values, bounds.values(), steps)
+            )
+            for values in config
+        )
+
+    best = tuple(
+        tuple(getattr(archetype, stat) for stat in stats) for archetype in archetypes
+    )
+    for _ in range(rounds):
+        pool = {best}
+        # Bounded, in case the bounds allow fewer configs than requested
+        for _ in range(100 * candidates):
+            if len(pool) >= candidates:
+                break
+            pool.add(sample() if rng.random() < 0.5 else perturb(best))
+
+        remaining = sorted(pool)
+        battles = min_battles
+        while True:
+            scored = sorted(
+                remaining, key=lambda config: sweep.evaluate(config, battles)[0]
+            )
+            evaluated.update(scored)
+            if len(scored) == 1:
+                break
+            remaining = scored[: max(1, len(scored) // eta)]
+            battles *= eta
+        best = scored[0]
+        cache.save()
+
+    score, win_rates = sweep.evaluate(best, battles)
+    return BalanceResult(
+        names=[archetype.name for archetype in archetypes],
+        stats=stats,
+        config=best,
+        score=score,
+        win_rates=win_rates,
+        battles=battles,
+        evaluated=len(evaluated),
+        simulated=cache.simulated,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search balanced character stats.")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--min-battles", type=int, default=200)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH))
+    args = parser.parse_args()
+
+    try:
+        result = optimize(
+            candidates=args.candidates,
+            min_battles=args.min_battles,
+            eta=args.eta,
+            rounds=args.rounds,
+            seed=args.seed,
+            cache=ResultCache(args.cache),
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    for (first, second), rate in result.win_rates.items():
+        print(f"{first} vs {second}: {rate:.3f}")
+    print(f"Score {result.score:.4f} from {result.battles} battles per matchup")
+    print(
+        f"{result.evaluated} configs evaluated, {result.simulated} battles simulated"
+    )
+    print(json.dumps(result.to_roster(), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
-from typing import Optional
-import pygame
-import random
+from typing import Awaitable, Callable, List, Optional, Union
 from .character import Character
 from .action import ActionType
+from .battle_log import DEFAULT_LOG_CAPACITY, BattleLog, LogEvent
+from .damage import DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX, damage_table
+from .rng import RandomSource, make_rng
 
 
 class Battle:
@@ -13,13 +14,25 @@ class Battle:
         gui: bool = False,
         player_character: Character = None,
         enemy_character: Character = None,
+        rng: Optional[Union[int, RandomSource]] = None,
+        log_capacity: Optional[int] = DEFAULT_LOG_CAPACITY,
+        enemy_ai=None,
+        instrumentation=None,
+        player_policy=None,
     ):
         if gui:
+            # Imported on demand, since loading pygame takes longer than
+            # everything else text battles and simulations need
+            import pygame
+
             pygame.init()
             self.screen = pygame.display.set_mode((800, 600))
-            self.clock = pygame.time.Clock()
         self.current_turn = 0
-        self.battle_log = []
+        # Keeps the most recent log_capacity events. A capacity of 0 runs the
+        # battle headless: nothing is logged or printed
+        self.battle_log = BattleLog(log_capacity)
+        # Whether the outcome is printed when the battle ends
+        self.print_outcome = log_capacity != 0
         # Initialize the selected and target characters
         # to facilitate battle logic
         self.selected_character: Optional[Character] = (
@@ -31,29 +44,79 @@ class Battle:
         self.player_character = player_character
         self.enemy_character = enemy_character
         self._game_over = False
+        # Every random decision in the battle is drawn from this source, so a
+        # seed replays the same battle and battles never share global state
+        self.rng = make_rng(rng)
+        # Damage rolls drawn in advance by predraw_damage_rolls
+        self._damage_rolls: List[int] = []
+        self._damage_roll_index = 0
+        # Receives every action passed to handle_turn, see src.core.replay
+        self.recording = None
+        # Chooses enemy actions with choose_action(battle) when set, e.g. a
+        # src.core.search.SearchAI, instead of Character.get_enemy_action
+        self.enemy_ai = enemy_ai
+        # Chooses player actions with choose_action(battle) when set, e.g. a
+        # src.core.policy.Policy, instead of the text menu
+        self.player_policy = player_policy
+        # Times the phases of every turn and calls its hooks when set, see
+        # src.core.instrumentation. Left unset, turns pay a single None check
+        self.instrumentation = instrumentation
+
+    def predraw_damage_rolls(self, count: int):
+        """Draw the next count damage rolls in a single call to the random source."""
+
+        remaining = self._damage_rolls[self._damage_roll_index :]
+        self._damage_rolls = remaining + self.rng.randints(
+            DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX, count
+        )
+        self._damage_roll_index = 0
+
+    def _damage_roll(self) -> int:
+        """Get the random part of an attack's damage."""
+
+        if self._damage_roll_index < len(self._damage_rolls):
+            roll = self._damage_rolls[self._damage_roll_index]
+            self._damage_roll_index += 1
+            return roll
+        return self.rng.randint(DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX)
 
-    def handle_turn(self, action: ActionType):
-        """Handle a turn in the battle."""
+    def handle_turn(self, action: ActionType, by_ai: bool = False):
+        """Handle a turn in the battle.
+
+        by_ai marks actions chosen by the enemy AI, so replays draw the same
+        random numbers the AI did.
+        """
         if not self.selected_character or not self.target_character:
             return
 
+        if self.recording is not None:
+            self.recording.append(action, by_ai)
+
+        if self.instrumentation is not None:
+            # Runs the same phases as below, timing each of them
+            self.instrumentation.run_turn(self, action)
+            return
+
         # Check for special conditions
         action = self._handle_special_conditions(action)
 
         # Handle the selected action
-        if action == ActionType.ATTACK:
-            self._attack()
-        elif action == ActionType.DEFEND:
-            self._defend()
-        elif action == ActionType.SPECIAL:
-            self._handle_special()
-        elif action == ActionType.SKIP:
-            self._skip()
+        self._dispatch(action)
 
         # Decrement the special cooldown times for both characters after each turn
         self._special_cooldown_decrement()
 
-        # Increment the turn counter
+        self._advance_turn()
+
+        # Check for character death and end game if necessary
+        self._check_win_condition()
+
+    def _dispatch(self, action: ActionType):
+        """Handle the selected action."""
+        self._ACTION_HANDLERS[action](self)
+
+    def _advance_turn(self):
+        """Increment the turn counter and pass the turn to the target character."""
         self.current_turn += 1
 
         # Switch the selected character and target character for the next turn
@@ -62,62 +125,85 @@ class Battle:
             self.selected_character,
         )
 
-        # Check for character death and end game if necessary
-        self._check_win_condition()
+    def enemy_turn(self):
+        """Let the enemy AI choose the selected character's action and handle it."""
+
+        if self.enemy_ai is not None:
+            # Search based AIs draw no random numbers, so replays can apply
+            # their actions directly
+            self.handle_turn(self.enemy_ai.choose_action(self))
+            return
+        enemy_action = self.selected_character.get_enemy_action(self.rng)
+        self.handle_turn(enemy_action, by_ai=True)
 
     def _skip(self):
         """Handle a skip action."""
-        self.battle_log.append(f"{self.selected_character.name} skips their turn!")
+        self.battle_log.record(LogEvent.SKIP, self.selected_character.name)
 
     def _attack(self):
         """Handle an attack action."""
-        damage = (
-            self.selected_character.attack_points
-            - self.target_character.defense_points
-            + random.randint(-5, 10)
+        # The table applies the clamp at zero, and Character.take_damage the
+        # halving of defending targets
+        table = damage_table(
+            self.selected_character.attack_points,
+            self.target_character.defense_points,
+            False,
+        )
+        actual_damage = self.target_character.take_damage(
+            table.rolls[self._damage_roll() - DAMAGE_ROLL_MIN]
         )
-        actual_damage = self.target_character.take_damage(max(0, damage))
         if actual_damage > 0:
-            self.battle_log.append(
-                f"{self.selected_character.name} attacks {self.target_character.name} for {actual_damage} damage!"
+            self.battle_log.record(
+                LogEvent.ATTACK,
+                self.selected_character.name,
+                self.target_character.name,
+                actual_damage,
             )
         elif actual_damage == 0:  # Check if the attack did no damage
-            self.battle_log.append(
-                f"{self.selected_character.name} attacks {self.target_character.name} but does no damage!"
+            self.battle_log.record(
+                LogEvent.ATTACK_NO_DAMAGE,
+                self.selected_character.name,
+                self.target_character.name,
             )
 
     def _defend(self):
         """Handle a defend action."""
         self.selected_character.is_defending = True
-        self.battle_log.append(
-            f"{self.selected_character.name} takes a defensive stance!"
-        )
+        self.battle_log.record(LogEvent.DEFEND, self.selected_character.name)
 
     def _handle_special(self):
         """Handle a special action."""
         if self.selected_character.special_cooldown == 0:
-            #  Call the special ability of the selected character and get description
+            # Apply the special ability, which also resets its cooldown, and get
+            # its description
             battle_log_description = self.selected_character.special_ability(
                 self.target_character
-            )  # Call the special ability of the selected character and get description
-            self.selected_character.special_cooldown = 3  # Reset the special cooldown
-            self.battle_log.append(
-                f"{self.selected_character.name} uses {self.selected_character.special_ability_name}!"
+            )
+            self.battle_log.record(
+                LogEvent.SPECIAL,
+                self.selected_character.name,
+                value=self.selected_character.special_ability_name,
             )  # Append the use of special ability to the battle log
-            self.battle_log.append(
-                battle_log_description
+            self.battle_log.record(
+                LogEvent.SPECIAL_EFFECT, value=battle_log_description
             )  # Append the special ability description to the battle log
         else:
-            self.battle_log.append(
-                f"{self.selected_character.name} is still recharging their special ability!"
-            )
+            self.battle_log.record(LogEvent.RECHARGING, self.selected_character.name)
+
+    # Handler of each action, looked up by _dispatch
+    _ACTION_HANDLERS = {
+        ActionType.ATTACK: _attack,
+        ActionType.DEFEND: _defend,
+        ActionType.SPECIAL: _handle_special,
+        ActionType.SKIP: _skip,
+    }
 
     def _handle_special_conditions(self, action: ActionType) -> ActionType:
         """Check for special conditions before handling the action."""
         if self.selected_character.confused:
-            self.battle_log.append(f"{self.selected_character.name} is confused!")
+            self.battle_log.record(LogEvent.CONFUSED, self.selected_character.name)
             self.selected_character.confused = False  # Reset the confused state
-            return random.choice(list(ActionType))
+            return self.rng.choice(list(ActionType))
         elif self.selected_character.skip_turn:
             self.selected_character.skip_turn = False  # Reset the skip turn state
             return ActionType.SKIP
@@ -135,58 +221,55 @@ class Battle:
         # Check whether the player or enemy character has been defeated
         if not self.player_character.is_alive() or not self.enemy_character.is_alive():
             if not self.player_character.is_alive():
-                self.battle_log.append("\nYou have been defeated!")
-                self.battle_log.append("Game Over!")
-            elif not self.enemy_character.is_alive():
-                self.battle_log.append("\nThe enemy has been defeated!")
-                self.battle_log.append("You win!")
-            # Display the last two battle log entries and break the game loop
-            print(f"{self.battle_log[-2]}")
-            print(f"{self.battle_log[-1]}")
+                outcome = (LogEvent.PLAYER_DEFEATED, LogEvent.GAME_OVER)
+            else:
+                outcome = (LogEvent.ENEMY_DEFEATED, LogEvent.PLAYER_WINS)
+            # Log and display the outcome unless headless, and break the game loop
+            for event in outcome:
+                self.battle_log.record(event)
+                if self.print_outcome:
+                    print(event.value)
             self._game_over = True
 
     def run(self, gui: bool = False):
         """Run the battle loop."""
         running = True
 
-        while running and gui:
-            self._handle_events()
-            self._update()
-            self._render()
-            self.clock.tick(60)
+        if gui:
+            from ..ui.screens.battle_screen import BattleScreen
+
+            BattleScreen(self, self.screen).run()
+            return
         while running:
             if not self._game_over:
                 # Get user input for their turn and handle turn
-                user_action = self._text_handle_user_input()
+                if self.player_policy is not None:
+                    user_action = self.player_policy.choose_action(self)
+                else:
+                    user_action = self._text_handle_user_input()
                 self.handle_turn(user_action)
 
             if not self._game_over:
                 # Get enemy action and handle turn
-                enemy_action = self.selected_character.get_enemy_action()
-                self.handle_turn(enemy_action)
+                self.enemy_turn()
 
             if self._game_over:
                 running = False
 
-    def _handle_events(self):
-        """Handle pygame events occuring in the UI."""
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-            # Add event handling logic here
+    async def run_async(
+        self, next_action: Callable[["Battle"], Awaitable[ActionType]]
+    ):
+        """Run the battle loop, awaiting each player action from an input source.
 
-    def _update(self):
-        """Update the game state."""
-        # Add game state update logic here
-        pass
+        next_action is called with the battle at the start of every player
+        turn, e.g. to report the last turns and read the next action from a
+        network connection, so many battles can share one event loop.
+        """
 
-    def _render(self):
-        """Render the game state to the screen."""
-        # Clear screen
-        self.screen.fill((255, 255, 255))
-        # Render game elements
-        pygame.display.flip()
+        while not self._game_over:
+            self.handle_turn(await next_action(self))
+            if not self._game_over:
+                self.enemy_turn()
 
     def _text_handle_user_input(self) -> ActionType:
         """Handle user input for text-based UI."""
@@ -199,7 +282,7 @@ class Battle:
         while True:
             # Check battle log for emptiness and print game start message
             if not self.battle_log:
-                self.battle_log.append("Battle Start!")
+                self.battle_log.record(LogEvent.BATTLE_START)
 
             # Display the game context. This is implemented here
             # because the text-based UI is awaiting user input
@@ -237,7 +320,7 @@ class Battle:
         {self.battle_log[-4] if len(self.battle_log) > 3 else ""}
         {self.battle_log[-3] if len(self.battle_log) > 2 else ""}
         {self.battle_log[-2] if len(self.battle_log) > 1 else ""}
-        {self.battle_log[-1]}
+        {self.battle_log[-1] if self.battle_log else ""}
         ######################################
         """
         print(battle_log_display)
@@ -0,0 +1,118 @@
+from enum import Enum
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Number of entries kept by a battle log unless configured otherwise
+DEFAULT_LOG_CAPACITY = 100
+
+
+class LogEvent(Enum):
+    """Battle log event types, with the template used to render each one."""
+
+    BATTLE_START = "Battle Start!"
+    ATTACK = "{actor} attacks {target} for {value} damage!"
+    ATTACK_NO_DAMAGE = "{actor} attacks {target} but does no damage!"
+    DEFEND = "{actor} takes a defensive stance!"
+    SPECIAL = "{actor} uses {value}!"
+    SPECIAL_EFFECT = "{value}"
+    RECHARGING = "{actor} is still recharging their special ability!"
+    CONFUSED = "{actor} is confused!"
+    SKIP = "{actor} skips their turn!"
+    PLAYER_DEFEATED = "\nYou have been defeated!"
+    GAME_OVER = "Game Over!"
+    ENEMY_DEFEATED = "\nThe enemy has been defeated!"
+    PLAYER_WINS = "You win!"
+    DEFEATED = "{actor} has been defeated!"
+    TEAM_WINS = "Team {value} wins!"
+    MESSAGE = "{value}"
+
+
+# A logged event: (event type, actor name, target name, value)
+Entry = Tuple[LogEvent, Optional[str], Optional[str], object]
+
+
+def render(entry: Entry) -> str:
+    """Render a logged event as human-readable text."""
+
+    event, actor, target, value = entry
+    return event.value.format(actor=actor, target=target, value=value)
+
+
+class BattleLog:
+    """Bounded log of structured battle events.
+
+    Events are stored as compact tuples in a ring buffer that keeps the most
+    recent capacity entries, and are only rendered to text when read. Reading
+    the log by index, iterating over it or comparing it to a list behaves like
+    the list of strings it replaces. A capacity of 0 disables logging and None
+    keeps every entry.
+    """
+
+    __slots__ = ("capacity", "total", "_entries")
+
+    def __init__(self, capacity: Optional[int] = DEFAULT_LOG_CAPACITY):
+        self.capacity = capacity
+        # Number of events recorded over the lifetime of the log
+        self.total = 0
+        self._entries: List[Entry] = []
+
+    def record(
+        self,
+        event: LogEvent,
+        actor: Optional[str] = None,
+        target: Optional[str] = None,
+        value: object = None,
+    ):
+        """Record an event without rendering it."""
+
+        if self.capacity is None or self.total < self.capacity:
+            self._entries.append((event, actor, target, value))
+        elif self.capacity:
+            self._entries[self.total % self.capacity] = (event, actor, target, value)
+        else:
+            return
+        self.total += 1
+
+    def append(self, message: str):
+        """Record a plain text message."""
+
+        self.record(LogEvent.MESSAGE, value=message)
+
+    def clear(self):
+        """Remove every entry from the log."""
+
+        self.total = 0
+        self._entries = []
+
+    def entries(self) -> List[Entry]:
+        """Return the retained events, oldest first, without rendering them."""
+
+        if self.capacity is None or self.total <= self.capacity:
+            return list(self._entries)
+        start = self.total % self.capacity
+        return self._entries[start:] + self._entries[:start]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [render(entry) for entry in self.entries()[index]]
+        size = len(self._entries)
+        if not -size <= index < size:
+            raise IndexError("battle log index out of range")
+        if self.capacity is None or self.total <= self.capacity:
+            return render(self._entries[index])
+        return render(self._entries[(self.total + index % size) % self.capacity])
+
+    def __iter__(self) -> Iterator[str]:
+        return (render(entry) for entry in self.entries())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BattleLog):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BattleLog({list(self)!r})"
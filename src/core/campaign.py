@@ -0,0 +1,257 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Optional, Sequence, Tuple, Union
+import argparse
+import hashlib
+import math
+import random
+from .battle import Battle
+from .character import Character, XP_PER_LEVEL
+from .rng import RandomSource, make_rng
+from .roster import Archetype, default_roster
+from .simulation import DEFAULT_MAX_TURNS, simulate
+
+# Experience awarded for the outcome of a campaign battle. Timeouts count as
+# losses
+XP_FOR_WIN = 60
+XP_FOR_LOSS = 20
+# Battles simulated against each enemy to estimate the win rate at a level
+DEFAULT_ESTIMATE_BATTLES = 500
+
+
+def leveled(
+    archetype: Archetype, level: int, player_character: bool = False
+) -> Character:
+    """A fresh character of an archetype at the given level."""
+
+    character = Character.from_archetype(archetype, player_character)
+    if level > 1:
+        character.level_up(level - 1)
+    return character
+
+
+def award_experience(character: Character, won: bool) -> int:
+    """Award the experience for a battle outcome, returning the levels gained."""
+
+    level = character.level
+    character.gain_experience(XP_FOR_WIN if won else XP_FOR_LOSS)
+    return character.level - level
+
+
+class Campaign:
+    """A sequence of battles fought by one persistent character.
+
+    Every battle is against a random enemy archetype at the character's
+    level, played headless with the enemy AI on both sides. The character
+    rests between battles and keeps its level and experience.
+    """
+
+    def __init__(
+        self,
+        character: Character,
+        enemies: Optional[Sequence[Archetype]] = None,
+        rng: Optional[Union[int, RandomSource]] = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+    ):
+        self.character = character
+        self.enemies = list(enemies or default_roster().values())
+        self.rng = make_rng(rng)
+        self.max_turns = max_turns
+        self.battles = 0
+        self.wins = 0
+
+    def play_battle(self) -> bool:
+        """Fight the next battle and award its experience. Returns whether it won."""
+
+        enemy = leveled(self.rng.choice(self.enemies), self.character.level)
+        self.character.rest()
+        battle = Battle(False, self.character, enemy, rng=self.rng, log_capacity=0)
+        while not battle._game_over and battle.current_turn < self.max_turns:
+            battle.enemy_turn()
+        won = not enemy.is_alive()
+        award_experience(self.character, won)
+        self.battles += 1
+        self.wins += won
+        return won
+
+    def run(self, battles: int) -> int:
+        """Fight a number of battles, returning how many were won."""
+
+        return sum(self.play_battle() for _ in range(battles))
+
+
+@dataclass
+class CampaignResult:
+    """Outcome of many campaigns of the same archetype."""
+
+    campaigns: int = 0
+    # Battles fought by each campaign
+    battles: int = 0
+    # Battles won, over all campaigns
+    wins: int = 0
+    # Number of campaigns ending at a given level
+    level_counts: Counter = field(default_factory=Counter)
+    # Estimated win rate of a battle at a given level
+    win_rates: Dict[int, float] = field(default_factory=dict)
+
+    def win_rate(self) -> float:
+        """Fraction of all campaign battles won."""
+
+        total = self.campaigns * self.battles
+        return self.wins / total if total else 0.0
+
+    def mean_level(self) -> float:
+        """Average level at the end of a campaign."""
+
+        if not self.campaigns:
+            return 0.0
+        total = sum(level * count for level, count in self.level_counts.items())
+        return total / self.campaigns
+
+
+def _level_seed(seed: Optional[int], level: int, enemy: int) -> int:
+    """Derive an independent, reproducible seed for a win rate estimate."""
+
+    digest = hashlib.blake2b(f"{seed}:{level}:{enemy}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+def level_win_rate(
+    archetype: Archetype,
+    level: int,
+    enemies: Sequence[Archetype],
+    battles: int = DEFAULT_ESTIMATE_BATTLES,
+    seed: Optional[int] = None,
+) -> float:
+    """Estimated chance of winning a campaign battle at a level.
+
+    Enemies are equally likely and at the same level, so every enemy gets the
+    same number of simulated battles.
+    """
+
+    wins = 0
+    for index, enemy in enumerate(enemies):
+        matchup = (
+            partial(leveled, archetype, level, True),
+            partial(leveled, enemy, level),
+        )
+        result = simulate(matchup, battles, seed=_level_seed(seed, level, index))
+        wins += result.wins[0]
+    return wins / (battles * len(enemies))
+
+
+def _binomial(rng: random.Random, n: int, p: float) -> int:
+    """Number of successes in n trials of probability p, from a single draw.
+
+    Inverts the distribution starting at its mode and walking outwards, which
+    takes about as many steps as the standard deviation instead of n.
+    """
+
+    if p <= 0.0 or p >= 1.0 or n == 0:
+        return n if p >= 1.0 else 0
+    q = 1.0 - p
+    mode = min(int((n + 1) * p), n)
+    mass = math.exp(
+        math.lgamma(n + 1)
+        - math.lgamma(mode + 1)
+        - math.lgamma(n - mode + 1)
+        + mode * math.log(p)
+        + (n - mode) * math.log(q)
+    )
+    draw = rng.random() - mass
+    if draw < 0.0:
+        return mode
+    above = below = mass
+    high = low = mode
+    while high < n or low > 0:
+        if high < n:
+            above *= (n - high) / (high + 1) * p / q
+            high += 1
+            draw -= above
+            if draw < 0.0:
+                return high
+        if low > 0:
+            below *= low / (n - low + 1) * q / p
+            low -= 1
+            draw -= below
+            if draw < 0.0:
+                return low
+    # Only reached through rounding errors in the tails
+    return mode
+
+
+def simulate_campaigns(
+    archetype: Archetype,
+    campaigns: int,
+    battles: int,
+    enemies: Optional[Sequence[Archetype]] = None,
+    seed: Optional[int] = None,
+    estimate_battles: int = DEFAULT_ESTIMATE_BATTLES,
+) -> CampaignResult:
+    """Simulate many campaigns of the same archetype at once.
+
+    A campaign's outcome only depends on its level and leftover experience,
+    so campaigns sharing both are advanced as one group: the number of wins
+    in a group is drawn from the estimated win rate at its level, and each
+    half of the group gains its levels in closed form. The cost of a battle
+    round grows with the number of distinct states, not of campaigns. Win
+    rates are estimated with simulate, once per level reached.
+    """
+
+    enemies = list(enemies or default_roster().values())
+    rng = random.Random(seed)
+    result = CampaignResult(campaigns=campaigns, battles=battles)
+    rates = result.win_rates
+    # Number of campaigns by (level, experience)
+    states: Dict[Tuple[int, int], int] = {(1, 0): campaigns}
+    outcomes = ((True, XP_FOR_WIN), (False, XP_FOR_LOSS))
+
+    for _ in range(battles):
+        following: Counter = Counter()
+        for (level, experience), count in states.items():
+            if level not in rates:
+                rates[level] = level_win_rate(
+                    archetype, level, enemies, estimate_battles, seed
+                )
+            wins = _binomial(rng, count, rates[level])
+            result.wins += wins
+            for won, award in outcomes:
+                group = wins if won else count - wins
+                if group:
+                    levels, left = divmod(experience + award, XP_PER_LEVEL)
+                    following[(level + levels, left)] += group
+        states = following
+
+    for (level, _), count in states.items():
+        result.level_counts[level] += count
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate leveling campaigns.")
+    parser.add_argument("--character", default="Rust")
+    parser.add_argument("--campaigns", type=int, default=1_000_000)
+    parser.add_argument("--battles", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--estimate-battles", type=int, default=DEFAULT_ESTIMATE_BATTLES
+    )
+    args = parser.parse_args()
+
+    roster = default_roster()
+    result = simulate_campaigns(
+        roster[args.character],
+        args.campaigns,
+        args.battles,
+        seed=args.seed,
+        estimate_battles=args.estimate_battles,
+    )
+    levels = sorted(result.level_counts)
+    print(f"Win rate: {result.win_rate():.3f}")
+    print(f"Final level: mean {result.mean_level():.1f}, ", end="")
+    print(f"lowest {levels[0]}, highest {levels[-1]}")
+
+
+if __name__ == "__main__":
+    main()
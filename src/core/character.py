@@ -1,9 +1,38 @@
 from .action import ActionType
+from .effects import apply_effects
+from .roster import Archetype, default_roster
 import random
 
+# Enemy AI switches from an offensive to a defensive stance below this hp
+ENEMY_DEFENSIVE_HP_THRESHOLD = 50
+# Experience needed for each level, and the stats gained with it
+XP_PER_LEVEL = 100
+HP_PER_LEVEL = 10
+ATTACK_PER_LEVEL = 2
+DEFENSE_PER_LEVEL = 1
+
 
 class Character:
-    """Main class for all characters in the game."""
+    """Main class for all characters in the game.
+
+    Static data such as the name and base stats lives in a shared Archetype,
+    so each instance only carries its own combat state.
+    """
+
+    __slots__ = (
+        "archetype",
+        "max_hp",
+        "current_hp",
+        "attack_points",
+        "defense_points",
+        "experience",
+        "level",
+        "is_defending",
+        "special_cooldown",
+        "confused",
+        "skip_turn",
+        "player_character",
+    )
 
     def __init__(
         self,
@@ -12,18 +41,48 @@ class Character:
         defense_points: int,
         hp: int = 100,
     ):
-        self.name = name
-        self.max_hp = hp
-        self.current_hp = hp
-        self.attack_points = attack_points
-        self.defense_points = defense_points
+        self._init_state(Archetype(name, attack_points, defense_points, hp))
+
+    @classmethod
+    def from_archetype(
+        cls, archetype: Archetype, player_character: bool = False
+    ) -> "Character":
+        """Create a character of any archetype, e.g. one loaded from the roster.
+
+        Called on Character, archetypes named like a built-in character build
+        that subclass, so isinstance checks against cPlusPlus, Python and Rust
+        hold for characters from the roster too.
+        """
+
+        if cls is Character:
+            cls = CHARACTER_CLASSES.get(archetype.name, Character)
+        character = cls.__new__(cls)
+        character._init_state(archetype, player_character)
+        return character
+
+    def _init_state(self, archetype: Archetype, player_character: bool = False):
+        """Initialize the combat state of a fresh character of the given archetype."""
+
+        self.archetype = archetype
+        self.max_hp = archetype.max_hp
+        self.current_hp = archetype.max_hp
+        self.attack_points = archetype.attack_points
+        self.defense_points = archetype.defense_points
         self.experience = 0
         self.level = 1
         self.is_defending = False
         self.special_cooldown = 0
         self.confused = False
-        self.special_ability_name = ""
         self.skip_turn = False
+        self.player_character = player_character
+
+    @property
+    def name(self) -> str:
+        return self.archetype.name
+
+    @property
+    def special_ability_name(self) -> str:
+        return self.archetype.special_ability_name
 
     def take_damage(self, damage: int) -> int:
         """Calculate the damage taken by the character."""
@@ -41,6 +100,15 @@ class Character:
 
         self.current_hp = min(self.current_hp + amount, self.max_hp)
 
+    def rest(self):
+        """Restore hp and clear the combat state left over from a battle."""
+
+        self.current_hp = self.max_hp
+        self.is_defending = False
+        self.special_cooldown = 0
+        self.confused = False
+        self.skip_turn = False
+
     def is_alive(self) -> bool:
         """Check if the character is alive."""
 
@@ -49,71 +117,71 @@ class Character:
     def gain_experience(self, amount: int):
         """Gain experience points and level up if necessary."""
 
-        self.experience += amount
-        while self.experience >= 100:
-            self.level_up()
+        levels, self.experience = divmod(self.experience + amount, XP_PER_LEVEL)
+        if levels:
+            self.level_up(levels)
 
-    def level_up(self):
-        """Level up the character. Not used in the current version of the game."""
+    def level_up(self, levels: int = 1):
+        """Gain levels at once and restore hp. Used by src.core.campaign."""
 
-        self.level += 1
-        self.experience -= 100
-        self.max_hp += 10
+        self.level += levels
+        self.max_hp += HP_PER_LEVEL * levels
         self.current_hp = self.max_hp
-        self.attack_points += 2
-        self.defense_points += 1
+        self.attack_points += ATTACK_PER_LEVEL * levels
+        self.defense_points += DEFENSE_PER_LEVEL * levels
+
+    def special_ability(self, target: "Character") -> str:
+        """Use the special ability defined by the archetype and describe its effects.
 
-    def get_enemy_action(self) -> ActionType:
-        """Get the enemy action based on the current hp of the character."""
+        Applying the ability also starts its cooldown.
+        """
+
+        descriptions = apply_effects(self, target, self.archetype.special_effects)
+        if not descriptions:
+            return f"{self.name} has no special ability!"
+        return " ".join(descriptions)
+
+    def get_enemy_action(self, rng=random) -> ActionType:
+        """Get the enemy action based on the current hp of the character.
+
+        Random choices are drawn from rng, which defaults to the random module.
+        """
 
         # If enemy has great than 50 hp, select randomly between attack and special
-        if self.current_hp >= 50:
-            return random.choice([ActionType.ATTACK, ActionType.SPECIAL])
+        if self.current_hp >= ENEMY_DEFENSIVE_HP_THRESHOLD:
+            return rng.choice([ActionType.ATTACK, ActionType.SPECIAL])
         else:  # If enemy has less than 50 hp, select randomly between attack and defend
-            return random.choice([ActionType.ATTACK, ActionType.DEFEND])
+            return rng.choice([ActionType.ATTACK, ActionType.DEFEND])
 
 
 class cPlusPlus(Character):
-    def __init__(self, player_character: bool = False):
-        super().__init__("C++", 20, 10)
-        self.special_cooldown = 0
-        self.special_ability_name = "Memory Leak"
-        self.player_character = player_character
+    """C++ character. Special ability Memory Leak confuses the other character,
+    causing them to randomly choose their next action."""
 
-    def special_ability(self, target: Character) -> str:
-        """C++ special ability: Memory Leak.
+    __slots__ = ()
 
-        Causes the other character to randomly choose their next action.
-        """
-        target.confused = True
-        return f"{self.name} causes {target.name} to be confused!"
+    def __init__(self, player_character: bool = False):
+        self._init_state(default_roster()["C++"], player_character)
 
 
 class Python(Character):
-    def __init__(self, player_character: bool = False):
-        super().__init__("Python", 20, 10)
-        self.special_cooldown = 0
-        self.special_ability_name = "Dynamic Typing"
-        self.player_character = player_character
+    """Python character. Special ability Dynamic Typing causes the other
+    character to skip their next turn."""
 
-    def special_ability(self, target: Character) -> str:
-        """Python special ability: Dynamic Typing.
+    __slots__ = ()
 
-        Causes the other character to skip their next turn."""
-        target.skip_turn = True
-        return f"{target.name} skips their next turn!"
+    def __init__(self, player_character: bool = False):
+        self._init_state(default_roster()["Python"], player_character)
 
 
 class Rust(Character):
+    """Rust character. Special ability Borrow Checker heals 30 HP."""
+
+    __slots__ = ()
+
     def __init__(self, player_character: bool = False):
-        super().__init__("Rust", 20, 10)
-        self.special_cooldown = 0
-        self.special_ability_name = "Borrow Checker"
-        self.player_character = player_character
+        self._init_state(default_roster()["Rust"], player_character)
 
-    def special_ability(self, target: Character) -> str:
-        """Rust special ability: Borrow Checker.
 
-        Heals 30 HP."""
-        self.heal(30)
-        return f"{self.name} heals 30 HP!"
+# Subclasses of the built-in characters, by archetype name
+CHARACTER_CLASSES = {"C++": cPlusPlus, "Python": Python, "Rust": Rust}
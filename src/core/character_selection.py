@@ -1,11 +1,20 @@
-from .character import Character, cPlusPlus, Python, Rust
-from typing import Tuple
+from .character import Character
+from .roster import default_roster
+from functools import partial
+from typing import Optional, Tuple
 import random
 
 
 class Menu:
     """Class to handle character selection."""
 
+    # Archetypes available for selection, loaded from config/characters.json
+    archetypes = list(default_roster().values())
+    # Factories creating a character of each archetype, in the same order
+    characters = [
+        partial(Character.from_archetype, archetype) for archetype in archetypes
+    ]
+
     def __init__(self):
         self.player_character = None
         self.non_player_character = None
@@ -16,17 +25,27 @@ class Menu:
         print(f"You have selected {self.player_character.name} as your character.")
         print(f"Your opponent will be {self.non_player_character.name}.")
 
-    def character_selection(self) -> Tuple[Character, Character]:
-        """Select two characters to battle."""
+    def character_selection(
+        self, choice: Optional[int] = None, rng=random
+    ) -> Tuple[Character, Character]:
+        """Select two characters to battle.
 
-        # Initialized list of character to select from
-        characters = [cPlusPlus, Python, Rust]
+        The user is prompted for their character unless choice, an index into
+        characters, is given. The npc is drawn from rng, which defaults to the
+        random module.
+        """
 
         # Randomly assign npc
-        self.non_player_character = random.choice(characters)(player_character=False)
+        self.non_player_character = rng.choice(self.characters)(
+            player_character=False
+        )
 
         # Present user with choice of player character
-        self.player_character = self.choose_character()
+        if choice is None:
+            self.player_character = self.choose_character()
+        else:
+            self.player_character = self.characters[choice](player_character=True)
+        return self.player_character, self.non_player_character
 
     def choose_character(self) -> Character:
         """Prompt user to select a character."""
@@ -34,16 +53,11 @@ class Menu:
         running = True
         while running:
             print("Select a character:")
-            print("1. C++")
-            print("2. Python")
-            print("3. Rust")
+            for number, archetype in enumerate(self.archetypes, start=1):
+                print(f"{number}. {archetype.name}")
             choice = input("Enter the number of your choice: ")
 
-            if choice == "1":
-                return cPlusPlus(player_character=True)
-            elif choice == "2":
-                return Python(player_character=True)
-            elif choice == "3":
-                return Rust(player_character=True)
+            if choice.isdigit() and 1 <= int(choice) <= len(self.characters):
+                return self.characters[int(choice) - 1](player_character=True)
             else:
                 print("Invalid choice. Please try again.")
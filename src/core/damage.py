@@ -0,0 +1,74 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, Tuple
+
+# Inclusive bounds of the random roll added to every attack
+DAMAGE_ROLL_MIN = -5
+DAMAGE_ROLL_MAX = 10
+DAMAGE_ROLL_SPAN = DAMAGE_ROLL_MAX - DAMAGE_ROLL_MIN + 1
+
+
+@dataclass(frozen=True)
+class DamageTable:
+    """Damage dealt by an attacker to a defender for every possible damage roll.
+
+    rolls[roll - DAMAGE_ROLL_MIN] is the hp the defender loses, after the
+    clamp at zero and the halving of Character.take_damage when it defends.
+    distribution lists each distinct damage with its probability.
+    """
+
+    attack: int
+    defense: int
+    defending: bool
+    rolls: Tuple[int, ...]
+    distribution: Tuple[Tuple[int, float], ...]
+
+
+# Most tables kept at once. Sweeps and campaigns meet many stat pairs, so the
+# oldest tables are evicted and rebuilt if they are needed again
+MAX_TABLES = 4096
+# Tables by (attack, defense, defending), in the order they were built.
+# Entries depend only on the stats in their key, so they stay valid when
+# characters level up
+_TABLES: Dict[Tuple[int, int, bool], DamageTable] = {}
+
+
+def _build(attack: int, defense: int, defending: bool) -> DamageTable:
+    """Compute the table of one attack, following Battle._attack."""
+
+    rolls = []
+    for roll in range(DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX + 1):
+        damage = max(0, attack - defense + roll)
+        rolls.append(damage // 2 if defending else damage)
+    outcomes = Counter(rolls)
+    distribution = tuple(
+        (damage, count / DAMAGE_ROLL_SPAN) for damage, count in sorted(outcomes.items())
+    )
+    table = DamageTable(attack, defense, defending, tuple(rolls), distribution)
+    if len(_TABLES) >= MAX_TABLES:
+        del _TABLES[next(iter(_TABLES))]
+    _TABLES[attack, defense, defending] = table
+    return table
+
+
+def damage_table(attack: int, defense: int, defending: bool) -> DamageTable:
+    """Get the table of an attack, building it the first time these stats meet."""
+
+    return _TABLES.get((attack, defense, defending)) or _build(
+        attack, defense, defending
+    )
+
+
+def damage_tables(attack: int, defense: int) -> Tuple[DamageTable, DamageTable]:
+    """Get the tables of an attack against a defender that is not and is defending."""
+
+    return damage_table(attack, defense, False), damage_table(attack, defense, True)
+
+
+def build_damage_tables(attacks: Iterable[int], defenses: Iterable[int]):
+    """Build the tables of every attack stat against every defense stat."""
+
+    defenses = list(defenses)
+    for attack in attacks:
+        for defense in defenses:
+            damage_tables(attack, defense)
@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class EffectKind(Enum):
+    """Kinds of effect a special ability is composed of."""
+
+    # Fixed damage to the opponent, ignoring defense and defending
+    DAMAGE = "damage"
+    # Heal the user, up to its max hp
+    HEAL = "heal"
+    # Apply a status to the opponent
+    STATUS = "status"
+    # Set the user's special cooldown
+    COOLDOWN = "cooldown"
+
+
+class Status(Enum):
+    """Statuses an effect can apply, named after the Character attribute they set."""
+
+    CONFUSED = "confused"
+    SKIP_TURN = "skip_turn"
+
+
+@dataclass(frozen=True)
+class Effect:
+    """One step of a special ability."""
+
+    kind: EffectKind
+    amount: int = 0
+    status: Optional[Status] = None
+
+
+# Log descriptions of the effects. Statuses have their own messages
+_DESCRIPTIONS = {
+    EffectKind.DAMAGE: "{actor} deals {amount} damage to {target}!",
+    EffectKind.HEAL: "{actor} heals {amount} HP!",
+}
+_STATUS_DESCRIPTIONS = {
+    Status.CONFUSED: "{actor} causes {target} to be confused!",
+    Status.SKIP_TURN: "{target} skips their next turn!",
+}
+
+
+def _damage(actor, target, effect: Effect):
+    target.current_hp -= effect.amount
+
+
+def _heal(actor, target, effect: Effect):
+    actor.heal(effect.amount)
+
+
+def _status(actor, target, effect: Effect):
+    setattr(target, effect.status.value, True)
+
+
+def _cooldown(actor, target, effect: Effect):
+    actor.special_cooldown = effect.amount
+
+
+# Applies an effect of each kind to the user and its opponent
+EFFECT_HANDLERS: Dict[EffectKind, Callable] = {
+    EffectKind.DAMAGE: _damage,
+    EffectKind.HEAL: _heal,
+    EffectKind.STATUS: _status,
+    EffectKind.COOLDOWN: _cooldown,
+}
+
+
+def describe(effect: Effect, actor: str, target: str) -> Optional[str]:
+    """Describe an effect for the battle log, or None if it goes unmentioned."""
+
+    if effect.kind is EffectKind.STATUS:
+        template = _STATUS_DESCRIPTIONS[effect.status]
+    else:
+        template = _DESCRIPTIONS.get(effect.kind)
+    if template is None:
+        return None
+    return template.format(actor=actor, target=target, amount=effect.amount)
+
+
+def apply_effects(actor, target, effects: Iterable[Effect]) -> List[str]:
+    """Apply effects in order, returning the descriptions of those worth logging."""
+
+    descriptions = []
+    for effect in effects:
+        EFFECT_HANDLERS[effect.kind](actor, target, effect)
+        description = describe(effect, actor.name, target.name)
+        if description is not None:
+            descriptions.append(description)
+    return descriptions
+
+
+@dataclass(frozen=True)
+class CompiledEffects:
+    """The combined result of a list of effects, as flat fields for fast kernels.
+
+    Effects on the user and on its opponent never interact, so applying the
+    combined totals is the same as applying the effects one by one.
+    """
+
+    damage: int = 0
+    heal: int = 0
+    confuses: bool = False
+    skips: bool = False
+    # Cooldown set by the ability, None when it leaves the cooldown alone
+    cooldown: Optional[int] = None
+
+
+def compile_effects(effects: Iterable[Effect]) -> CompiledEffects:
+    """Combine effects, raising ValueError for combinations kernels cannot run."""
+
+    damage = heal = 0
+    confuses = skips = False
+    cooldown = None
+    for effect in effects:
+        if effect.amount < 0:
+            raise ValueError(f"Effect amounts cannot be negative: {effect}")
+        if effect.kind is EffectKind.DAMAGE:
+            damage += effect.amount
+        elif effect.kind is EffectKind.HEAL:
+            heal += effect.amount
+        elif effect.kind is EffectKind.STATUS:
+            if effect.status is Status.CONFUSED:
+                confuses = True
+            elif effect.status is Status.SKIP_TURN:
+                skips = True
+            else:
+                raise ValueError(f"Status effects need a status: {effect}")
+        elif effect.kind is EffectKind.COOLDOWN:
+            cooldown = effect.amount
+    if confuses and skips:
+        # A confused character would skip the turn after its confused one
+        raise ValueError("An ability can apply at most one status")
+    return CompiledEffects(damage, heal, confuses, skips, cooldown)
@@ -0,0 +1,141 @@
+from time import perf_counter_ns
+from typing import Callable, Dict, List
+import json
+from .action import ActionType
+from .battle import Battle
+
+# Phases of Battle.handle_turn, in the order they run. Passing the turn to the
+# other character is counted in the win condition phase
+PHASES = ("special_conditions", "dispatch", "cooldown", "win_condition")
+_SPECIAL_CONDITIONS, _DISPATCH, _COOLDOWN, _WIN_CONDITION = range(len(PHASES))
+_ACTIONS = list(ActionType)
+_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+
+# Called with the battle and an action
+Hook = Callable[[Battle, ActionType], None]
+
+
+class Instrumentation:
+    """Timers, counters and hooks for the turns of one or more battles.
+
+    Pass it to Battle(instrumentation=...) or set battle.instrumentation, and
+    share one instance between battles to aggregate them. Pre-turn hooks get
+    the action passed to handle_turn, while action listeners and post-turn
+    hooks get the action actually taken after special conditions. Hook time
+    is not counted in any phase.
+    """
+
+    def __init__(self):
+        self.pre_turn: List[Hook] = []
+        self.post_turn: List[Hook] = []
+        # Event bus, called once per turn with the action taken
+        self.listeners: List[Hook] = []
+        self.turns = 0
+        # Indexed by phase, see PHASES
+        self.phase_ns = [0] * len(PHASES)
+        self.phase_max_ns = [0] * len(PHASES)
+        # Indexed by position in ActionType
+        self.action_counts = [0] * len(_ACTIONS)
+
+    def on_action(self, listener: Hook) -> Hook:
+        """Subscribe a listener to every action taken, usable as a decorator."""
+
+        self.listeners.append(listener)
+        return listener
+
+    def run_turn(self, battle: Battle, action: ActionType):
+        """Handle a turn of the battle like Battle.handle_turn, timing each phase."""
+
+        for hook in self.pre_turn:
+            hook(battle, action)
+
+        start = perf_counter_ns()
+        action = battle._handle_special_conditions(action)
+        conditions = perf_counter_ns()
+        battle._dispatch(action)
+        dispatch = perf_counter_ns()
+        battle._special_cooldown_decrement()
+        cooldown = perf_counter_ns()
+        battle._advance_turn()
+        battle._check_win_condition()
+        end = perf_counter_ns()
+
+        self._add(_SPECIAL_CONDITIONS, conditions - start)
+        self._add(_DISPATCH, dispatch - conditions)
+        self._add(_COOLDOWN, cooldown - dispatch)
+        self._add(_WIN_CONDITION, end - cooldown)
+        self.turns += 1
+        self.action_counts[_CODES[action]] += 1
+
+        for listener in self.listeners:
+            listener(battle, action)
+        for hook in self.post_turn:
+            hook(battle, action)
+
+    def _add(self, phase: int, elapsed: int):
+        self.phase_ns[phase] += elapsed
+        if elapsed > self.phase_max_ns[phase]:
+            self.phase_max_ns[phase] = elapsed
+
+    def reset(self):
+        """Clear every counter and timer, keeping the hooks."""
+
+        self.turns = 0
+        self.phase_ns = [0] * len(PHASES)
+        self.phase_max_ns = [0] * len(PHASES)
+        self.action_counts = [0] * len(_ACTIONS)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Aggregated metrics, with times in seconds."""
+
+        return {
+            "turns": self.turns,
+            "actions": {
+                action.value: count
+                for action, count in zip(_ACTIONS, self.action_counts)
+            },
+            "phases": {
+                phase: {
+                    "seconds": total / 1e9,
+                    "max_seconds": longest / 1e9,
+                    "mean_seconds": total / self.turns / 1e9 if self.turns else 0.0,
+                }
+                for phase, total, longest in zip(
+                    PHASES, self.phase_ns, self.phase_max_ns
+                )
+            },
+        }
+
+    def to_json(self) -> str:
+        """Aggregated metrics as a JSON document."""
+
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "battle") -> str:
+        """Aggregated metrics in the Prometheus text exposition format."""
+
+        lines = [
+            f"# HELP {prefix}_turns_total Turns handled.",
+            f"# TYPE {prefix}_turns_total counter",
+            f"{prefix}_turns_total {self.turns}",
+            f"# HELP {prefix}_actions_total Actions taken after special conditions.",
+            f"# TYPE {prefix}_actions_total counter",
+        ]
+        for action, count in zip(_ACTIONS, self.action_counts):
+            lines.append(f'{prefix}_actions_total{{action="{action.value}"}} {count}')
+        lines += [
+            f"# HELP {prefix}_phase_seconds Time spent in each phase of a turn.",
+            f"# TYPE {prefix}_phase_seconds summary",
+        ]
+        for phase, total in zip(PHASES, self.phase_ns):
+            labels = f'{{phase="{phase}"}}'
+            lines.append(f"{prefix}_phase_seconds_sum{labels} {total / 1e9}")
+            lines.append(f"{prefix}_phase_seconds_count{labels} {self.turns}")
+        lines += [
+            f"# HELP {prefix}_phase_max_seconds Longest time spent in a phase.",
+            f"# TYPE {prefix}_phase_max_seconds gauge",
+        ]
+        for phase, longest in zip(PHASES, self.phase_max_ns):
+            labels = f'{{phase="{phase}"}}'
+            lines.append(f"{prefix}_phase_max_seconds{labels} {longest / 1e9}")
+        return "\n".join(lines) + "\n"
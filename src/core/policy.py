@@ -0,0 +1,300 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Sequence, Tuple, Union
+from .action import ActionType
+from .battle import Battle
+from .character import ENEMY_DEFENSIVE_HP_THRESHOLD
+from .effects import CompiledEffects
+from .rng import RandomSource, make_rng
+from .search import (
+    CONFUSED,
+    DEFENDING,
+    KEY_MAX_COOLDOWN,
+    KEY_MAX_HP,
+    KEY_SHIFTS,
+    SKIP_TURN,
+    SearchAI,
+    State,
+    _key,
+    battle_rules,
+    battle_state,
+)
+from .simulation import DEFAULT_MAX_TURNS, CharacterFactory, SimulationResult
+
+# Action codes of the batch entry point, in ActionType order
+_ACTIONS = list(ActionType)
+_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+# Actions a character can choose, skipping only happens through a special
+_CHOICES = (ActionType.ATTACK, ActionType.DEFEND, ActionType.SPECIAL)
+
+
+class Policy(ABC):
+    """Chooses the actions of one side of a battle, singly or in batches.
+
+    Subclasses implement act, which picks the action of the side to move in
+    a search State given the battle_rules of both sides. A policy can then be
+    passed to Battle as player_policy or enemy_ai, and to the vectorized
+    kernel through act_batch. The default act_batch calls act for every
+    battle of the batch, and subclasses replace it with array operations
+    where they can. Random choices of single battles come from the policy's
+    own source, so recorded battles replay without it.
+    """
+
+    def __init__(self, rng: Optional[Union[int, RandomSource]] = None):
+        self.rng = make_rng(rng)
+
+    @abstractmethod
+    def act(self, state: State, turn: int, rules: tuple) -> ActionType:
+        """Choose the action of the side to move in a state, at a battle turn."""
+
+    def choose_action(self, battle: Battle) -> ActionType:
+        """Choose the action of the battle's selected character."""
+
+        return self.act(battle_state(battle), battle.current_turn, battle_rules(battle))
+
+    def act_batch(self, states, rng):
+        """Action codes for the side to move in every battle of a BatchState.
+
+        rng is the NumPy Generator of the batch, for the random choices.
+        """
+
+        # NumPy is optional, so only import it for the batch entry point
+        import numpy as np
+
+        turn = states.current_turn
+        return np.fromiter(
+            (
+                _CODES[self.act(state, turn, rules)]
+                for state, rules in zip(batch_states(states), _batch_rules(states))
+            ),
+            dtype=np.int8,
+            count=len(states),
+        )
+
+
+def _batch_flags(states):
+    """Search state flags of both sides, shaped like the BatchState arrays."""
+
+    return (
+        states.is_defending * DEFENDING
+        | states.confused * CONFUSED
+        | states.skip_turn * SKIP_TURN
+    )
+
+
+def batch_states(states) -> Sequence[State]:
+    """Search state of every battle of a BatchState."""
+
+    flags = _batch_flags(states)
+    side = states.current_turn % 2
+    return [
+        (*fields, side)
+        for fields in zip(
+            *states.hp.tolist(), *states.cooldown.tolist(), *flags.tolist()
+        )
+    ]
+
+
+def _batch_rules(states) -> Sequence[tuple]:
+    """battle_rules of every battle of a BatchState."""
+
+    columns = zip(
+        *(
+            zip(*(column.tolist() for column in side))
+            for side in zip(
+                states.max_hp,
+                states.attack,
+                states.defense,
+                states.blast,
+                states.heal,
+                states.confuses,
+                states.skips,
+                states.recharge,
+            )
+        )
+    )
+    return [
+        tuple(
+            (max_hp, attack, defense, CompiledEffects(*special))
+            for max_hp, attack, defense, *special in sides
+        )
+        for sides in columns
+    ]
+
+
+def _batch_keys(states):
+    """Packed search state key of every battle of a BatchState, like search._key."""
+
+    import numpy as np
+
+    if len(states) and (
+        states.hp.max() > KEY_MAX_HP or states.cooldown.max() > KEY_MAX_COOLDOWN
+    ):
+        raise ValueError("Battle stats exceed the search state key fields")
+    flags = _batch_flags(states)
+    fields = (
+        states.hp[0],
+        states.hp[1],
+        states.cooldown[0],
+        states.cooldown[1],
+        flags[0],
+        flags[1],
+        np.full(len(states), states.current_turn % 2),
+    )
+    keys = np.zeros(len(states), dtype=np.int64)
+    for field, shift in zip(fields, KEY_SHIFTS):
+        keys |= field.astype(np.int64) << shift
+    return keys
+
+
+class ScriptedPolicy(Policy):
+    """Repeats a fixed sequence of actions, one per turn of its side."""
+
+    def __init__(self, actions: Sequence[ActionType]):
+        super().__init__(0)
+        self.actions = list(actions)
+
+    def act(self, state: State, turn: int, rules: tuple) -> ActionType:
+        return self.actions[turn // 2 % len(self.actions)]
+
+    def act_batch(self, states, rng):
+        import numpy as np
+
+        action = self.act(None, states.current_turn, ())
+        return np.full(len(states), _CODES[action], dtype=np.int8)
+
+
+class RandomPolicy(Policy):
+    """Picks uniformly among a set of actions."""
+
+    def __init__(
+        self,
+        actions: Sequence[ActionType] = _CHOICES,
+        rng: Optional[Union[int, RandomSource]] = None,
+    ):
+        super().__init__(rng)
+        self.actions = list(actions)
+
+    def act(self, state: State, turn: int, rules: tuple) -> ActionType:
+        return self.rng.choice(self.actions)
+
+    def act_batch(self, states, rng):
+        import numpy as np
+
+        codes = np.array([_CODES[action] for action in self.actions], dtype=np.int8)
+        return codes[rng.integers(len(codes), size=len(states))]
+
+
+class ThresholdPolicy(Policy):
+    """The enemy AI of Character.get_enemy_action, with a configurable threshold.
+
+    Flips a coin between attack and special at or above the threshold hp,
+    and between attack and defend below it.
+    """
+
+    def __init__(
+        self,
+        threshold: int = ENEMY_DEFENSIVE_HP_THRESHOLD,
+        rng: Optional[Union[int, RandomSource]] = None,
+    ):
+        super().__init__(rng)
+        self.threshold = threshold
+
+    def act(self, state: State, turn: int, rules: tuple) -> ActionType:
+        if state[state[6]] >= self.threshold:
+            return self.rng.choice([ActionType.ATTACK, ActionType.SPECIAL])
+        return self.rng.choice([ActionType.ATTACK, ActionType.DEFEND])
+
+    def act_batch(self, states, rng):
+        from .vectorized import enemy_actions
+
+        return enemy_actions(states, rng, self.threshold)
+
+
+class TablePolicy(Policy):
+    """Looks the action up in a table of search states, e.g. a precomputed strategy.
+
+    States missing from the table get the default action.
+    """
+
+    def __init__(
+        self,
+        table: Dict[State, ActionType],
+        default: ActionType = ActionType.ATTACK,
+    ):
+        super().__init__(0)
+        self.table = table
+        self.default = default
+        # Packed state keys and action codes, sorted for the batch lookups
+        self._keys = None
+        self._codes = None
+
+    def act(self, state: State, turn: int, rules: tuple) -> ActionType:
+        return self.table.get(state, self.default)
+
+    def act_batch(self, states, rng):
+        import numpy as np
+
+        if self._keys is None:
+            pairs = sorted((_key(state), _CODES[a]) for state, a in self.table.items())
+            self._keys = np.array([key for key, _ in pairs], dtype=np.int64)
+            self._codes = np.array([code for _, code in pairs], dtype=np.int8)
+        keys = _batch_keys(states)
+        found = np.searchsorted(self._keys, keys).clip(max=max(len(self._keys) - 1, 0))
+        codes = np.full(len(states), _CODES[self.default], dtype=np.int8)
+        if len(self._keys):
+            hit = self._keys[found] == keys
+            codes[hit] = self._codes[found[hit]]
+        return codes
+
+
+class SearchPolicy(Policy):
+    """Chooses actions with a src.core.search.SearchAI.
+
+    In batches every battle is searched on its own, so keep the time budget
+    small.
+    """
+
+    def __init__(self, ai: Optional[SearchAI] = None):
+        super().__init__(0)
+        self.ai = ai or SearchAI()
+
+    def act(self, state: State, turn: int, rules: tuple) -> ActionType:
+        return self.ai.choose(state, rules)
+
+
+def play_battles(
+    matchup: Tuple[CharacterFactory, CharacterFactory],
+    policies: Tuple[Policy, Policy],
+    n: int,
+    seed: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> SimulationResult:
+    """Play n headless Battles with a policy for each side.
+
+    The scalar counterpart of vectorized.run_batch(..., policies=...), which
+    accepts the same policy objects. Only the battle and turn statistics are
+    filled in.
+    """
+
+    rng = make_rng(seed)
+    first, second = matchup
+    result = SimulationResult(matchup=(first().name, second().name), battles=n)
+    for _ in range(n):
+        battle = Battle(
+            False,
+            first(),
+            second(),
+            rng=rng,
+            log_capacity=0,
+        )
+        while not battle._game_over and battle.current_turn < max_turns:
+            policy = policies[battle.current_turn % 2]
+            battle.handle_turn(policy.choose_action(battle))
+        if not battle.enemy_character.is_alive():
+            result.wins[0] += 1
+        elif not battle.player_character.is_alive():
+            result.wins[1] += 1
+        else:
+            result.timeouts += 1
+        result.turn_counts[battle.current_turn] += 1
+    return result
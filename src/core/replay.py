@@ -0,0 +1,293 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import struct
+from .action import ActionType
+from .battle import Battle
+from .battle_log import DEFAULT_LOG_CAPACITY
+from .character import Character, ENEMY_DEFENSIVE_HP_THRESHOLD
+from .damage import DAMAGE_ROLL_SPAN, damage_tables
+from .rng import CounterRandom, counter_high_bytes
+from .roster import Archetype, default_roster
+
+# File layout: a header followed by variable-size little-endian recordings
+MAGIC = b"BTLR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHI")  # magic, version, count
+# seed, player name length, enemy name length, number of actions, followed by
+# the names and one byte per action
+_RECORDING = struct.Struct("<QBBI")
+
+# Each action is stored as its index in ActionType, with this bit set when the
+# enemy AI chose it
+_ACTIONS = list(ActionType)
+_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+_BY_AI = 0x80
+_ATTACK, _DEFEND, _SPECIAL, _SKIP = (
+    _CODES[ActionType.ATTACK],
+    _CODES[ActionType.DEFEND],
+    _CODES[ActionType.SPECIAL],
+    _CODES[ActionType.SKIP],
+)
+# Fast replays draw uniform values from the high byte of each random output,
+# which needs the damage roll span and the number of actions to be powers of two
+_ROLL_SHIFT = 9 - DAMAGE_ROLL_SPAN.bit_length()
+_ACTION_SHIFT = 9 - len(_ACTIONS).bit_length()
+
+
+@dataclass
+class Recording:
+    """Everything needed to replay a battle: its seed and the actions played.
+
+    Both characters start fresh from their archetype, so they are stored by
+    name and all random numbers come from CounterRandom(seed).
+    """
+
+    seed: int
+    player: str
+    enemy: str
+    actions: bytearray = field(default_factory=bytearray)
+
+    def append(self, action: ActionType, by_ai: bool = False):
+        """Record the action passed to Battle.handle_turn."""
+
+        code = _CODES[action]
+        self.actions.append(code | _BY_AI if by_ai else code)
+
+    def turns(self) -> Iterator[Tuple[ActionType, bool]]:
+        """Yield each recorded action and whether the enemy AI chose it."""
+
+        for code in self.actions:
+            yield _ACTIONS[code & ~_BY_AI], bool(code & _BY_AI)
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the recording."""
+
+        player, enemy = self.player.encode(), self.enemy.encode()
+        return (
+            _RECORDING.pack(self.seed, len(player), len(enemy), len(self.actions))
+            + player
+            + enemy
+            + self.actions
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0) -> Tuple["Recording", int]:
+        """Read a recording at offset, returning it and the offset after it."""
+
+        seed, player_size, enemy_size, count = _RECORDING.unpack_from(data, offset)
+        offset += _RECORDING.size
+        player = bytes(data[offset : offset + player_size]).decode()
+        offset += player_size
+        enemy = bytes(data[offset : offset + enemy_size]).decode()
+        offset += enemy_size
+        actions = bytearray(data[offset : offset + count])
+        if len(actions) != count:
+            raise ValueError("Truncated battle recording")
+        return cls(seed, player, enemy, actions), offset + count
+
+
+def record(
+    player_character: Character,
+    enemy_character: Character,
+    seed: Optional[int] = None,
+    log_capacity: Optional[int] = DEFAULT_LOG_CAPACITY,
+) -> Battle:
+    """Start a battle whose turns are recorded in battle.recording.
+
+    The characters must be fresh characters from the roster.
+    """
+
+    rng = CounterRandom(seed)
+    battle = Battle(
+        False, player_character, enemy_character, rng=rng, log_capacity=log_capacity
+    )
+    battle.recording = Recording(rng.key, player_character.name, enemy_character.name)
+    return battle
+
+
+def _fast_forward(recording: Recording, turn: Optional[int], battle: Battle):
+    """Play recorded actions on a fresh headless battle without calling handle_turn.
+
+    Follows the Battle.handle_turn rules and consumes the battle's CounterRandom
+    exactly as it would. The state of the side to move and of its target lives
+    in local variables that are swapped after every turn.
+    """
+
+    actions = recording.actions[:turn]
+    mover, target = battle.player_character, battle.enemy_character
+    rng = battle.rng
+    key, start = rng.key, rng.counter
+    threshold = ENEMY_DEFENSIVE_HP_THRESHOLD
+
+    hp, target_hp = mover.current_hp, target.current_hp
+    max_hp, target_max_hp = mover.max_hp, target.max_hp
+    # Damage by roll against an undefended and a defending target
+    hits, guarded_hits = (
+        table.rolls
+        for table in damage_tables(mover.attack_points, target.defense_points)
+    )
+    target_hits, target_guarded_hits = (
+        table.rolls
+        for table in damage_tables(target.attack_points, mover.defense_points)
+    )
+    special, target_special = (
+        mover.archetype.compiled_special,
+        target.archetype.compiled_special,
+    )
+    defending = target_defending = False
+    cooldown = target_cooldown = 0
+    confused = target_confused = False
+    skip_turn = target_skip_turn = False
+    game_over = False
+
+    # At most three draws per turn: the enemy AI, a confused action and a damage
+    # roll. Draws are generated up front for a typical battle, where most turns
+    # draw once for the AI and once for an attack, and extended when needed
+    draws = counter_high_bytes(key, start, 2 * len(actions) + 3)
+    limit = len(draws) - 3
+    position = 0
+
+    for index, code in enumerate(actions):
+        if position > limit:
+            draws = draws[position:] + counter_high_bytes(
+                key, start + len(draws), len(actions) + 3
+            )
+            start += position
+            limit = len(draws) - 3
+            position = 0
+
+        action = code & ~_BY_AI
+        if code & _BY_AI:
+            # The enemy AI picks between two actions with one draw
+            if draws[position] >> 7:
+                chosen = _SPECIAL if hp >= threshold else _DEFEND
+            else:
+                chosen = _ATTACK
+            position += 1
+            if chosen != action:
+                raise ValueError(f"Replay diverged from the recording at turn {index}")
+
+        if confused:
+            confused = False
+            action = draws[position] >> _ACTION_SHIFT
+            position += 1
+        elif skip_turn:
+            skip_turn = False
+            action = _SKIP
+
+        if action == _ATTACK:
+            if target_defending:
+                target_hp -= guarded_hits[draws[position] >> _ROLL_SHIFT]
+                target_defending = False
+            else:
+                target_hp -= hits[draws[position] >> _ROLL_SHIFT]
+            position += 1
+        elif action == _DEFEND:
+            defending = True
+        elif action == _SPECIAL and cooldown == 0:
+            if special.confuses:
+                target_confused = True
+            elif special.skips:
+                target_skip_turn = True
+            hp = min(hp + special.heal, max_hp)
+            target_hp -= special.damage
+            cooldown = special.cooldown
+
+        if cooldown > 0:
+            cooldown -= 1
+        if target_cooldown > 0:
+            target_cooldown -= 1
+        if hp <= 0 or target_hp <= 0:
+            game_over = True
+
+        # The target moves next
+        mover, target = target, mover
+        hp, target_hp = target_hp, hp
+        max_hp, target_max_hp = target_max_hp, max_hp
+        hits, target_hits = target_hits, hits
+        guarded_hits, target_guarded_hits = target_guarded_hits, guarded_hits
+        special, target_special = target_special, special
+        defending, target_defending = target_defending, defending
+        cooldown, target_cooldown = target_cooldown, cooldown
+        confused, target_confused = target_confused, confused
+        skip_turn, target_skip_turn = target_skip_turn, skip_turn
+
+    mover.current_hp, target.current_hp = hp, target_hp
+    mover.is_defending, target.is_defending = defending, target_defending
+    mover.special_cooldown, target.special_cooldown = cooldown, target_cooldown
+    mover.confused, target.confused = confused, target_confused
+    mover.skip_turn, target.skip_turn = skip_turn, target_skip_turn
+    rng.counter = start + position
+    battle.current_turn = len(actions)
+    battle._game_over = game_over
+    battle.selected_character, battle.target_character = mover, target
+
+
+def replay(
+    recording: Recording,
+    turn: Optional[int] = None,
+    roster: Optional[Dict[str, Archetype]] = None,
+    log_capacity: Optional[int] = 0,
+) -> Battle:
+    """Rebuild the state of a recorded battle after its first turn actions.
+
+    Replays all actions when turn is None. The replayed battle never prompts
+    for input or prints. Headless replays skip Battle.handle_turn and run
+    several times faster, while replays with a log_capacity go through it to
+    rebuild the battle log. Raises ValueError if an action chosen by the enemy AI is no
+    longer what the AI chooses, e.g. after the game rules changed.
+    """
+
+    roster = default_roster() if roster is None else roster
+    try:
+        player = Character.from_archetype(roster[recording.player], True)
+        enemy = Character.from_archetype(roster[recording.enemy])
+    except KeyError as error:
+        raise ValueError(f"Character {error.args[0]!r} is not in the roster") from None
+
+    rng = CounterRandom(recording.seed)
+    battle = Battle(False, player, enemy, rng=rng, log_capacity=log_capacity)
+    battle.print_outcome = False
+    if log_capacity == 0:
+        _fast_forward(recording, turn, battle)
+        return battle
+
+    handle_turn = battle.handle_turn
+    for index, code in enumerate(recording.actions[:turn]):
+        action = _ACTIONS[code & ~_BY_AI]
+        if code & _BY_AI and battle.selected_character.get_enemy_action(rng) != action:
+            raise ValueError(f"Replay diverged from the recording at turn {index}")
+        handle_turn(action)
+    return battle
+
+
+def write(path: Union[str, Path], recordings: Iterable[Recording]):
+    """Write recordings to a file."""
+
+    recordings = list(recordings)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(recordings)))
+        for recording in recordings:
+            file.write(recording.to_bytes())
+
+
+def read(path: Union[str, Path]) -> List[Recording]:
+    """Read every recording in a file."""
+
+    data = memoryview(Path(path).read_bytes())
+    magic, version, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a battle recording file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported recording version {version}")
+
+    recordings = []
+    offset = HEADER.size
+    for _ in range(count):
+        recording, offset = Recording.from_bytes(data, offset)
+        recordings.append(recording)
+    return recordings
@@ -0,0 +1,425 @@
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+import mmap
+import struct
+import sys
+from .battle import Battle
+from .battle_log import LogEvent
+
+# File layout: a header followed by appended chunks. A data chunk holds the
+# rows of every column one after the other, each column a little-endian array
+# padded to 8 bytes, so columns can be cast in place from a memory-mapped
+# file. A names chunk adds entries to the character name dictionary. The magic
+# differs from the replay format's, so neither reader accepts the other's files
+MAGIC = b"BTRS"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHBx")  # magic, version, table kind
+CHUNK = struct.Struct("<BxxxI")  # chunk kind, row or name count
+_ALIGNMENT = 8
+
+# Table kinds, one file per table
+BATTLES = 1
+EVENTS = 2
+# Chunk kinds
+_DATA = 1
+_NAMES = 2
+
+# Columns of each table as (name, array typecode). Battles are numbered in
+# the order they were added, characters are indices into the name
+# dictionary and the winner is the side that won, or -1 on a timeout
+SCHEMAS: Dict[int, Tuple[Tuple[str, str], ...]] = {
+    BATTLES: (
+        ("battle", "Q"),
+        ("first", "H"),
+        ("second", "H"),
+        ("winner", "b"),
+        ("turns", "I"),
+        ("hp0", "i"),
+        ("hp1", "i"),
+    ),
+    # One row per battle log event. The actor is the side taking the turn or
+    # -1, and the value is the event's number (e.g. damage) or 0
+    EVENTS: (
+        ("battle", "Q"),
+        ("turn", "I"),
+        ("event", "B"),
+        ("actor", "b"),
+        ("value", "i"),
+    ),
+}
+FILENAMES = {BATTLES: "battles.btr", EVENTS: "events.btr"}
+# Rows buffered per column before they are written as one chunk
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+# Event codes are positions in LogEvent
+EVENT_TYPES = list(LogEvent)
+_EVENT_CODES = {event: code for code, event in enumerate(EVENT_TYPES)}
+# Events logged once per turn by the action taken
+_ACTION_EVENTS = {
+    LogEvent.ATTACK,
+    LogEvent.ATTACK_NO_DAMAGE,
+    LogEvent.DEFEND,
+    LogEvent.SPECIAL,
+    LogEvent.RECHARGING,
+    LogEvent.SKIP,
+}
+_SWAP_BYTES = sys.byteorder == "big"
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % _ALIGNMENT)
+
+
+def _scan(view: memoryview, kind: int) -> Tuple[List[Tuple[int, int]], List[str], int]:
+    """Locate the complete chunks of a table file.
+
+    Returns (offset, rows) of every data chunk, the name dictionary and the
+    end of the last complete chunk. A chunk cut short by a crash ends the scan.
+    """
+
+    magic, version, table = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a battle results file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported results version {version}")
+    if table != kind:
+        raise ValueError(f"Expected table kind {kind}, found {table}")
+    chunks = []
+    names = []
+    offset = end = HEADER.size
+    while offset + CHUNK.size <= len(view):
+        chunk, count = CHUNK.unpack_from(view, offset)
+        offset += CHUNK.size
+        if chunk == _DATA:
+            size = sum(
+                count * size + len(_padding(count * size))
+                for size in (array(code).itemsize for _, code in SCHEMAS[kind])
+            )
+            if offset + size > len(view):
+                break
+            chunks.append((offset, count))
+        elif chunk == _NAMES:
+            if offset + 4 > len(view):
+                break
+            (length,) = struct.unpack_from("<I", view, offset)
+            size = 4 + length + len(_padding(4 + length))
+            if offset + size > len(view):
+                break
+            data = bytes(view[offset + 4 : offset + 4 + length])
+            names.extend(data.decode().split("\0") if count else [])
+        else:
+            break
+        offset += size
+        end = offset
+    return chunks, names, end
+
+
+class TableWriter:
+    """Append rows to one table file, buffering them column by column."""
+
+    def __init__(
+        self, path: Union[str, Path], kind: int, chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ):
+        self.kind = kind
+        self.chunk_rows = chunk_rows
+        self.columns = {name: array(code) for name, code in SCHEMAS[kind]}
+        self._pending_names: List[str] = []
+        path = Path(path)
+        self.rows = 0
+        self.names: List[str] = []
+        if path.exists() and path.stat().st_size:
+            # Continue after the last complete chunk, dropping a partial one
+            self._file = open(path, "r+b")
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                with memoryview(data) as view:
+                    chunks, self.names, end = _scan(view, kind)
+            self.rows = sum(rows for _, rows in chunks)
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, kind))
+        self._codes = {name: code for code, name in enumerate(self.names)}
+
+    def name_code(self, name: str) -> int:
+        """Index of a character name in the dictionary, adding it if new."""
+
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+            self._pending_names.append(name)
+        return code
+
+    def append(self, *values):
+        """Buffer a row, given in schema order."""
+
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        self.rows += 1
+        if len(self.columns["battle"]) >= self.chunk_rows:
+            self.flush()
+
+    def extend(self, *columns):
+        """Buffer many rows at once, given as one sequence per column."""
+
+        for column, values in zip(self.columns.values(), columns):
+            column.extend(values)
+        self.rows += len(columns[0])
+        if len(self.columns["battle"]) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one chunk."""
+
+        if self._pending_names:
+            data = "\0".join(self._pending_names).encode()
+            self._file.write(CHUNK.pack(_NAMES, len(self._pending_names)))
+            self._file.write(struct.pack("<I", len(data)) + data)
+            self._file.write(_padding(4 + len(data)))
+            self._pending_names = []
+        count = len(self.columns["battle"])
+        if count:
+            self._file.write(CHUNK.pack(_DATA, count))
+            for column in self.columns.values():
+                if _SWAP_BYTES:
+                    column.byteswap()
+                self._file.write(column)
+                self._file.write(_padding(count * column.itemsize))
+                del column[:]
+        self._file.flush()
+
+    def close(self):
+        """Flush the buffered rows and close the file."""
+
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class ResultSink:
+    """Streaming, append-only writer of battle summaries and events.
+
+    Writes a directory with one columnar file per table. Rows are buffered
+    in typed arrays and written chunk_rows at a time, and opening an existing
+    directory appends to it. Read the results with ResultReader.
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.battles = TableWriter(
+            self.directory / FILENAMES[BATTLES], BATTLES, chunk_rows
+        )
+        self.events = TableWriter(
+            self.directory / FILENAMES[EVENTS], EVENTS, chunk_rows
+        )
+
+    def add_summary(
+        self, first: str, second: str, winner: int, turns: int, hp0: int, hp1: int
+    ) -> int:
+        """Add the summary of a battle, returning its number."""
+
+        battles = self.battles
+        battle = battles.rows
+        battles.append(
+            battle,
+            battles.name_code(first),
+            battles.name_code(second),
+            winner,
+            turns,
+            hp0,
+            hp1,
+        )
+        return battle
+
+    def add_summaries(
+        self,
+        first: str,
+        second: str,
+        winners: array,
+        turns: array,
+        hp0: array,
+        hp1: array,
+    ) -> range:
+        """Add the summaries of many battles between the same two characters.
+
+        Takes a typed array per column, returning the numbers of the battles.
+        """
+
+        battles = self.battles
+        count = len(winners)
+        numbers = range(battles.rows, battles.rows + count)
+        battles.extend(
+            array("Q", numbers),
+            array("H", [battles.name_code(first)]) * count,
+            array("H", [battles.name_code(second)]) * count,
+            winners,
+            turns,
+            hp0,
+            hp1,
+        )
+        return numbers
+
+    def add_battle(self, battle: Battle) -> int:
+        """Add the summary and logged events of a finished battle.
+
+        Every event of the battle log is added, so it must have been played
+        with log_capacity=None, or 0 to only add the summary. Turns are
+        counted from the action events in the log, the player acting on odd
+        turns.
+        """
+
+        log = battle.battle_log
+        if log.total > len(log):
+            raise ValueError("The battle log dropped events, use log_capacity=None")
+        player, enemy = battle.player_character, battle.enemy_character
+        if not enemy.is_alive():
+            winner = 0
+        elif not player.is_alive():
+            winner = 1
+        else:
+            winner = -1
+        number = self.add_summary(
+            player.name,
+            enemy.name,
+            winner,
+            battle.current_turn,
+            player.current_hp,
+            enemy.current_hp,
+        )
+
+        append = self.events.append
+        turn = 0
+        for event, actor, _, value in log.entries():
+            if event in _ACTION_EVENTS:
+                turn += 1
+            # Logged before the action of the next turn
+            current = turn + 1 if event is LogEvent.CONFUSED else turn
+            append(
+                number,
+                current,
+                _EVENT_CODES[event],
+                (current - 1) % 2 if actor is not None and current else -1,
+                value if type(value) is int else 0,
+            )
+        return number
+
+    def flush(self):
+        """Write every buffered row."""
+
+        self.battles.flush()
+        self.events.flush()
+
+    def close(self):
+        """Flush and close both tables."""
+
+        self.battles.close()
+        self.events.close()
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TableReader:
+    """Columns of a table file, read in place from a memory map."""
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap], kind: int):
+        self.kind = kind
+        # Kept to close the memory map of files opened with open
+        self._data = data
+        self._view = memoryview(data)
+        self._chunks, self.names, _ = _scan(self._view, kind)
+        self._typecodes = dict(SCHEMAS[kind])
+        self.rows = sum(rows for _, rows in self._chunks)
+
+    @classmethod
+    def open(cls, path: Union[str, Path], kind: int) -> "TableReader":
+        """Memory-map a table file for reading."""
+
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), kind)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self):
+        """Release the data, closing the memory map of an opened file.
+
+        Column chunks and NumPy arrays viewing them must be released first.
+        """
+
+        self._view.release()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> "TableReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def column(self, name: str) -> Iterator[memoryview]:
+        """The chunks of a column as typed memoryviews, without copying.
+
+        Columns are stored little-endian, so on big-endian machines use
+        to_numpy instead.
+        """
+
+        if name not in self._typecodes:
+            raise KeyError(f"Unknown column {name!r}")
+        for offset, rows in self._chunks:
+            for column, code in SCHEMAS[self.kind]:
+                size = rows * array(code).itemsize
+                if column == name:
+                    yield self._view[offset : offset + size].cast(code)
+                    break
+                offset += size + len(_padding(size))
+
+    def to_numpy(self, name: str):
+        """A column as a single NumPy array."""
+
+        # NumPy is optional, so only import it when a column is converted
+        import numpy as np
+
+        dtype = np.dtype(self._typecodes[name]).newbyteorder("<")
+        chunks = [np.frombuffer(chunk, dtype) for chunk in self.column(name)]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype)
+
+
+class ResultReader:
+    """Memory-mapped tables of a directory written by ResultSink."""
+
+    def __init__(self, directory: Union[str, Path]):
+        directory = Path(directory)
+        self.battles = TableReader.open(directory / FILENAMES[BATTLES], BATTLES)
+        self.events = TableReader.open(directory / FILENAMES[EVENTS], EVENTS)
+
+    @property
+    def names(self) -> List[str]:
+        """Character names, indexed by the first and second battle columns."""
+
+        return self.battles.names
+
+    def event_type(self, code: int) -> LogEvent:
+        """The LogEvent of a code in the event column."""
+
+        return EVENT_TYPES[code]
+
+    def close(self):
+        """Close both tables."""
+
+        self.battles.close()
+        self.events.close()
+
+    def __enter__(self) -> "ResultReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
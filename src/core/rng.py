@@ -0,0 +1,157 @@
+from hashlib import shake_256
+from typing import Any, List, Optional, Protocol, Sequence, Tuple, TypeVar, Union
+import os
+import random
+import struct
+
+T = TypeVar("T")
+
+_MASK64 = (1 << 64) - 1
+# CounterRandom outputs are generated in blocks of 64-bit words
+_BLOCK_SIZE = 64
+_WORDS = struct.Struct(f"<{_BLOCK_SIZE}Q")
+
+
+class RandomSource(Protocol):
+    """Random number source used by a battle.
+
+    Any object with these methods can be passed to Battle, which makes it easy
+    to swap the standard library generator for a NumPy one or a scripted stub.
+    """
+
+    def randint(self, a: int, b: int) -> int:
+        """Return a random integer in the inclusive range [a, b]."""
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Return a random element of a non-empty sequence."""
+
+    def randints(self, a: int, b: int, count: int) -> List[int]:
+        """Return count random integers in the inclusive range [a, b]."""
+
+
+class PythonRandom(random.Random):
+    """Standard library generator with bulk integer draws."""
+
+    def randints(self, a: int, b: int, count: int) -> List[int]:
+        """Return count random integers in the inclusive range [a, b]."""
+
+        return self.choices(range(a, b + 1), k=count)
+
+
+def _counter_block(key: bytes, block: int) -> bytes:
+    """Return the bytes of the CounterRandom outputs in the given block."""
+
+    return shake_256(key + block.to_bytes(8, "little")).digest(8 * _BLOCK_SIZE)
+
+
+def counter_high_bytes(key: int, start: int, count: int) -> bytes:
+    """Return the most significant byte of count CounterRandom outputs from start.
+
+    A uniform draw from a power of two span of at most 256 values only depends
+    on this byte, so hot loops can consume the stream like random bytes.
+    """
+
+    key_bytes = key.to_bytes(8, "little")
+    first = start // _BLOCK_SIZE
+    stream = b"".join(
+        _counter_block(key_bytes, block)
+        for block in range(first, (start + count - 1) // _BLOCK_SIZE + 1)
+    )
+    # Outputs are little-endian, so every eighth byte is a most significant one
+    offset = start - first * _BLOCK_SIZE
+    return stream[7::8][offset : offset + count]
+
+
+class CounterRandom:
+    """Counter-based generator whose whole state is a 64-bit key and a counter.
+
+    Outputs come in blocks of 64 words, each block being the SHAKE256 digest
+    of the key and the block number, so the state is tiny to store and any
+    position in the stream can be jumped to directly.
+    """
+
+    __slots__ = ("key", "counter", "_key_bytes", "_block", "_words")
+
+    def __init__(self, seed: Optional[int] = None, counter: int = 0):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.key = seed & _MASK64
+        self.counter = counter
+        # Cache of the most recently hashed block of outputs
+        self._key_bytes = self.key.to_bytes(8, "little")
+        self._block = -1
+        self._words: Tuple[int, ...] = ()
+
+    def _next(self) -> int:
+        """Return the next 64-bit output."""
+
+        block, index = divmod(self.counter, _BLOCK_SIZE)
+        self.counter += 1
+        if block != self._block:
+            self._block = block
+            self._words = _WORDS.unpack(_counter_block(self._key_bytes, block))
+        return self._words[index]
+
+    def randint(self, a: int, b: int) -> int:
+        """Return a random integer in the inclusive range [a, b]."""
+
+        return a + (self._next() * (b - a + 1) >> 64)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Return a random element of a non-empty sequence."""
+
+        return seq[self._next() * len(seq) >> 64]
+
+    def randints(self, a: int, b: int, count: int) -> List[int]:
+        """Return count random integers in the inclusive range [a, b]."""
+
+        return [self.randint(a, b) for _ in range(count)]
+
+    def getstate(self) -> Tuple[int, int]:
+        return self.key, self.counter
+
+    def setstate(self, state: Tuple[int, int]):
+        self.__init__(*state)
+
+
+class NumpyRandom:
+    """Adapter exposing a NumPy Generator as a RandomSource.
+
+    Accepts a seed or an existing Generator, so counter-based bit generators
+    such as Philox can be used, e.g.
+    NumpyRandom(numpy.random.Generator(numpy.random.Philox(seed))).
+    """
+
+    def __init__(self, generator: Any = None):
+        if generator is None or isinstance(generator, int):
+            # NumPy is optional, so only import it when a seed is given
+            import numpy as np
+
+            generator = np.random.default_rng(generator)
+        self.generator = generator
+
+    def randint(self, a: int, b: int) -> int:
+        """Return a random integer in the inclusive range [a, b]."""
+
+        return int(self.generator.integers(a, b + 1))
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Return a random element of a non-empty sequence."""
+
+        return seq[int(self.generator.integers(len(seq)))]
+
+    def randints(self, a: int, b: int, count: int) -> List[int]:
+        """Return count random integers in the inclusive range [a, b]."""
+
+        return self.generator.integers(a, b + 1, count).tolist()
+
+
+def make_rng(rng: Optional[Union[int, RandomSource]] = None) -> RandomSource:
+    """Build a random source from a seed, or pass an existing source through."""
+
+    if rng is None or isinstance(rng, int):
+        return PythonRandom(rng)
+    if not hasattr(rng, "randint") and hasattr(rng, "integers"):
+        # A bare NumPy Generator
+        return NumpyRandom(rng)
+    return rng
@@ -0,0 +1,280 @@
+from dataclasses import astuple, dataclass
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import hashlib
+import json
+import marshal
+import os
+from .damage import build_damage_tables
+from .effects import Effect, EffectKind, Status, compile_effects
+
+# Location of the character definitions shipped with the game
+DEFAULT_ROSTER_PATH = Path(__file__).resolve().parents[2] / "config" / "characters.json"
+# Bump whenever the layout of the compiled cache changes
+CACHE_VERSION = 3
+# Number of turns before a special ability can be used again, unless configured
+SPECIAL_COOLDOWN = 3
+# Initiative of characters in team battles, unless configured. Twice the speed
+# means twice as many turns
+DEFAULT_SPEED = 10
+
+
+class SpecialEffect(Enum):
+    """Effects a special ability can have."""
+
+    CONFUSE = "confuse"
+    SKIP_TURN = "skip_turn"
+    HEAL = "heal"
+
+
+def _legacy_effects(effect: Optional[SpecialEffect], amount: int) -> Tuple[Effect, ...]:
+    """Effects of an ability defined by a single SpecialEffect."""
+
+    if effect is SpecialEffect.CONFUSE:
+        return (Effect(EffectKind.STATUS, status=Status.CONFUSED),)
+    if effect is SpecialEffect.SKIP_TURN:
+        return (Effect(EffectKind.STATUS, status=Status.SKIP_TURN),)
+    if effect is SpecialEffect.HEAL:
+        return (Effect(EffectKind.HEAL, amount),)
+    return ()
+
+
+@dataclass(frozen=True)
+class Archetype:
+    """Static definition shared by every character of the same kind.
+
+    The special ability is a list of effects. Abilities with a single effect
+    can still be given as special_effect and special_amount instead.
+    """
+
+    name: str
+    attack_points: int
+    defense_points: int
+    max_hp: int = 100
+    special_ability_name: str = ""
+    special_cooldown: int = SPECIAL_COOLDOWN
+    special_effect: Optional[SpecialEffect] = None
+    special_amount: int = 0
+    effects: Tuple[Effect, ...] = ()
+    speed: int = DEFAULT_SPEED
+
+    def __post_init__(self):
+        effects = tuple(self.effects) or _legacy_effects(
+            self.special_effect, self.special_amount
+        )
+        object.__setattr__(self, "effects", effects)
+        # Everything a use of the special ability applies, ending with its cooldown
+        object.__setattr__(
+            self,
+            "special_effects",
+            effects + (Effect(EffectKind.COOLDOWN, self.special_cooldown),),
+        )
+        # The same, combined for the simulation, replay and search kernels
+        object.__setattr__(
+            self, "compiled_special", compile_effects(self.special_effects)
+        )
+
+
+def _require_int(name: str, field: str, value: object, minimum: int) -> int:
+    """Check an integer field of a character definition."""
+
+    if type(value) is not int or value < minimum:
+        raise ValueError(f"Character {name!r}: {field} must be an integer >= {minimum}")
+    return value
+
+
+def _parse_effects(name: str, entries: object) -> Tuple[Effect, ...]:
+    """Validate the effects list of a special ability."""
+
+    if not isinstance(entries, list):
+        raise ValueError(f"Character {name!r}: effects must be a list")
+    kinds = {EffectKind.DAMAGE.value, EffectKind.HEAL.value, EffectKind.STATUS.value}
+    effects = []
+    for entry in entries:
+        kind = entry.get("kind") if isinstance(entry, dict) else None
+        if kind not in kinds:
+            raise ValueError(f"Character {name!r}: unknown effect kind {kind!r}")
+        if kind == EffectKind.STATUS.value:
+            status = entry.get("status")
+            if status not in {status.value for status in Status}:
+                raise ValueError(f"Character {name!r}: unknown status {status!r}")
+            effects.append(Effect(EffectKind.STATUS, status=Status(status)))
+        else:
+            amount = _require_int(name, "amount", entry.get("amount"), 0)
+            effects.append(Effect(EffectKind(kind), amount))
+    return tuple(effects)
+
+
+def _parse(data: object) -> List[Archetype]:
+    """Validate parsed JSON and build the archetypes it defines."""
+
+    if not isinstance(data, dict) or not isinstance(data.get("characters"), list):
+        raise ValueError("Roster must be an object with a 'characters' list")
+
+    archetypes = []
+    for entry in data["characters"]:
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+            raise ValueError("Every character needs a string 'name'")
+        name = entry["name"]
+        special = entry.get("special_ability", {})
+        if not isinstance(special, dict):
+            raise ValueError(f"Character {name!r}: special_ability must be an object")
+        effect = special.get("effect")
+        if effect is not None and effect not in {kind.value for kind in SpecialEffect}:
+            raise ValueError(f"Character {name!r}: unknown effect {effect!r}")
+        effects = ()
+        if "effects" in special:
+            if effect is not None:
+                raise ValueError(f"Character {name!r}: give either effect or effects")
+            effects = _parse_effects(name, special["effects"])
+            try:
+                compile_effects(effects)
+            except ValueError as error:
+                raise ValueError(f"Character {name!r}: {error}") from None
+
+        archetypes.append(
+            Archetype(
+                name=name,
+                attack_points=_require_int(
+                    name, "attack_points", entry.get("attack_points"), 0
+                ),
+                defense_points=_require_int(
+                    name, "defense_points", entry.get("defense_points"), 0
+                ),
+                max_hp=_require_int(name, "max_hp", entry.get("max_hp", 100), 1),
+                special_ability_name=str(special.get("name", "")),
+                special_cooldown=_require_int(
+                    name, "cooldown", special.get("cooldown", SPECIAL_COOLDOWN), 0
+                ),
+                special_effect=SpecialEffect(effect) if effect else None,
+                special_amount=_require_int(
+                    name, "amount", special.get("amount", 0), 0
+                ),
+                effects=effects,
+                speed=_require_int(name, "speed", entry.get("speed", DEFAULT_SPEED), 1),
+            )
+        )
+
+    names = [archetype.name for archetype in archetypes]
+    if len(set(names)) != len(names):
+        raise ValueError("Character names must be unique")
+    return archetypes
+
+
+def _to_rows(archetypes: List[Archetype]) -> list:
+    """Flatten archetypes into plain tuples that marshal can store."""
+
+    return [
+        (
+            archetype.name,
+            archetype.attack_points,
+            archetype.defense_points,
+            archetype.max_hp,
+            archetype.special_ability_name,
+            archetype.special_cooldown,
+            archetype.special_effect.value if archetype.special_effect else None,
+            archetype.special_amount,
+            tuple(
+                (kind.value, amount, status and status.value)
+                for kind, amount, status in map(astuple, archetype.effects)
+            ),
+            archetype.speed,
+        )
+        for archetype in archetypes
+    ]
+
+
+def _from_rows(rows: list) -> List[Archetype]:
+    """Rebuild archetypes from cached tuples, skipping validation."""
+
+    return [
+        Archetype(
+            *row[:6],
+            SpecialEffect(row[6]) if row[6] else None,
+            row[7],
+            tuple(
+                Effect(EffectKind(kind), amount, Status(status) if status else None)
+                for kind, amount, status in row[8]
+            ),
+            row[9],
+        )
+        for row in rows
+    ]
+
+
+def _by_name(archetypes: List[Archetype]) -> Dict[str, Archetype]:
+    # Every loaded roster has its damage tables ready before the first battle
+    build_damage_tables(
+        {archetype.attack_points for archetype in archetypes},
+        {archetype.defense_points for archetype in archetypes},
+    )
+    return {archetype.name: archetype for archetype in archetypes}
+
+
+def _cache_path(path: Path) -> Path:
+    return path.with_name(path.name + ".cache")
+
+
+def load_roster(
+    path: Union[str, Path] = DEFAULT_ROSTER_PATH, use_cache: bool = True
+) -> Dict[str, Archetype]:
+    """Load the character archetypes defined in a roster JSON file, keyed by name.
+
+    The validated roster is stored next to the file as a compiled marshal
+    snapshot. The snapshot is reused while the file's modification time and
+    size are unchanged, or while its content hash still matches, so JSON is
+    only parsed and validated again after the file actually changes.
+    """
+
+    path = Path(path)
+    cache_path = _cache_path(path)
+    stat = path.stat()
+    content = None
+
+    if use_cache:
+        try:
+            version, mtime_ns, size, digest, rows = marshal.loads(
+                cache_path.read_bytes()
+            )
+        except (OSError, EOFError, ValueError, TypeError):
+            version = None
+        if version == CACHE_VERSION:
+            if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+                return _by_name(_from_rows(rows))
+            # The file was touched, only parse it again if the content changed
+            content = path.read_bytes()
+            if hashlib.blake2b(content).digest() == digest:
+                _write_cache(cache_path, stat, digest, rows)
+                return _by_name(_from_rows(rows))
+
+    if content is None:
+        content = path.read_bytes()
+    archetypes = _parse(json.loads(content))
+    if use_cache:
+        digest = hashlib.blake2b(content).digest()
+        _write_cache(cache_path, stat, digest, _to_rows(archetypes))
+    return _by_name(archetypes)
+
+
+def _write_cache(cache_path: Path, stat: os.stat_result, digest: bytes, rows: list):
+    """Atomically write the compiled roster snapshot, ignoring unwritable locations."""
+
+    temporary = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        temporary.write_bytes(
+            marshal.dumps(
+                (CACHE_VERSION, stat.st_mtime_ns, stat.st_size, digest, rows)
+            )
+        )
+        os.replace(temporary, cache_path)
+    except OSError:
+        temporary.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=None)
+def default_roster() -> Dict[str, Archetype]:
+    """Roster shipped in config/characters.json, loaded once per process."""
+
+    return load_roster()
@@ -0,0 +1,278 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+import time
+from .action import ActionType
+from .battle import Battle
+from .character import Character
+from .damage import damage_tables
+
+# Seconds the search may spend choosing a single move
+DEFAULT_TIME_BUDGET = 0.05
+# Deepest search, in turns, even when the time budget allows more
+DEFAULT_MAX_DEPTH = 8
+# Number of positions kept in the transposition table
+DEFAULT_TABLE_SIZE = 200_000
+# The clock is only read every this many searched positions
+_CLOCK_INTERVAL = 256
+
+# Actions the search chooses from, in the order they are tried
+_CHOICES = (ActionType.ATTACK, ActionType.SPECIAL, ActionType.DEFEND)
+_ACTIONS = list(ActionType)
+
+# Status flags of each side within a search state
+DEFENDING, CONFUSED, SKIP_TURN = 1, 2, 4
+
+# A search state: (hp of side 0, hp of side 1, cooldown of side 0, cooldown of
+# side 1, flags of side 0, flags of side 1, side to move). Side 0 is the
+# battle's player character and side 1 its enemy character
+State = Tuple[int, int, int, int, int, int, int]
+
+
+# Bit offset of each field of a State within its packed key, in State order.
+# hp takes 19 bits, cooldowns 8 bits and flags 3 bits, so keys fit an int64
+KEY_SHIFTS = (43, 24, 16, 8, 5, 2, 0)
+# Largest max hp and cooldown the key fields hold without overlapping
+KEY_MAX_HP = (1 << 19) - 1
+KEY_MAX_COOLDOWN = (1 << 8) - 1
+(
+    _HP0_SHIFT,
+    _HP1_SHIFT,
+    _COOLDOWN0_SHIFT,
+    _COOLDOWN1_SHIFT,
+    _FLAGS0_SHIFT,
+    _FLAGS1_SHIFT,
+    _SIDE_SHIFT,
+) = KEY_SHIFTS
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+def _key(state: State) -> int:
+    """Pack a state into a single integer used as transposition table key."""
+
+    hp0, hp1, cooldown0, cooldown1, flags0, flags1, side = state
+    return (
+        hp0 << _HP0_SHIFT
+        | hp1 << _HP1_SHIFT
+        | cooldown0 << _COOLDOWN0_SHIFT
+        | cooldown1 << _COOLDOWN1_SHIFT
+        | flags0 << _FLAGS0_SHIFT
+        | flags1 << _FLAGS1_SHIFT
+        | side << _SIDE_SHIFT
+    )
+
+
+def battle_state(battle: Battle) -> State:
+    """Extract the search state of a battle."""
+
+    def flags(character: Character) -> int:
+        return (
+            character.is_defending * DEFENDING
+            | character.confused * CONFUSED
+            | character.skip_turn * SKIP_TURN
+        )
+
+    player, enemy = battle.player_character, battle.enemy_character
+    return (
+        player.current_hp,
+        enemy.current_hp,
+        player.special_cooldown,
+        enemy.special_cooldown,
+        flags(player),
+        flags(enemy),
+        int(battle.selected_character is enemy),
+    )
+
+
+def battle_rules(battle: Battle) -> tuple:
+    """Static stats of both sides: (max hp, attack, defense, compiled special)."""
+
+    return tuple(
+        (
+            character.max_hp,
+            character.attack_points,
+            character.defense_points,
+            character.archetype.compiled_special,
+        )
+        for character in (battle.player_character, battle.enemy_character)
+    )
+
+
+class SearchAI:
+    """Enemy AI choosing actions by expectiminimax search.
+
+    Both characters are assumed to play their best action, while damage rolls
+    and the actions of confused characters are averaged over their
+    probabilities. Searches deepen one turn at a time until the time budget
+    runs out, and positions are cached in a bounded transposition table that
+    is kept across moves, so later moves reuse the subtrees already searched.
+    """
+
+    def __init__(
+        self,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        table_size: int = DEFAULT_TABLE_SIZE,
+    ):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table_size = table_size
+        # Maps a packed state to (searched depth, value for side 0, best action)
+        self.table: OrderedDict = OrderedDict()
+        # Depth reached by the last completed search
+        self.depth = 0
+        self.table_hits = 0
+        self._rules: Optional[tuple] = None
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def choose_action(self, battle: Battle) -> ActionType:
+        """Choose the action of the battle's selected character."""
+
+        return self.choose(battle_state(battle), battle_rules(battle))
+
+    def choose(self, state: State, rules: tuple) -> ActionType:
+        """Choose the action of the side to move in a state, given battle_rules."""
+
+        self._deadline = time.perf_counter() + self.time_budget
+        self._nodes = 0
+        self._load_rules(rules)
+
+        best = ActionType.ATTACK
+        for depth in range(1, self.max_depth + 1):
+            try:
+                self._search(state, depth)
+            except _Timeout:
+                break
+            best = self.table[_key(state)][2] or best
+            self.depth = depth
+        return best
+
+    def _load_rules(self, rules: tuple):
+        """Use the static stats of both characters, dropping stale cached positions."""
+
+        if rules == self._rules:
+            return
+        for max_hp, _, _, special in rules:
+            if max_hp > KEY_MAX_HP:
+                raise ValueError(f"Search states hold at most {KEY_MAX_HP} hp")
+            if (special.cooldown or 0) > KEY_MAX_COOLDOWN:
+                raise ValueError(
+                    f"Search states hold cooldowns of at most {KEY_MAX_COOLDOWN}"
+                )
+        self.table.clear()
+        self._rules = rules
+        (max_hp0, attack0, defense0, *_), (max_hp1, attack1, defense1, *_) = rules
+        self._max_hp = (max_hp0, max_hp1)
+        self._specials = tuple(rule[3] for rule in rules)
+        # Damage distributions by attacking side and whether the target defends
+        self._damage = tuple(
+            tuple(table.distribution for table in damage_tables(attack, defense))
+            for attack, defense in ((attack0, defense1), (attack1, defense0))
+        )
+
+    def _evaluate(self, state: State) -> float:
+        """Estimate the win probability of side 0 from the share of hp left."""
+
+        hp0, hp1 = state[0], state[1]
+        return 0.5 + 0.5 * (hp0 / self._max_hp[0] - hp1 / self._max_hp[1])
+
+    def _search(self, state: State, depth: int) -> float:
+        """Value of a state for side 0, searching depth turns ahead."""
+
+        key = _key(state)
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            self.table.move_to_end(key)
+            self.table_hits += 1
+            return entry[1]
+
+        flags = state[4 + state[6]]
+        best_action = None
+        if flags & CONFUSED:
+            value = sum(
+                self._outcome(state, action, depth) for action in _ACTIONS
+            ) / len(_ACTIONS)
+        elif flags & SKIP_TURN:
+            value = self._outcome(state, ActionType.SKIP, depth)
+        else:
+            # Try the best action of a previous search first
+            choices = _CHOICES
+            if entry is not None and entry[2] is not None:
+                choices = (entry[2],) + tuple(c for c in _CHOICES if c != entry[2])
+            maximize = state[6] == 0
+            value = None
+            for action in choices:
+                outcome = self._outcome(state, action, depth)
+                if value is None or (outcome > value if maximize else outcome < value):
+                    value, best_action = outcome, action
+
+        self.table[key] = (depth, value, best_action)
+        self.table.move_to_end(key)
+        if len(self.table) > self.table_size:
+            self.table.popitem(last=False)
+        return value
+
+    def _outcome(self, state: State, action: ActionType, depth: int) -> float:
+        """Expected value for side 0 after the side to move takes an action."""
+
+        hp = [state[0], state[1]]
+        cooldown = [state[2], state[3]]
+        flags = [state[4], state[5]]
+        side = state[6]
+        other = 1 - side
+
+        # Special conditions are consumed before the action, as in Battle
+        if flags[side] & CONFUSED:
+            flags[side] &= ~CONFUSED
+        elif flags[side] & SKIP_TURN:
+            flags[side] &= ~SKIP_TURN
+
+        if action == ActionType.ATTACK:
+            defending = bool(flags[other] & DEFENDING)
+            flags[other] &= ~DEFENDING
+            value = 0.0
+            for damage, probability in self._damage[side][defending]:
+                hp[other] = state[other] - damage
+                value += probability * self._next(hp, cooldown, flags, other, depth)
+            return value
+
+        if action == ActionType.DEFEND:
+            flags[side] |= DEFENDING
+        elif action == ActionType.SPECIAL and cooldown[side] == 0:
+            special = self._specials[side]
+            if special.confuses:
+                flags[other] |= CONFUSED
+            elif special.skips:
+                flags[other] |= SKIP_TURN
+            hp[side] = min(hp[side] + special.heal, self._max_hp[side])
+            hp[other] -= special.damage
+            cooldown[side] = special.cooldown
+        return self._next(hp, cooldown, flags, other, depth)
+
+    def _next(
+        self, hp: list, cooldown: list, flags: list, side: int, depth: int
+    ) -> float:
+        """Value for side 0 at the start of the next turn."""
+
+        if hp[0] <= 0:
+            return 0.0
+        if hp[1] <= 0:
+            return 1.0
+        self._nodes += 1
+        if self._nodes % _CLOCK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise _Timeout
+        state = (
+            hp[0],
+            hp[1],
+            max(0, cooldown[0] - 1),
+            max(0, cooldown[1] - 1),
+            flags[0],
+            flags[1],
+            side,
+        )
+        if depth <= 1:
+            return self._evaluate(state)
+        return self._search(state, depth - 1)
@@ -0,0 +1,325 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import argparse
+import asyncio
+import json
+import random
+from .action import ActionType
+from .battle import Battle
+from .character import Character
+from .rng import CounterRandom
+from .roster import Archetype, default_roster
+
+# Events kept per session. A round of two turns logs at most six events, so
+# this holds everything since the last message while keeping sessions small
+SESSION_LOG_CAPACITY = 16
+# Longest line accepted from a client, in bytes
+MAX_LINE_LENGTH = 4096
+# Pending connections queued by the OS. The asyncio default of 100 stalls
+# clients for seconds when thousands connect at once
+LISTEN_BACKLOG = 4096
+# Actions a player may send, by the name used in the protocol
+PLAYER_ACTIONS = {
+    action.value: action
+    for action in (ActionType.ATTACK, ActionType.DEFEND, ActionType.SPECIAL)
+}
+
+
+class ProtocolError(Exception):
+    """Raised when a client sends a message the protocol does not allow."""
+
+
+def encode(message: dict) -> bytes:
+    """Serialize a protocol message as one line of compact JSON."""
+
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    """Parse one line of a protocol message."""
+
+    try:
+        message = json.loads(line)
+    except ValueError:
+        raise ProtocolError("Messages must be JSON objects, one per line") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("Messages must be JSON objects, one per line")
+    return message
+
+
+def battle_state(battle: Battle) -> dict:
+    """Describe the characters of a battle for the client."""
+
+    def character(character: Character) -> dict:
+        return {
+            "name": character.name,
+            "hp": character.current_hp,
+            "max_hp": character.max_hp,
+            "cooldown": character.special_cooldown,
+        }
+
+    return {
+        "turn": battle.current_turn,
+        "player": character(battle.player_character),
+        "enemy": character(battle.enemy_character),
+    }
+
+
+class Session:
+    """One client connection playing battles against the enemy AI.
+
+    On connect the server sends {"type": "characters", "characters": [...]}.
+    The client picks one with {"type": "select", "character": name} and then
+    answers every {"type": "turn"} message with {"type": "action", "action":
+    "attack" | "defend" | "special"}. Each turn message carries the log events
+    of the player turn and the enemy turn that followed it, so a turn costs
+    one round trip. A {"type": "end"} message closes the battle, after which
+    the client may select again. Invalid messages get {"type": "error"}.
+    """
+
+    def __init__(
+        self,
+        server: "BattleServer",
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.battle: Optional[Battle] = None
+        # Number of log events already sent to the client
+        self._sent = 0
+
+    async def send(self, message: dict):
+        self.writer.write(encode(message))
+        await self.writer.drain()
+
+    async def receive(self) -> dict:
+        """Read the next message, raising EOFError once the client disconnects."""
+
+        while True:
+            try:
+                line = await self.reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError:
+                raise EOFError from None
+            except asyncio.LimitOverrunError:
+                raise ProtocolError("Message too long") from None
+            try:
+                return decode(line)
+            except ProtocolError as error:
+                await self.send({"type": "error", "message": str(error)})
+
+    def _events(self) -> List[str]:
+        """Rendered log events recorded since the last message."""
+
+        log = self.battle.battle_log
+        new = log.total - self._sent
+        self._sent = log.total
+        return log[-new:] if new else []
+
+    async def next_action(self, battle: Battle) -> ActionType:
+        """Report the last turns and wait for the client's next action."""
+
+        await self.send(
+            {"type": "turn", "events": self._events(), "state": battle_state(battle)}
+        )
+        while True:
+            message = await self.receive()
+            action = message.get("action")
+            if message.get("type") == "action" and isinstance(action, str):
+                if action in PLAYER_ACTIONS:
+                    return PLAYER_ACTIONS[action]
+            await self.send(
+                {
+                    "type": "error",
+                    "message": "Expected an action: "
+                    + ", ".join(sorted(PLAYER_ACTIONS)),
+                }
+            )
+
+    async def select(self) -> Battle:
+        """Wait for a select message and start a battle for it."""
+
+        roster = self.server.roster
+        while True:
+            message = await self.receive()
+            character = message.get("character")
+            if message.get("type") == "select" and isinstance(character, str):
+                if character in roster:
+                    break
+            await self.send(
+                {
+                    "type": "error",
+                    "message": "Expected a select message naming one of the "
+                    "characters",
+                }
+            )
+
+        # Each battle draws the opponent and every roll from its own stream
+        rng = CounterRandom(self.server.next_seed())
+        enemy = rng.choice(list(roster.values()))
+        battle = Battle(
+            False,
+            Character.from_archetype(roster[character], True),
+            Character.from_archetype(enemy),
+            rng=rng,
+            log_capacity=SESSION_LOG_CAPACITY,
+        )
+        battle.print_outcome = False
+        return battle
+
+    async def run(self):
+        """Play battles until the client disconnects."""
+
+        await self.send({"type": "characters", "characters": list(self.server.roster)})
+        while True:
+            self.battle = await self.select()
+            self._sent = 0
+            await self.battle.run_async(self.next_action)
+            self.server.completed += 1
+            won = self.battle.player_character.is_alive()
+            await self.send(
+                {
+                    "type": "end",
+                    "winner": "player" if won else "enemy",
+                    "events": self._events(),
+                    "state": battle_state(self.battle),
+                }
+            )
+
+
+class BattleServer:
+    """Host many concurrent battle sessions in one asyncio event loop.
+
+    Clients connect over TCP or a Unix socket and exchange line-delimited JSON
+    messages, see Session for the protocol. Sessions never block the loop:
+    every turn is handled between two reads from the client.
+    """
+
+    def __init__(
+        self,
+        roster: Optional[Dict[str, Archetype]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.roster = default_roster() if roster is None else roster
+        # Session seeds are drawn from here, so a server seed makes every
+        # session reproducible
+        self._seeds = random.Random(seed)
+        self.active = 0
+        self.completed = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def next_seed(self) -> int:
+        return self._seeds.getrandbits(64)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one client connection."""
+
+        self.active += 1
+        session = Session(self, reader, writer)
+        try:
+            await session.run()
+        except (EOFError, ConnectionError):
+            pass
+        except ProtocolError as error:
+            try:
+                await session.send({"type": "error", "message": str(error)})
+            except ConnectionError:
+                pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            finally:
+                self.active -= 1
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: Optional[Union[str, Path]] = None,
+    ) -> asyncio.AbstractServer:
+        """Start listening on a TCP port, or on a Unix socket when path is given.
+
+        Port 0 picks a free port, see the sockets of the returned server.
+        """
+
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self.handle, path, limit=MAX_LINE_LENGTH, backlog=LISTEN_BACKLOG
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self.handle, host, port, limit=MAX_LINE_LENGTH, backlog=LISTEN_BACKLOG
+            )
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class BattleClient:
+    """Minimal client for the battle server protocol."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(
+        cls,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: Optional[Union[str, Path]] = None,
+    ) -> "BattleClient":
+        """Connect over TCP, or over a Unix socket when path is given."""
+
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, message: dict) -> dict:
+        """Send a message and return the reply."""
+
+        self.writer.write(encode(message))
+        return await self.receive()
+
+    async def receive(self) -> dict:
+        line = await self.reader.readline()
+        if not line:
+            raise EOFError("Server closed the connection")
+        return decode(line)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(host: str, port: int, path: Optional[str] = None, seed=None):
+    """Run a battle server until cancelled."""
+
+    server = await BattleServer(seed=seed).start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host battles over the network.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+import random
+from .character import Character, ENEMY_DEFENSIVE_HP_THRESHOLD
+from .damage import DAMAGE_ROLL_SPAN, damage_tables
+from .action import ActionType
+
+# Safety net against battles that never end (e.g. two healers out-healing each other)
+DEFAULT_MAX_TURNS = 1000
+
+# Compact action codes used by the simulation loop, indexed in ActionType order
+_ACTIONS = list(ActionType)
+_ATTACK, _DEFEND, _SPECIAL, _SKIP = (
+    _ACTIONS.index(ActionType.ATTACK),
+    _ACTIONS.index(ActionType.DEFEND),
+    _ACTIONS.index(ActionType.SPECIAL),
+    _ACTIONS.index(ActionType.SKIP),
+)
+# Pending status effects, applied by special abilities to the target
+_CONFUSED = 1
+_SKIP_TURN = 2
+# Number of random bytes drawn at once by the simulation loop. Each byte is
+# reduced modulo twice the damage roll range, which stays uniform because that
+# span (32 values) divides 256
+_DRAW_BLOCK = 1 << 16
+
+CharacterFactory = Callable[[], Character]
+
+
+@dataclass
+class SimulationResult:
+    """Aggregated statistics for a batch of simulated battles.
+
+    Side 0 is the character that moves first (the player slot in Battle),
+    side 1 is the character that moves second (the enemy slot).
+    """
+
+    matchup: Tuple[str, str]
+    battles: int = 0
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    timeouts: int = 0
+    turn_counts: Counter = field(default_factory=Counter)
+    action_counts: List[Counter] = field(
+        default_factory=lambda: [Counter(), Counter()]
+    )
+    specials_recharging: List[int] = field(default_factory=lambda: [0, 0])
+    damage_dealt: List[int] = field(default_factory=lambda: [0, 0])
+
+    def win_rate(self, side: int = 0) -> float:
+        """Fraction of battles won by the given side."""
+
+        return self.wins[side] / self.battles if self.battles else 0.0
+
+    def mean_turns(self) -> float:
+        """Average number of turns per battle."""
+
+        if not self.battles:
+            return 0.0
+        total_turns = sum(turns * count for turns, count in self.turn_counts.items())
+        return total_turns / self.battles
+
+    def merge(self, other: "SimulationResult") -> "SimulationResult":
+        """Fold the statistics of another result for the same matchup into this one."""
+
+        self.battles += other.battles
+        self.timeouts += other.timeouts
+        self.turn_counts.update(other.turn_counts)
+        for side in (0, 1):
+            self.wins[side] += other.wins[side]
+            self.action_counts[side].update(other.action_counts[side])
+            self.specials_recharging[side] += other.specials_recharging[side]
+            self.damage_dealt[side] += other.damage_dealt[side]
+        return self
+
+
+def _compile(factory: CharacterFactory) -> tuple:
+    """Flatten the static stats of a character into a tuple for the simulation loop.
+
+    Returns (name, max hp, attack, defense, confuses target, skips target turn,
+    self heal, special cooldown, special damage).
+    """
+
+    character = factory()
+    special = character.archetype.compiled_special
+    return (
+        character.name,
+        character.max_hp,
+        character.attack_points,
+        character.defense_points,
+        special.confuses,
+        special.skips,
+        special.heal,
+        special.cooldown,
+        special.damage,
+    )
+
+
+def simulate(
+    matchup: Tuple[CharacterFactory, CharacterFactory],
+    n: int,
+    seed: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    sink=None,
+) -> SimulationResult:
+    """Simulate n headless battles between two characters.
+
+    Both sides pick actions with the enemy AI from Character.get_enemy_action
+    and every turn follows the Battle.handle_turn rules, but no battle log is
+    built and nothing is printed. The same seed always gives the same result.
+    Battles still going after max_turns turns stop there and count as
+    timeouts, as in every other engine. When a src.core.results.ResultSink
+    is given, the summary of every battle is added to it, collected in typed
+    arrays and handed over in bulk.
+    """
+
+    first, second = _compile(matchup[0]), _compile(matchup[1])
+    result = SimulationResult(matchup=(first[0], second[0]))
+    rng = random.Random(seed)
+
+    # The battle loop is unrolled into the first side's turn followed by the
+    # second side's turn so all combat state lives in local variables
+    _, max_hp0, attack0, defense0, confuses0, skips0, heal0, recharge0, blast0 = first
+    _, max_hp1, attack1, defense1, confuses1, skips1, heal1, recharge1, blast1 = second
+    roll_span = DAMAGE_ROLL_SPAN
+    # Damage by draw against an undefended and a defending target. The tables
+    # are repeated so draws index them directly, without reducing to a roll
+    hits0, guarded_hits0 = (
+        table.rolls * 2 for table in damage_tables(attack0, defense1)
+    )
+    hits1, guarded_hits1 = (
+        table.rolls * 2 for table in damage_tables(attack1, defense0)
+    )
+    action_span = len(_ACTIONS)
+    coin_span = 2 * roll_span
+    threshold = ENEMY_DEFENSIVE_HP_THRESHOLD
+    wins0 = wins1 = 0
+    counts0 = [0] * action_span
+    counts1 = [0] * action_span
+    recharging0 = recharging1 = 0
+    healed0 = healed1 = 0
+    lost0 = lost1 = 0
+    turn_counts = Counter()
+    timeouts = 0
+
+    # Random draws are generated in bulk, at most two bytes per turn, and
+    # refilled between battles so a single battle never runs off the end of a block
+    battle_draws = 2 * (max_turns + 1)
+    block_size = max(_DRAW_BLOCK, 2 * battle_draws)
+    draws = rng.randbytes(block_size)
+    position = 0
+    # Winner (-1 on a timeout), turns and hp left of each battle, for the sink
+    summaries = (array("b"), array("I"), array("i"), array("i"))
+    add_winner, add_turns, add_hp0, add_hp1 = (column.append for column in summaries)
+
+    for _ in range(n):
+        if position > block_size - battle_draws:
+            draws = rng.randbytes(block_size)
+            position = 0
+            if sink is not None:
+                sink.add_summaries(first[0], second[0], *summaries)
+                for column in summaries:
+                    del column[:]
+        hp0, hp1 = max_hp0, max_hp1
+        cooldown0 = cooldown1 = 0
+        # Pending status per side: _CONFUSED or _SKIP_TURN, 0 when none
+        status0 = status1 = 0
+        defending0 = defending1 = False
+        turn = 0
+
+        while True:
+            # First side's turn. One uniform draw covers both the coin flip of
+            # the enemy AI and the damage roll: the upper half picks the action,
+            # the remainder is the roll
+            turn += 1
+            draw = draws[position] % coin_span
+            position += 1
+            if status0:
+                # Special conditions override the chosen action. A confused
+                # character picks its action with a second, independent draw
+                if status0 == _CONFUSED:
+                    action = draws[position] % action_span
+                    position += 1
+                else:
+                    action = _SKIP
+                status0 = 0
+            elif draw < roll_span:
+                action = _ATTACK
+            elif hp0 >= threshold:
+                action = _SPECIAL
+            else:
+                action = _DEFEND
+
+            if action == _ATTACK:
+                if defending1:
+                    damage = guarded_hits0[draw]
+                    defending1 = False
+                else:
+                    damage = hits0[draw]
+                hp1 -= damage
+                # Only the opponent of the side taking its turn can lose hp
+                if hp1 <= 0:
+                    wins0 += 1
+                    break
+            else:
+                # Attacks are derived from the number of turns taken at the end
+                counts0[action] += 1
+                if action == _DEFEND:
+                    defending0 = True
+                elif action == _SPECIAL:
+                    if cooldown0 == 0:
+                        if confuses0:
+                            status1 = _CONFUSED
+                        elif skips0:
+                            status1 = _SKIP_TURN
+                        if heal0:
+                            healed0 -= hp0
+                            hp0 = min(hp0 + heal0, max_hp0)
+                            healed0 += hp0
+                        cooldown0 = recharge0
+                        if blast0:
+                            hp1 -= blast0
+                            if hp1 <= 0:
+                                wins0 += 1
+                                break
+                    else:
+                        recharging0 += 1
+            if cooldown0:
+                cooldown0 -= 1
+            if cooldown1:
+                cooldown1 -= 1
+            # The limit is checked after each side, so odd limits are exact
+            if turn >= max_turns:
+                timeouts += 1
+                break
+
+            # Second side's turn, a mirror image of the block above
+            turn += 1
+            draw = draws[position] % coin_span
+            position += 1
+            if status1:
+                if status1 == _CONFUSED:
+                    action = draws[position] % action_span
+                    position += 1
+                else:
+                    action = _SKIP
+                status1 = 0
+            elif draw < roll_span:
+                action = _ATTACK
+            elif hp1 >= threshold:
+                action = _SPECIAL
+            else:
+                action = _DEFEND
+
+            if action == _ATTACK:
+                if defending0:
+                    damage = guarded_hits1[draw]
+                    defending0 = False
+                else:
+                    damage = hits1[draw]
+                hp0 -= damage
+                if hp0 <= 0:
+                    wins1 += 1
+                    break
+            else:
+                counts1[action] += 1
+                if action == _DEFEND:
+                    defending1 = True
+                elif action == _SPECIAL:
+                    if cooldown1 == 0:
+                        if confuses1:
+                            status0 = _CONFUSED
+                        elif skips1:
+                            status0 = _SKIP_TURN
+                        if heal1:
+                            healed1 -= hp1
+                            hp1 = min(hp1 + heal1, max_hp1)
+                            healed1 += hp1
+                        cooldown1 = recharge1
+                        if blast1:
+                            hp0 -= blast1
+                            if hp0 <= 0:
+                                wins1 += 1
+                                break
+                    else:
+                        recharging1 += 1
+            if cooldown0:
+                cooldown0 -= 1
+            if cooldown1:
+                cooldown1 -= 1
+
+            if turn >= max_turns:
+                timeouts += 1
+                break
+
+        turn_counts[turn] += 1
+        if sink is not None:
+            add_winner(0 if hp1 <= 0 else 1 if hp0 <= 0 else -1)
+            add_turns(turn)
+            add_hp0(hp0)
+            add_hp1(hp1)
+        lost0 += max_hp0 - hp0
+        lost1 += max_hp1 - hp1
+
+    if sink is not None:
+        sink.add_summaries(first[0], second[0], *summaries)
+    result.battles = n
+    result.wins = [wins0, wins1]
+    result.timeouts = timeouts
+    result.turn_counts = turn_counts
+    result.specials_recharging = [recharging0, recharging1]
+    # Damage dealt is whatever the opponent lost, including hp healed back
+    result.damage_dealt = [lost1 + healed1, lost0 + healed0]
+    # The first side acts on odd turns and the second side on even turns
+    acted = [0, 0]
+    for turns, battles in turn_counts.items():
+        acted[0] += (turns + 1) // 2 * battles
+        acted[1] += turns // 2 * battles
+    for side, counts in enumerate((counts0, counts1)):
+        counts[_ATTACK] = acted[side] - sum(counts)
+        result.action_counts[side] = Counter(
+            {_ACTIONS[code]: count for code, count in enumerate(counts) if count}
+        )
+    return result
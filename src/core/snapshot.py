@@ -0,0 +1,262 @@
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+import mmap
+import struct
+from .battle import Battle
+from .battle_log import DEFAULT_LOG_CAPACITY
+from .character import Character
+from .rng import CounterRandom, PythonRandom
+from .roster import Archetype, default_roster
+
+# File layout: a header followed by fixed-size little-endian battle records.
+# Records can be read in place from a memoryview or memory-mapped file.
+MAGIC = b"BTLS"
+# Version 2 changed the output stream of CounterRandom. Version 1 CounterRandom
+# records would restore and then diverge from the original battle, so only
+# their Mersenne Twister records are still read
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHBI")  # magic, version, random source kind, count
+
+# Random source kinds. Every record in a file uses the same kind so records
+# have a fixed size
+RNG_COUNTER = 1
+RNG_MERSENNE = 2
+
+# current_turn, game over, player to move
+_BATTLE_FORMAT = "IBB"
+# name, max_hp, current_hp, attack, defense, experience, level, special_cooldown,
+# status flags
+_CHARACTER_FORMAT = "24s7iB"
+_RNG_FORMATS = {
+    RNG_COUNTER: "QQ",  # key, counter
+    RNG_MERSENNE: "625IBd",  # state words and index, has gauss_next, gauss_next
+}
+_RECORDS = {
+    kind: struct.Struct("<" + _BATTLE_FORMAT + _CHARACTER_FORMAT * 2 + rng_format)
+    for kind, rng_format in _RNG_FORMATS.items()
+}
+# Offset of the fields of each character within an unpacked record
+_PLAYER, _ENEMY = 3, 12
+
+_IS_DEFENDING, _CONFUSED, _SKIP_TURN, _PLAYER_CHARACTER = 1, 2, 4, 8
+
+
+def _rng_kind(battle: Battle) -> int:
+    if isinstance(battle.rng, CounterRandom):
+        return RNG_COUNTER
+    if isinstance(battle.rng, PythonRandom):
+        return RNG_MERSENNE
+    raise ValueError(f"Cannot snapshot random source {type(battle.rng).__name__}")
+
+
+def _pack_character(character: Character) -> tuple:
+    name = character.name.encode()
+    if len(name) > 24:
+        raise ValueError(f"Character name {character.name!r} is too long to snapshot")
+    flags = (
+        character.is_defending * _IS_DEFENDING
+        | character.confused * _CONFUSED
+        | character.skip_turn * _SKIP_TURN
+        | character.player_character * _PLAYER_CHARACTER
+    )
+    return (
+        name,
+        character.max_hp,
+        character.current_hp,
+        character.attack_points,
+        character.defense_points,
+        character.experience,
+        character.level,
+        character.special_cooldown,
+        flags,
+    )
+
+
+def _pack_rng(kind: int, battle: Battle) -> tuple:
+    if kind == RNG_COUNTER:
+        return battle.rng.getstate()
+    _, words, gauss_next = battle.rng.getstate()
+    return (*words, gauss_next is not None, gauss_next or 0.0)
+
+
+def snapshot_size(count: int, kind: int = RNG_COUNTER) -> int:
+    """Size in bytes of a snapshot of count battles."""
+
+    return HEADER.size + _RECORDS[kind].size * count
+
+
+def pack_into(buffer, index: int, battle: Battle, kind: int = RNG_COUNTER):
+    """Serialize a battle in place as record index of a snapshot buffer.
+
+    The buffer must already hold a header for the same random source kind,
+    e.g. a shared memory block laid out as a snapshot.
+    """
+
+    if _rng_kind(battle) != kind:
+        raise ValueError("All battles in a snapshot must use the same random source")
+    if battle._damage_roll_index < len(battle._damage_rolls):
+        raise ValueError("Cannot snapshot a battle with pre-drawn damage rolls")
+    record = _RECORDS[kind]
+    record.pack_into(
+        buffer,
+        HEADER.size + index * record.size,
+        battle.current_turn,
+        battle._game_over,
+        battle.selected_character is battle.player_character,
+        *_pack_character(battle.player_character),
+        *_pack_character(battle.enemy_character),
+        *_pack_rng(kind, battle),
+    )
+
+
+def pack(battles: Sequence[Battle]) -> bytes:
+    """Serialize battles into a snapshot.
+
+    All battles must use the same kind of random source, either CounterRandom
+    (16 bytes of state) or PythonRandom (about 2.5 KB of state). The battle
+    log is not part of a snapshot.
+    """
+
+    kinds = {_rng_kind(battle) for battle in battles} or {RNG_COUNTER}
+    if len(kinds) > 1:
+        raise ValueError("All battles in a snapshot must use the same random source")
+    kind = kinds.pop()
+
+    buffer = bytearray(snapshot_size(len(battles), kind))
+    HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, kind, len(battles))
+    for index, battle in enumerate(battles):
+        pack_into(buffer, index, battle, kind)
+    return bytes(buffer)
+
+
+def snapshot(battle: Battle) -> bytes:
+    """Serialize a single battle."""
+
+    return pack([battle])
+
+
+class SnapshotReader:
+    """Read battle records in place from bytes, a memoryview or a mapped file.
+
+    Records are unpacked on demand, so the combat state of any battle can be
+    inspected without building Battle and Character objects.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        self._view = memoryview(data)
+        magic, version, kind, count = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a battle snapshot")
+        if version not in (1, FORMAT_VERSION):
+            raise ValueError(f"Unsupported snapshot version {version}")
+        if kind not in _RECORDS:
+            raise ValueError(f"Unknown random source kind {kind}")
+        if version == 1 and kind == RNG_COUNTER:
+            raise ValueError("Version 1 CounterRandom snapshots cannot be restored")
+        self.rng_kind = kind
+        self._record = _RECORDS[kind]
+        self._count = count
+        if len(self._view) < HEADER.size + count * self._record.size:
+            raise ValueError("Truncated battle snapshot")
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "SnapshotReader":
+        """Memory-map a snapshot file for reading."""
+
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def release(self):
+        """Release the underlying buffer, e.g. before closing shared memory."""
+
+        self._view.release()
+
+    def record(self, index: int) -> tuple:
+        """Return the raw fields of a battle record."""
+
+        if not 0 <= index < self._count:
+            raise IndexError("snapshot index out of range")
+        return self._record.unpack_from(
+            self._view, HEADER.size + index * self._record.size
+        )
+
+    def hit_points(self, index: int) -> Tuple[int, int]:
+        """Return the current hp of the player and enemy characters."""
+
+        fields = self.record(index)
+        return fields[_PLAYER + 2], fields[_ENEMY + 2]
+
+    def restore(
+        self,
+        index: int = 0,
+        roster: Optional[Dict[str, Archetype]] = None,
+        log_capacity: Optional[int] = DEFAULT_LOG_CAPACITY,
+    ) -> Battle:
+        """Rebuild the battle stored at index with an empty battle log.
+
+        Characters are matched to archetypes by name in the roster, which
+        defaults to config/characters.json.
+        """
+
+        fields = self.record(index)
+        roster = default_roster() if roster is None else roster
+        player = _restore_character(fields[_PLAYER : _PLAYER + 9], roster)
+        enemy = _restore_character(fields[_ENEMY : _ENEMY + 9], roster)
+
+        state = fields[_ENEMY + 9 :]
+        if self.rng_kind == RNG_COUNTER:
+            rng = CounterRandom(*state)
+        else:
+            rng = PythonRandom()
+            rng.setstate((3, tuple(state[:625]), state[626] if state[625] else None))
+
+        battle = Battle(False, player, enemy, rng=rng, log_capacity=log_capacity)
+        battle.current_turn, game_over, player_to_move = fields[:3]
+        battle._game_over = bool(game_over)
+        if not player_to_move:
+            battle.selected_character, battle.target_character = enemy, player
+        return battle
+
+
+def _restore_character(fields: tuple, roster: Dict[str, Archetype]) -> Character:
+    name = fields[0].rstrip(b"\0").decode()
+    (
+        max_hp,
+        current_hp,
+        attack_points,
+        defense_points,
+        experience,
+        level,
+        special_cooldown,
+        flags,
+    ) = fields[1:]
+    archetype = roster.get(name) or Archetype(
+        name, attack_points, defense_points, max_hp
+    )
+    character = Character.from_archetype(archetype, bool(flags & _PLAYER_CHARACTER))
+    character.max_hp = max_hp
+    character.current_hp = current_hp
+    character.attack_points = attack_points
+    character.defense_points = defense_points
+    character.experience = experience
+    character.level = level
+    character.special_cooldown = special_cooldown
+    character.is_defending = bool(flags & _IS_DEFENDING)
+    character.confused = bool(flags & _CONFUSED)
+    character.skip_turn = bool(flags & _SKIP_TURN)
+    return character
+
+
+def restore(data: Union[bytes, bytearray, memoryview], index: int = 0) -> Battle:
+    """Rebuild a battle from a snapshot."""
+
+    return SnapshotReader(data).restore(index)
+
+
+def write(path: Union[str, Path], battles: Sequence[Battle]):
+    """Write a snapshot of the battles to a file."""
+
+    Path(path).write_bytes(pack(battles))
@@ -0,0 +1,442 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from operator import mul
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .action import ActionType
+from .character import ENEMY_DEFENSIVE_HP_THRESHOLD
+from .damage import damage_tables
+from .search import CONFUSED, DEFENDING, SKIP_TURN, State
+from .simulation import CharacterFactory
+
+# Components spanning several hp pairs (only possible when a character heals)
+# are solved iteratively until values change by less than this, relative to
+# their size
+TOLERANCE = 1e-13
+# Sweeps allowed per component before giving up, since chains that cannot
+# reach the tolerance (e.g. stuck at float noise) would otherwise never stop
+MAX_ITERATIONS = 10_000
+# Number of previous sweeps combined when accelerating those iterations
+_MIXING_DEPTH = 5
+
+# Probability of each action the side to move takes in a state
+Policy = Callable[[State], Sequence[Tuple[ActionType, float]]]
+
+_ACTIONS = list(ActionType)
+# Marks the end of a battle among the successors of a state
+_WON, _LOST = -1, -2
+
+
+def enemy_ai_policy(state: State) -> Sequence[Tuple[ActionType, float]]:
+    """Action probabilities of Character.get_enemy_action."""
+
+    if state[state[6]] >= ENEMY_DEFENSIVE_HP_THRESHOLD:
+        return ((ActionType.ATTACK, 0.5), (ActionType.SPECIAL, 0.5))
+    return ((ActionType.ATTACK, 0.5), (ActionType.DEFEND, 0.5))
+
+
+@dataclass
+class Solution:
+    """Exact win probabilities and expected battle lengths of a matchup.
+
+    Values are known for every state reachable from the start of the battle,
+    with side 0 moving first as the player character does in Battle, and
+    looking up any other state raises KeyError.
+    """
+
+    matchup: Tuple[str, str]
+    start: State
+    index: Dict[State, int]
+    win_probabilities: List[float]
+    expected_turns: List[float]
+
+    def win_probability(self, state: Optional[State] = None) -> float:
+        """Probability that side 0 wins from a state, by default the start."""
+
+        return self.win_probabilities[self.index[state or self.start]]
+
+    def expected_length(self, state: Optional[State] = None) -> float:
+        """Expected number of remaining turns from a state, by default the start."""
+
+        return self.expected_turns[self.index[state or self.start]]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def _successors(state: State, action: ActionType, rules: tuple) -> list:
+    """Probability of each state following an action, as in Battle.handle_turn."""
+
+    max_hp, specials, damage = rules
+    hp = [state[0], state[1]]
+    cooldown = [state[2], state[3]]
+    flags = [state[4], state[5]]
+    side = state[6]
+    other = 1 - side
+
+    # Special conditions are consumed before the action
+    if flags[side] & CONFUSED:
+        flags[side] &= ~CONFUSED
+    elif flags[side] & SKIP_TURN:
+        flags[side] &= ~SKIP_TURN
+
+    # Cooldowns tick down at the end of every turn
+    cooldown0 = cooldown[0] - 1 if cooldown[0] > 0 else 0
+    cooldown1 = cooldown[1] - 1 if cooldown[1] > 0 else 0
+
+    if action == ActionType.ATTACK:
+        defending = flags[other] & DEFENDING
+        flags[other] &= ~DEFENDING
+        outcomes = []
+        for dealt, probability in damage[side][bool(defending)]:
+            remaining = state[other] - dealt
+            if remaining <= 0:
+                outcomes.append((probability, _LOST if other == 0 else _WON))
+            elif other:
+                outcomes.append(
+                    (
+                        probability,
+                        (hp[0], remaining, cooldown0, cooldown1, *flags, other),
+                    )
+                )
+            else:
+                outcomes.append(
+                    (
+                        probability,
+                        (remaining, hp[1], cooldown0, cooldown1, *flags, other),
+                    )
+                )
+        return outcomes
+
+    if action == ActionType.DEFEND:
+        flags[side] |= DEFENDING
+    elif action == ActionType.SPECIAL and cooldown[side] == 0:
+        special = specials[side]
+        if special.confuses:
+            flags[other] |= CONFUSED
+        elif special.skips:
+            flags[other] |= SKIP_TURN
+        hp[side] = min(hp[side] + special.heal, max_hp[side])
+        hp[other] -= special.damage
+        if hp[other] <= 0:
+            return [(1.0, _LOST if other == 0 else _WON)]
+        if side:
+            cooldown1 = special.cooldown - 1 if special.cooldown > 0 else 0
+        else:
+            cooldown0 = special.cooldown - 1 if special.cooldown > 0 else 0
+    return [(1.0, (hp[0], hp[1], cooldown0, cooldown1, *flags, other))]
+
+
+def _explore(start: State, rules: tuple, policies: Sequence[Policy]):
+    """Enumerate the states reachable from start and the transitions between them.
+
+    Returns the states and, for each state, the probability of winning right
+    away and the list of (probability, successor index) pairs.
+    """
+
+    index = {start: 0}
+    states = [start]
+    wins = []
+    edges = []
+    position = 0
+    while position < len(states):
+        state = states[position]
+        position += 1
+        flags = state[4 + state[6]]
+        if flags & CONFUSED:
+            # Confused characters pick any action at random
+            actions = [(action, 1 / len(_ACTIONS)) for action in _ACTIONS]
+        elif flags & SKIP_TURN:
+            actions = [(ActionType.SKIP, 1.0)]
+        else:
+            actions = policies[state[6]](state)
+
+        won = 0.0
+        successors = defaultdict(float)
+        for action, action_probability in actions:
+            for probability, successor in _successors(state, action, rules):
+                if successor == _WON:
+                    won += action_probability * probability
+                elif successor != _LOST:
+                    if successor not in index:
+                        index[successor] = len(states)
+                        states.append(successor)
+                    successors[index[successor]] += action_probability * probability
+        wins.append(won)
+        edges.append(list(successors.items()))
+    return index, states, wins, edges
+
+
+def _components(edges: List[list]) -> List[List[int]]:
+    """Strongly connected components, each listed after every component it reaches.
+
+    An iterative version of Tarjan's algorithm, as the graph is far deeper
+    than the recursion limit.
+    """
+
+    count = len(edges)
+    order = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    stack = []
+    components = []
+    counter = 0
+    for root in range(count):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(edges[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor, _ in successors:
+                if order[successor] < 0:
+                    order[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, iter(edges[successor])))
+                    break
+                if on_stack[successor] and order[successor] < low[node]:
+                    low[node] = order[successor]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def _invert(matrix: List[List[float]]) -> List[List[float]]:
+    """Invert a small dense matrix by Gauss-Jordan elimination."""
+
+    size = len(matrix)
+    rows = [
+        row[:] + [float(i == j) for j in range(size)] for i, row in enumerate(matrix)
+    ]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        scale = rows[column][column]
+        if abs(scale) < TOLERANCE:
+            raise ValueError("Battles can last forever under these policies")
+        rows[column] = [value / scale for value in rows[column]]
+        for row in range(size):
+            factor = rows[row][column]
+            if row != column and factor:
+                rows[row] = [
+                    value - factor * base
+                    for value, base in zip(rows[row], rows[column])
+                ]
+    return [row[size:] for row in rows]
+
+
+def _least_squares(columns: List[List[float]], target: List[float]) -> List[float]:
+    """Coefficients of the combination of columns closest to target."""
+
+    size = len(columns)
+    normal = [
+        [sum(map(mul, columns[i], columns[j])) for j in range(size)]
+        for i in range(size)
+    ]
+    right = [sum(map(mul, column, target)) for column in columns]
+    # Gaussian elimination with partial pivoting, skipping degenerate columns
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(normal[row][column]))
+        normal[column], normal[pivot] = normal[pivot], normal[column]
+        right[column], right[pivot] = right[pivot], right[column]
+        if not normal[column][column]:
+            continue
+        for row in range(column + 1, size):
+            factor = normal[row][column] / normal[column][column]
+            for k in range(column, size):
+                normal[row][k] -= factor * normal[column][k]
+            right[row] -= factor * right[column]
+    coefficients = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        if normal[row][row]:
+            remainder = right[row] - sum(
+                normal[row][k] * coefficients[k] for k in range(row + 1, size)
+            )
+            coefficients[row] = remainder / normal[row][row]
+    return coefficients
+
+
+def _sweep(blocks: list, quantity: int, results: List[float]):
+    """Solve every layer once, from the lowest total hp up, updating results."""
+
+    for block in blocks:
+        layer, inverse, crossing = block[0], block[1], block[2]
+        sources = block[3 + quantity][:]
+        for i, successor, probability in crossing:
+            sources[i] += probability * results[successor]
+        for node, row in zip(layer, inverse):
+            results[node] = sum(map(mul, row, sources))
+
+
+def _converge(blocks: list, quantity: int, results: List[float], max_iterations: int):
+    """Repeat sweeps until results stop changing.
+
+    Sweeps only carry values across heals one step at a time, so they are
+    accelerated by Anderson mixing: each new iterate combines the recent
+    sweeps in the way that best cancels their changes. Raises ValueError if
+    the results still change after max_iterations sweeps.
+    """
+
+    nodes = [node for block in blocks for node in block[0]]
+    inputs: List[List[float]] = []
+    outputs: List[List[float]] = []
+    for _ in range(max_iterations):
+        before = [results[node] for node in nodes]
+        _sweep(blocks, quantity, results)
+        after = [results[node] for node in nodes]
+        change = [new - old for new, old in zip(after, before)]
+        scale = max(1.0, max(map(abs, after)))
+        if max(map(abs, change)) < TOLERANCE * scale:
+            return
+
+        inputs.append(before)
+        outputs.append(after)
+        if len(inputs) > _MIXING_DEPTH + 1:
+            del inputs[0], outputs[0]
+        if len(inputs) > 1:
+            # Differences between the changes of consecutive sweeps
+            columns = [
+                [
+                    (new_output - new_input) - (old_output - old_input)
+                    for new_output, new_input, old_output, old_input in zip(
+                        outputs[k + 1], inputs[k + 1], outputs[k], inputs[k]
+                    )
+                ]
+                for k in range(len(inputs) - 1)
+            ]
+            mixed = after
+            for k, weight in enumerate(_least_squares(columns, change)):
+                if weight:
+                    mixed = [
+                        value - weight * (new - old)
+                        for value, new, old in zip(mixed, outputs[k + 1], outputs[k])
+                    ]
+            for node, value in zip(nodes, mixed):
+                results[node] = value
+    raise ValueError(f"Solution did not converge in {max_iterations} sweeps")
+
+
+def _solve_component(
+    component: List[int],
+    states: List[State],
+    wins: List[float],
+    edges: List[list],
+    values: List[float],
+    turns: List[float],
+    max_iterations: int,
+):
+    """Solve the win probabilities and expected turns of one component.
+
+    Successors outside the component are already solved. States sharing an
+    hp pair are solved exactly together, in order of increasing total hp since
+    damage only lowers hp. Components spanning several hp pairs, which heals
+    make possible, are swept repeatedly until they converge.
+    """
+
+    layers = defaultdict(list)
+    for node in component:
+        layers[states[node][:2]].append(node)
+    members = set(component)
+
+    blocks = []
+    for pair in sorted(layers, key=sum):
+        layer = layers[pair]
+        position = {node: i for i, node in enumerate(layer)}
+        # Invert (I - Q) for the transitions that stay within the layer
+        matrix = [[float(i == j) for j in range(len(layer))] for i in range(len(layer))]
+        # Transitions to other layers of the component, and the contributions
+        # of already solved states outside the component
+        crossing = []
+        value_base = []
+        turn_base = []
+        for i, node in enumerate(layer):
+            value, turn = wins[node], 1.0
+            for successor, probability in edges[node]:
+                if successor in position:
+                    matrix[i][position[successor]] -= probability
+                elif successor in members:
+                    crossing.append((i, successor, probability))
+                else:
+                    value += probability * values[successor]
+                    turn += probability * turns[successor]
+            value_base.append(value)
+            turn_base.append(turn)
+        blocks.append((layer, _invert(matrix), crossing, value_base, turn_base))
+
+    if len(blocks) == 1:
+        _sweep(blocks, 0, values)
+        _sweep(blocks, 1, turns)
+    else:
+        _converge(blocks, 0, values, max_iterations)
+        _converge(blocks, 1, turns, max_iterations)
+
+
+def solve(
+    matchup: Tuple[CharacterFactory, CharacterFactory],
+    policies: Optional[Sequence[Policy]] = None,
+    max_iterations: int = MAX_ITERATIONS,
+) -> Solution:
+    """Compute the exact win probability and expected length of a matchup.
+
+    Every reachable state of the battle is enumerated and the resulting
+    Markov chain is solved one strongly connected component at a time, using
+    the exact damage roll distribution of Battle._attack. Both sides use the
+    enemy AI unless other policies are given. Components that heals connect
+    are solved iteratively, raising ValueError if one takes more than
+    max_iterations sweeps.
+    """
+
+    characters = [factory() for factory in matchup]
+    policies = policies or (enemy_ai_policy, enemy_ai_policy)
+    first, second = characters
+    rules = (
+        tuple(character.max_hp for character in characters),
+        tuple(character.archetype.compiled_special for character in characters),
+        tuple(
+            tuple(table.distribution for table in damage_tables(attack, defense))
+            for attack, defense in (
+                (first.attack_points, second.defense_points),
+                (second.attack_points, first.defense_points),
+            )
+        ),
+    )
+    start = (first.current_hp, second.current_hp, 0, 0, 0, 0, 0)
+
+    index, states, wins, edges = _explore(start, rules, policies)
+    values = [0.0] * len(states)
+    turns = [0.0] * len(states)
+    for component in _components(edges):
+        if len(component) == 1:
+            # Most states only lead to states with less hp, or back to themselves
+            node = component[0]
+            value, turn, stay = wins[node], 1.0, 0.0
+            for successor, probability in edges[node]:
+                if successor == node:
+                    stay += probability
+                else:
+                    value += probability * values[successor]
+                    turn += probability * turns[successor]
+            if stay > 1 - TOLERANCE:
+                raise ValueError("Battles can last forever under these policies")
+            values[node], turns[node] = value / (1 - stay), turn / (1 - stay)
+        else:
+            _solve_component(
+                component, states, wins, edges, values, turns, max_iterations
+            )
+
+    return Solution((first.name, second.name), start, index, values, turns)
@@ -0,0 +1,243 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from heapq import heapify, heappop, heappush
+from typing import Callable, List, Optional, Sequence, Union
+from .action import ActionType
+from .battle_log import BattleLog, LogEvent
+from .character import Character
+from .damage import DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX, damage_table
+from .rng import RandomSource, make_rng
+from .simulation import DEFAULT_MAX_TURNS, CharacterFactory
+
+# Time between two turns of a character is INITIATIVE_SCALE / speed
+INITIATIVE_SCALE = 1000
+_ACTIONS = list(ActionType)
+
+# Chooses the slot of the target for the character in the given slot
+Targeting = Callable[["TeamBattle", int], int]
+
+
+def random_target(battle: "TeamBattle", slot: int) -> int:
+    """Target a random standing member of the opposing team."""
+
+    alive = battle.alive[1 - battle.team_of[slot]]
+    return alive[battle.rng.randint(0, len(alive) - 1)]
+
+
+def focus_target(battle: "TeamBattle", slot: int) -> int:
+    """Have a whole team attack the same opponent until it falls."""
+
+    return battle.alive[1 - battle.team_of[slot]][0]
+
+
+class TeamBattle:
+    """Headless battle between two teams of any size, played by the enemy AI.
+
+    Turns follow initiative: a character with speed s acts every
+    INITIATIVE_SCALE / s time units, and the next character to act is popped
+    from a priority queue. Characters are identified by their slot, their
+    position in team 0 followed by team 1. Standing members of each team are
+    kept in arrays with swap removal, and win detection compares per-team
+    alive counters, so no turn scans the teams. Actions follow the rules of
+    Battle.handle_turn, except that a character's special cooldown counts
+    down on its own turns only.
+    """
+
+    def __init__(
+        self,
+        teams: Sequence[Sequence[Character]],
+        rng: Optional[Union[int, RandomSource]] = None,
+        log_capacity: Optional[int] = 0,
+        targeting: Targeting = random_target,
+    ):
+        if len(teams) != 2 or not all(teams):
+            raise ValueError("A team battle needs two teams of at least one character")
+        self.characters: List[Character] = [*teams[0], *teams[1]]
+        self.team_of = [0] * len(teams[0]) + [1] * len(teams[1])
+        # Slots of the standing members of each team, in no particular order
+        self.alive = [
+            list(range(len(teams[0]))),
+            list(range(len(teams[0]), len(self.characters))),
+        ]
+        self.alive_counts = [len(teams[0]), len(teams[1])]
+        # Index of each slot in its team's alive list, None once it has fallen
+        self._position: List[Optional[int]] = [
+            *range(len(teams[0])),
+            *range(len(teams[1])),
+        ]
+        # (time of the next turn, slot). Fallen characters are dropped when
+        # they reach the front instead of being searched for
+        self._queue = [
+            (INITIATIVE_SCALE / character.archetype.speed, slot)
+            for slot, character in enumerate(self.characters)
+        ]
+        heapify(self._queue)
+        self.rng = make_rng(rng)
+        self.targeting = targeting
+        self.battle_log = BattleLog(log_capacity)
+        self.current_turn = 0
+        # Index of the winning team once the battle is over
+        self.winner: Optional[int] = None
+
+    @property
+    def game_over(self) -> bool:
+        return self.winner is not None
+
+    def handle_turn(self):
+        """Let the next character in initiative order take its turn."""
+
+        time, slot = heappop(self._queue)
+        while self._position[slot] is None:
+            time, slot = heappop(self._queue)
+        actor = self.characters[slot]
+        target_slot = self.targeting(self, slot)
+        target = self.characters[target_slot]
+
+        action = actor.get_enemy_action(self.rng)
+        action = self._handle_special_conditions(actor, action)
+        if action == ActionType.ATTACK:
+            self._attack(actor, target)
+        elif action == ActionType.DEFEND:
+            actor.is_defending = True
+            self.battle_log.record(LogEvent.DEFEND, actor.name)
+        elif action == ActionType.SPECIAL:
+            self._special(actor, target)
+        else:
+            self.battle_log.record(LogEvent.SKIP, actor.name)
+        if actor.special_cooldown > 0:
+            actor.special_cooldown -= 1
+
+        # Only the target loses hp on a turn
+        if target.current_hp <= 0:
+            self._defeat(target_slot)
+        heappush(self._queue, (time + INITIATIVE_SCALE / actor.archetype.speed, slot))
+        self.current_turn += 1
+        self._check_win_condition()
+
+    def _handle_special_conditions(
+        self, actor: Character, action: ActionType
+    ) -> ActionType:
+        """Replace the chosen action of a confused or skipping character."""
+
+        if actor.confused:
+            self.battle_log.record(LogEvent.CONFUSED, actor.name)
+            actor.confused = False
+            return self.rng.choice(_ACTIONS)
+        elif actor.skip_turn:
+            actor.skip_turn = False
+            return ActionType.SKIP
+        return action
+
+    def _attack(self, actor: Character, target: Character):
+        table = damage_table(actor.attack_points, target.defense_points, False)
+        damage = target.take_damage(
+            table.rolls[
+                self.rng.randint(DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX) - DAMAGE_ROLL_MIN
+            ]
+        )
+        if damage > 0:
+            self.battle_log.record(LogEvent.ATTACK, actor.name, target.name, damage)
+        else:
+            self.battle_log.record(LogEvent.ATTACK_NO_DAMAGE, actor.name, target.name)
+
+    def _special(self, actor: Character, target: Character):
+        if actor.special_cooldown == 0:
+            description = actor.special_ability(target)
+            self.battle_log.record(
+                LogEvent.SPECIAL, actor.name, value=actor.special_ability_name
+            )
+            self.battle_log.record(LogEvent.SPECIAL_EFFECT, value=description)
+        else:
+            self.battle_log.record(LogEvent.RECHARGING, actor.name)
+
+    def _defeat(self, slot: int):
+        """Remove a fallen character from its team's alive list in O(1)."""
+
+        team = self.team_of[slot]
+        alive = self.alive[team]
+        position = self._position[slot]
+        last = alive.pop()
+        if last != slot:
+            alive[position] = last
+            self._position[last] = position
+        self._position[slot] = None
+        self.alive_counts[team] -= 1
+        self.battle_log.record(LogEvent.DEFEATED, self.characters[slot].name)
+
+    def _check_win_condition(self):
+        """End the battle once a team has no standing members."""
+
+        if self.alive_counts[0] == 0 or self.alive_counts[1] == 0:
+            self.winner = 0 if self.alive_counts[0] else 1
+            self.battle_log.record(LogEvent.TEAM_WINS, value=self.winner)
+
+    def run(self, max_turns: Optional[int] = None) -> Optional[int]:
+        """Play until a team wins, returning its index, or None after max_turns.
+
+        The default limit gives every character as many turns as in a one on
+        one battle.
+        """
+
+        if max_turns is None:
+            max_turns = DEFAULT_MAX_TURNS * len(self.characters) // 2
+        while self.winner is None and self.current_turn < max_turns:
+            self.handle_turn()
+        return self.winner
+
+
+@dataclass
+class TeamSimulationResult:
+    """Aggregated outcome of many team battles."""
+
+    battles: int = 0
+    # Battles won by each team
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    timeouts: int = 0
+    # Number of battles that lasted a given number of turns
+    turn_counts: Counter = field(default_factory=Counter)
+    # Members of the winning team still standing, summed over battles
+    survivors: int = 0
+
+    def win_rate(self, team: int = 0) -> float:
+        """Fraction of battles won by the given team."""
+
+        return self.wins[team] / self.battles if self.battles else 0.0
+
+    def mean_turns(self) -> float:
+        """Average number of turns per battle."""
+
+        if not self.battles:
+            return 0.0
+        total_turns = sum(turns * count for turns, count in self.turn_counts.items())
+        return total_turns / self.battles
+
+
+def simulate_teams(
+    teams: Sequence[Sequence[CharacterFactory]],
+    n: int,
+    seed: Optional[int] = None,
+    max_turns: Optional[int] = None,
+    targeting: Targeting = random_target,
+) -> TeamSimulationResult:
+    """Simulate n headless battles between two teams, e.g. 5v5 or 50v50 raids.
+
+    The same seed always gives the same result.
+    """
+
+    rng = make_rng(seed)
+    result = TeamSimulationResult()
+    for _ in range(n):
+        battle = TeamBattle(
+            [[factory() for factory in team] for team in teams],
+            rng=rng,
+            targeting=targeting,
+        )
+        winner = battle.run(max_turns)
+        result.battles += 1
+        result.turn_counts[battle.current_turn] += 1
+        if winner is None:
+            result.timeouts += 1
+        else:
+            result.wins[winner] += 1
+            result.survivors += battle.alive_counts[winner]
+    return result
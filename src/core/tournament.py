@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import hashlib
+from .character_selection import Menu
+from .simulation import CharacterFactory, SimulationResult, simulate
+
+# Battles simulated per task. Shard boundaries (and therefore seeds) never
+# depend on the number of workers, which keeps results reproducible
+DEFAULT_SHARD_SIZE = 10000
+
+
+@dataclass
+class TournamentResult:
+    """Results of every matchup in a tournament, keyed by roster positions."""
+
+    names: List[str]
+    results: Dict[Tuple[int, int], SimulationResult]
+
+    def win_rate_matrix(self) -> List[List[float]]:
+        """Win rate of the row character moving first against the column character."""
+
+        size = len(self.names)
+        return [
+            [self.results[(row, column)].win_rate(0) for column in range(size)]
+            for row in range(size)
+        ]
+
+    def format_matrix(self) -> str:
+        """Render the win rate matrix as a text table."""
+
+        width = max(len(name) for name in self.names) + 2
+        lines = ["".rjust(width) + "".join(name.rjust(width) for name in self.names)]
+        for name, row in zip(self.names, self.win_rate_matrix()):
+            lines.append(
+                name.rjust(width) + "".join(f"{rate:.3f}".rjust(width) for rate in row)
+            )
+        return "\n".join(lines)
+
+
+def shard_seed(seed: int, first: int, second: int, shard: int) -> int:
+    """Derive an independent, reproducible seed for one shard of a matchup."""
+
+    digest = hashlib.blake2b(
+        f"{seed}:{first}:{second}:{shard}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _run_shard(
+    task: Tuple[Tuple[int, int], CharacterFactory, CharacterFactory, int, int],
+) -> Tuple[Tuple[int, int], SimulationResult]:
+    """Simulate one shard. Runs in a worker process, so it must stay top level."""
+
+    key, first, second, battles, seed = task
+    return key, simulate((first, second), battles, seed=seed)
+
+
+def run_tournament(
+    characters: Optional[Sequence[CharacterFactory]] = None,
+    battles: int = 10000,
+    seed: int = 0,
+    workers: Optional[int] = 1,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> TournamentResult:
+    """Simulate every ordered matchup of the roster across a process pool.
+
+    Each matchup is split into shards of shard_size battles with their own
+    seed, so the result is identical for any number of workers. A workers
+    value of None uses every available core; 1 runs in this process.
+    Raises ValueError unless battles and shard_size are at least 1.
+    """
+
+    if battles < 1 or shard_size < 1:
+        raise ValueError("battles and shard_size must be at least 1")
+    characters = list(characters or Menu.characters)
+    tasks = []
+    for first_index, first in enumerate(characters):
+        for second_index, second in enumerate(characters):
+            key = (first_index, second_index)
+            for shard, start in enumerate(range(0, battles, shard_size)):
+                tasks.append(
+                    (
+                        key,
+                        first,
+                        second,
+                        min(shard_size, battles - start),
+                        shard_seed(seed, first_index, second_index, shard),
+                    )
+                )
+
+    if workers == 1:
+        return _merge(characters, map(_run_shard, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _merge(characters, executor.map(_run_shard, tasks))
+
+
+def _merge(characters: Sequence[CharacterFactory], shards) -> TournamentResult:
+    """Merge shard results, in task order, into one result per matchup."""
+
+    results: Dict[Tuple[int, int], SimulationResult] = {}
+    for key, result in shards:
+        if key in results:
+            results[key].merge(result)
+        else:
+            results[key] = result
+    return TournamentResult(
+        names=[character().name for character in characters], results=results
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a balance tournament.")
+    parser.add_argument("--battles", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        result = run_tournament(
+            battles=args.battles, seed=args.seed, workers=args.workers
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    print(result.format_matrix())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np  # Optional dependency, only needed by the vectorized kernel
+from .character import ENEMY_DEFENSIVE_HP_THRESHOLD
+from .damage import DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX
+from .action import ActionType
+from .simulation import (
+    DEFAULT_MAX_TURNS,
+    CharacterFactory,
+    SimulationResult,
+    _compile,
+)
+
+# Action codes used in the action arrays, in ActionType order
+ACTIONS = list(ActionType)
+ATTACK = ACTIONS.index(ActionType.ATTACK)
+DEFEND = ACTIONS.index(ActionType.DEFEND)
+SPECIAL = ACTIONS.index(ActionType.SPECIAL)
+SKIP = ACTIONS.index(ActionType.SKIP)
+
+
+class BatchState:
+    """Struct-of-arrays state for many independent battles.
+
+    Every per-character array has shape (2, n): row 0 is the side that moves
+    first (the player slot in Battle) and row 1 the side that moves second.
+    All battles advance in lockstep, so the side to move is the same for every
+    battle still running and only depends on the turn counter.
+    """
+
+    _CHARACTER_ARRAYS = (
+        "max_hp",
+        "attack",
+        "defense",
+        "confuses",
+        "skips",
+        "heal",
+        "recharge",
+        "blast",
+        "hp",
+        "cooldown",
+        "confused",
+        "skip_turn",
+        "is_defending",
+    )
+
+    def __init__(
+        self,
+        matchups: Sequence[Tuple[CharacterFactory, CharacterFactory]],
+        counts: Sequence[int],
+    ):
+        compiled = [(_compile(first), _compile(second)) for first, second in matchups]
+        self.names = [(first[0], second[0]) for first, second in compiled]
+        # Matchup index of every battle, used to aggregate results per matchup
+        self.group = np.repeat(np.arange(len(matchups)), counts)
+
+        def column(field: int, dtype) -> np.ndarray:
+            per_matchup = np.array(
+                [[first[field], second[field]] for first, second in compiled],
+                dtype=dtype,
+            ).reshape(-1, 2)
+            return np.ascontiguousarray(per_matchup[self.group].T)
+
+        self.max_hp = column(1, np.int32)
+        self.attack = column(2, np.int32)
+        self.defense = column(3, np.int32)
+        self.confuses = column(4, bool)
+        self.skips = column(5, bool)
+        self.heal = column(6, np.int32)
+        self.recharge = column(7, np.int32)
+        # Fixed damage dealt by the special ability
+        self.blast = column(8, np.int32)
+
+        self.hp = self.max_hp.copy()
+        self.cooldown = np.zeros_like(self.hp)
+        self.confused = np.zeros_like(self.confuses)
+        self.skip_turn = np.zeros_like(self.confuses)
+        self.is_defending = np.zeros_like(self.confuses)
+        self.current_turn = 0
+
+    def __len__(self) -> int:
+        return len(self.group)
+
+    def finished(self) -> np.ndarray:
+        """Boolean mask of battles where a character has been defeated."""
+
+        return (self.hp <= 0).any(axis=0)
+
+    def compact(self, keep: np.ndarray):
+        """Drop every battle not selected by the keep mask."""
+
+        # Gathering by index is much faster than boolean masking along axis 1
+        kept = np.flatnonzero(keep)
+        self.group = self.group.take(kept)
+        for name in self._CHARACTER_ARRAYS:
+            setattr(self, name, getattr(self, name).take(kept, axis=1))
+
+
+def enemy_actions(
+    state: BatchState,
+    rng: np.random.Generator,
+    threshold: int = ENEMY_DEFENSIVE_HP_THRESHOLD,
+) -> np.ndarray:
+    """Pick an action for the side to move in every battle using the enemy AI.
+
+    Mirrors Character.get_enemy_action: a coin flip between attack and special
+    at or above the hp threshold, and between attack and defend below it.
+    """
+
+    selected = state.current_turn % 2
+    coin = rng.random(len(state)) < 0.5
+    fallback = np.where(state.hp[selected] >= threshold, SPECIAL, DEFEND)
+    return np.where(coin, ATTACK, fallback).astype(np.int8)
+
+
+def step(
+    state: BatchState, actions: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """Apply one turn of Battle.handle_turn to every battle in the batch.
+
+    Actions are given as codes in ActionType order. Battles that are already
+    finished must be removed with BatchState.compact beforehand. Returns the
+    actions that were actually taken after special conditions were applied.
+    """
+
+    selected = state.current_turn % 2
+    target = 1 - selected
+    actions = np.array(actions, dtype=np.int8, copy=True)
+
+    # Check for special conditions, confusion takes precedence over skipping
+    confused = state.confused[selected].copy()
+    skip_turn = state.skip_turn[selected] & ~confused
+    actions[confused] = rng.integers(0, len(ACTIONS), int(confused.sum()))
+    actions[skip_turn] = SKIP
+    state.confused[selected] = False
+    state.skip_turn[selected] &= ~skip_turn
+
+    # Attack, computed only for the battles where an attack happens
+    attackers = np.flatnonzero(actions == ATTACK)
+    roll = rng.integers(
+        DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX + 1, len(attackers), dtype=np.int32
+    )
+    damage = np.maximum(
+        state.attack[selected, attackers] - state.defense[target, attackers] + roll,
+        0,
+    )
+    defended = state.is_defending[target, attackers]
+    damage[defended] //= 2
+    state.is_defending[target, attackers] = False
+    state.hp[target, attackers] -= damage
+
+    # Defend
+    state.is_defending[selected] |= actions == DEFEND
+
+    # Special, only if the ability has recharged
+    ready = (actions == SPECIAL) & (state.cooldown[selected] == 0)
+    state.confused[target] |= ready & state.confuses[selected]
+    state.skip_turn[target] |= ready & state.skips[selected]
+    healed = np.minimum(
+        state.hp[selected] + state.heal[selected], state.max_hp[selected]
+    )
+    state.hp[selected] = np.where(ready, healed, state.hp[selected])
+    state.hp[target] -= np.where(ready, state.blast[selected], 0)
+    state.cooldown[selected][ready] = state.recharge[selected][ready]
+
+    # Decrement the special cooldown for both characters
+    np.subtract(state.cooldown, 1, out=state.cooldown, where=state.cooldown > 0)
+
+    state.current_turn += 1
+    return actions
+
+
+def run_matrix(
+    matchups: Sequence[Tuple[CharacterFactory, CharacterFactory]],
+    n: int,
+    seed: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    policies: Optional[Tuple[object, object]] = None,
+) -> List[SimulationResult]:
+    """Simulate n battles for every matchup in a single batch.
+
+    Both sides use the enemy AI, like simulation.simulate, unless a
+    src.core.policy.Policy is given for each side, which then picks the
+    actions of every battle at once. Battles still going after max_turns
+    turns stop there and count as timeouts, as in simulate. Returns one
+    SimulationResult per matchup, in the order given.
+    """
+
+    rng = np.random.default_rng(seed)
+    state = BatchState(matchups, [n] * len(matchups))
+    groups = len(matchups)
+    action_span = len(ACTIONS)
+
+    wins = np.zeros((groups, 2), dtype=np.int64)
+    action_counts = np.zeros((2, groups * action_span), dtype=np.int64)
+    recharging = np.zeros((2, groups), dtype=np.int64)
+    damage_dealt = np.zeros((2, groups), dtype=np.int64)
+    turn_counts: List[Counter] = [Counter() for _ in range(groups)]
+
+    while len(state) and state.current_turn < max_turns:
+        selected = state.current_turn % 2
+        target = 1 - selected
+        ready = state.cooldown[selected] == 0
+        hp_before = state.hp[target].copy()
+
+        if policies is None:
+            actions = enemy_actions(state, rng)
+        else:
+            actions = policies[selected].act_batch(state, rng)
+        actions = step(state, actions, rng)
+
+        action_counts[selected] += np.bincount(
+            state.group * action_span + actions, minlength=groups * action_span
+        )
+        fizzled = (actions == SPECIAL) & ~ready
+        recharging[selected] += np.bincount(state.group[fizzled], minlength=groups)
+        damage_dealt[selected] += np.bincount(
+            state.group, weights=hp_before - state.hp[target], minlength=groups
+        ).astype(np.int64)
+
+        finished = state.finished()
+        if finished.any():
+            # The player slot is checked first, as in Battle._check_win_condition
+            winner = np.where(state.hp[0] <= 0, 1, 0)[finished]
+            np.add.at(wins, (state.group[finished], winner), 1)
+            ended = np.bincount(state.group[finished], minlength=groups)
+            for group in np.flatnonzero(ended):
+                turn_counts[group][state.current_turn] += int(ended[group])
+            state.compact(~finished)
+
+    timeouts = np.bincount(state.group, minlength=groups)
+    for group in np.flatnonzero(timeouts):
+        turn_counts[group][state.current_turn] += int(timeouts[group])
+
+    results = []
+    for group, names in enumerate(state.names):
+        counts = action_counts[:, group * action_span : (group + 1) * action_span]
+        results.append(
+            SimulationResult(
+                matchup=names,
+                battles=n,
+                wins=[int(wins[group, 0]), int(wins[group, 1])],
+                timeouts=int(timeouts[group]),
+                turn_counts=turn_counts[group],
+                action_counts=[
+                    Counter(
+                        {
+                            ACTIONS[code]: int(count)
+                            for code, count in enumerate(counts[side])
+                            if count
+                        }
+                    )
+                    for side in (0, 1)
+                ],
+                specials_recharging=[int(count) for count in recharging[:, group]],
+                damage_dealt=[int(damage) for damage in damage_dealt[:, group]],
+            )
+        )
+    return results
+
+
+def run_batch(
+    matchup: Tuple[CharacterFactory, CharacterFactory],
+    n: int,
+    seed: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    policies: Optional[Tuple[object, object]] = None,
+) -> SimulationResult:
+    """Simulate n battles of a single matchup with the vectorized kernel."""
+
+    return run_matrix([matchup], n, seed, max_turns, policies)[0]
+
+
+def matchup_matrix(
+    characters: Sequence[CharacterFactory],
+    n: int,
+    seed: Optional[int] = None,
+) -> Dict[Tuple[str, str], SimulationResult]:
+    """Simulate every ordered pair of characters, keyed by character names."""
+
+    matchups = [(first, second) for first in characters for second in characters]
+    return {result.matchup: result for result in run_matrix(matchups, n, seed)}
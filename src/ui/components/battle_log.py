@@ -0,0 +1,49 @@
+from typing import Tuple
+import pygame
+from ...utils.asset_loader import AssetLoader
+from ...utils.constants import LOG_LINES, PANEL, SMALL_FONT_SIZE, TEXT
+
+# Space between the panel's edge and the text, and between lines
+PADDING = 8
+LINE_SPACING = 24
+
+
+class BattleLogView:
+    """Panel showing the latest lines of a battle log.
+
+    The log's total count of recorded events tells whether anything new was
+    logged, so the panel is only redrawn on frames after a turn. Lines are
+    rendered through the asset loader's text cache, so scrolling only renders
+    the newest lines.
+    """
+
+    def __init__(
+        self, rect: Tuple[int, int, int, int], battle_log, lines: int = LOG_LINES
+    ):
+        self.rect = pygame.Rect(rect)
+        self.battle_log = battle_log
+        self.lines = lines
+        self._shown = -1
+
+    def changed(self) -> bool:
+        """Whether events were logged since the panel was last drawn."""
+
+        return self.battle_log.total != self._shown
+
+    def draw(self, surface: pygame.Surface, assets: AssetLoader):
+        """Draw the panel over its whole rect."""
+
+        self._shown = self.battle_log.total
+        surface.fill(PANEL, self.rect)
+        count = min(self.lines, len(self.battle_log))
+        top = self.rect.top + PADDING
+        # Long lines are cut at the panel's edge
+        clip = surface.get_clip()
+        surface.set_clip(self.rect)
+        for index in range(-count, 0):
+            # Outcome messages start with a newline meant for the console
+            line = self.battle_log[index].strip()
+            text = assets.text(line, SMALL_FONT_SIZE, TEXT)
+            surface.blit(text, (self.rect.left + PADDING, top))
+            top += LINE_SPACING
+        surface.set_clip(clip)
@@ -0,0 +1,59 @@
+from typing import Optional, Tuple
+import pygame
+from ...utils.asset_loader import AssetLoader
+from ...utils.constants import (
+    BACKGROUND,
+    BAR_BACKGROUND,
+    BAR_HIGH,
+    BAR_LOW,
+    BAR_MEDIUM,
+    SMALL_FONT_SIZE,
+)
+
+# Height of the bar itself, the name and hp label sit above it
+BAR_HEIGHT = 18
+
+
+class HealthBar:
+    """A character's name, hp and a bar showing the share of hp left.
+
+    changed() compares the hp shown with the character's, so the bar is only
+    redrawn on turns that heal or damage the character.
+    """
+
+    def __init__(self, rect: Tuple[int, int, int, int], character):
+        self.rect = pygame.Rect(rect)
+        self.character = character
+        self._shown: Optional[Tuple[int, int]] = None
+
+    def _state(self) -> Tuple[int, int]:
+        return self.character.current_hp, self.character.max_hp
+
+    def changed(self) -> bool:
+        """Whether the bar no longer matches the character."""
+
+        return self._state() != self._shown
+
+    def draw(self, surface: pygame.Surface, assets: AssetLoader):
+        """Draw the bar over its whole rect."""
+
+        hp, max_hp = self._shown = self._state()
+        surface.fill(BACKGROUND, self.rect)
+        label = assets.text(
+            f"{self.character.name}  {max(hp, 0)}/{max_hp}", SMALL_FONT_SIZE
+        )
+        surface.blit(label, self.rect.topleft)
+
+        bar = pygame.Rect(
+            self.rect.left, self.rect.bottom - BAR_HEIGHT, self.rect.width, BAR_HEIGHT
+        )
+        surface.fill(BAR_BACKGROUND, bar)
+        share = min(max(hp, 0) / max_hp, 1.0)
+        if share > 0.5:
+            color = BAR_HIGH
+        elif share > 0.25:
+            color = BAR_MEDIUM
+        else:
+            color = BAR_LOW
+        bar.width = round(bar.width * share)
+        surface.fill(color, bar)
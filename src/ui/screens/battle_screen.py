@@ -0,0 +1,166 @@
+from typing import Callable, List, Optional
+import pygame
+from ...core.action import ActionType
+from ...utils.asset_loader import AssetLoader
+from ...utils.constants import (
+    ACTIONS_RECT,
+    BACKGROUND,
+    ENEMY_BAR_RECT,
+    ENEMY_SPRITE_RECT,
+    FPS,
+    LOG_RECT,
+    MUTED_TEXT,
+    PLAYER_BAR_RECT,
+    PLAYER_SPRITE_RECT,
+    STATUS_RECT,
+    TEXT,
+)
+from ..components.battle_log import BattleLogView
+from ..components.health_bar import HealthBar
+
+# Player actions by key, in the order of the text menu
+_KEY_ACTIONS = {
+    pygame.K_1: ActionType.ATTACK,
+    pygame.K_2: ActionType.DEFEND,
+    pygame.K_3: ActionType.SPECIAL,
+}
+
+
+class Label:
+    """A line of text produced by a function of the game state."""
+
+    def __init__(self, rect, text: Callable[[], str], color=TEXT):
+        self.rect = pygame.Rect(rect)
+        self.text = text
+        self.color = color
+        self._shown: Optional[str] = None
+
+    def changed(self) -> bool:
+        return self.text() != self._shown
+
+    def draw(self, surface: pygame.Surface, assets: AssetLoader):
+        self._shown = self.text()
+        surface.fill(BACKGROUND, self.rect)
+        surface.blit(assets.text(self._shown, color=self.color), self.rect.topleft)
+
+
+class BattleScreen:
+    """Graphical battle screen that only redraws what changed.
+
+    The first frame draws everything. Later frames ask each component whether
+    the state it shows changed, redraw only those and pass their rects to
+    pygame.display.update, so frames between turns cost a few comparisons
+    and a turn repaints the hp bars, labels and log panel instead of the
+    whole window. Sprites never change and are drawn with the first frame.
+    Works with the SDL dummy video driver for headless runs.
+    """
+
+    def __init__(
+        self,
+        battle,
+        surface: Optional[pygame.Surface] = None,
+        assets: Optional[AssetLoader] = None,
+        full_redraw: bool = False,
+    ):
+        self.battle = battle
+        self.surface = surface or pygame.display.get_surface()
+        self.assets = assets or AssetLoader()
+        # Repaint and flip the whole window every frame instead, for comparison
+        self.full_redraw = full_redraw
+        self.components = [
+            Label(STATUS_RECT, self._status),
+            HealthBar(PLAYER_BAR_RECT, battle.player_character),
+            HealthBar(ENEMY_BAR_RECT, battle.enemy_character),
+            BattleLogView(LOG_RECT, battle.battle_log),
+            Label(ACTIONS_RECT, self._actions, MUTED_TEXT),
+        ]
+        self.running = True
+        self._drawn = False
+        # Frames rendered and the total area pushed to the display, in pixels
+        self.frames = 0
+        self.dirty_pixels = 0
+
+    def _status(self) -> str:
+        if self.battle._game_over:
+            return "Game over! Close the window to exit."
+        return f"Turn {self.battle.current_turn + 1}: choose an action"
+
+    def _actions(self) -> str:
+        cooldown = self.battle.player_character.special_cooldown
+        special = f"3 Special (ready in {cooldown})" if cooldown else "3 Special"
+        return f"1 Attack    2 Defend    {special}"
+
+    def invalidate(self):
+        """Redraw the whole window on the next frame."""
+
+        self._drawn = False
+
+    def handle_events(self):
+        """Play actions for key presses and stop when the window is closed."""
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key in _KEY_ACTIONS:
+                self.play(_KEY_ACTIONS[event.key])
+
+    def play(self, action: ActionType):
+        """Handle the player's action followed by the enemy's turn."""
+
+        if self.battle._game_over:
+            return
+        self.battle.handle_turn(action)
+        if not self.battle._game_over:
+            self.battle.enemy_turn()
+
+    def render(self) -> List[pygame.Rect]:
+        """Draw the frame and return the regions pushed to the display."""
+
+        if self.full_redraw or not self._drawn:
+            self.surface.fill(BACKGROUND)
+            self.surface.blit(
+                self.assets.sprite(
+                    self.battle.player_character.name, PLAYER_SPRITE_RECT[2:]
+                ),
+                PLAYER_SPRITE_RECT[:2],
+            )
+            self.surface.blit(
+                self.assets.sprite(
+                    self.battle.enemy_character.name, ENEMY_SPRITE_RECT[2:]
+                ),
+                ENEMY_SPRITE_RECT[:2],
+            )
+            for component in self.components:
+                component.draw(self.surface, self.assets)
+            pygame.display.flip()
+            self._drawn = True
+            dirty = [self.surface.get_rect()]
+        else:
+            dirty = []
+            for component in self.components:
+                if component.changed():
+                    component.draw(self.surface, self.assets)
+                    dirty.append(component.rect)
+            if dirty:
+                pygame.display.update(dirty)
+
+        self.frames += 1
+        self.dirty_pixels += sum(rect.width * rect.height for rect in dirty)
+        return dirty
+
+    def run(self, fps: int = FPS, max_frames: Optional[int] = None):
+        """Run the screen until the window is closed, at most fps frames a second.
+
+        Closing the window shuts pygame down. Stopping after max_frames leaves
+        it running.
+        """
+
+        clock = pygame.time.Clock()
+        while self.running and (max_frames is None or self.frames < max_frames):
+            self.handle_events()
+            self.render()
+            clock.tick(fps)
+        if not self.running:
+            pygame.quit()
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Tuple, Union
+import hashlib
+import re
+import pygame
+from .constants import FONT_SIZE, SPRITES_PATH, TEXT, TEXT_CACHE_SIZE
+
+Color = Tuple[int, int, int]
+Size = Tuple[int, int]
+
+
+def sprite_filename(name: str) -> str:
+    """File name of a character's sprite, e.g. c_.png for C++."""
+
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()) + ".png"
+
+
+class AssetLoader:
+    """Loads sprites and fonts on first use and caches them with rendered text.
+
+    Nothing is read from disk until a surface is first needed, and every
+    surface is created once per size, so a screen can ask for the same sprite
+    or label every frame for the price of a dictionary lookup. Rendered text
+    is kept in a least recently used cache, since battle logs keep producing
+    new lines.
+    """
+
+    def __init__(
+        self,
+        sprites_path: Union[str, Path] = SPRITES_PATH,
+        text_cache_size: int = TEXT_CACHE_SIZE,
+    ):
+        self.sprites_path = Path(sprites_path)
+        self.text_cache_size = text_cache_size
+        self._sprites: Dict[Tuple[str, Size], pygame.Surface] = {}
+        self._fonts: Dict[int, pygame.font.Font] = {}
+        self._text: "OrderedDict[Tuple[str, int, Color], pygame.Surface]" = (
+            OrderedDict()
+        )
+        # Text cache statistics, to check the cache is doing its job
+        self.text_hits = 0
+        self.text_misses = 0
+
+    def font(self, size: int = FONT_SIZE) -> pygame.font.Font:
+        """The default font at the given size."""
+
+        font = self._fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def text(
+        self, text: str, size: int = FONT_SIZE, color: Color = TEXT
+    ) -> pygame.Surface:
+        """Text rendered with the default font, reused while it stays cached."""
+
+        key = (text, size, color)
+        surface = self._text.get(key)
+        if surface is not None:
+            self._text.move_to_end(key)
+            self.text_hits += 1
+            return surface
+        self.text_misses += 1
+        surface = self._text[key] = self.font(size).render(text, True, color)
+        if len(self._text) > self.text_cache_size:
+            self._text.popitem(last=False)
+        return surface
+
+    def sprite(self, name: str, size: Size) -> pygame.Surface:
+        """A character's sprite scaled to size, or a placeholder if it has none."""
+
+        key = (name, size)
+        surface = self._sprites.get(key)
+        if surface is None:
+            path = self.sprites_path / sprite_filename(name)
+            if path.is_file():
+                image = pygame.image.load(path)
+                if pygame.display.get_surface() is not None:
+                    # Matching the display's pixel format makes every blit cheaper
+                    image = image.convert_alpha()
+                surface = pygame.transform.smoothscale(image, size)
+            else:
+                surface = self._placeholder(name, size)
+            self._sprites[key] = surface
+        return surface
+
+    def _placeholder(self, name: str, size: Size) -> pygame.Surface:
+        """A tile in a color derived from the name, showing its first letters."""
+
+        surface = pygame.Surface(size)
+        red, green, blue = hashlib.md5(name.encode()).digest()[:3]
+        # Keep the color light enough for dark text
+        surface.fill((128 + red // 2, 128 + green // 2, 128 + blue // 2))
+        label = self.font(size[1] // 2).render(name[:3], True, TEXT)
+        surface.blit(label, label.get_rect(center=(size[0] // 2, size[1] // 2)))
+        return surface
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+# Location of the images shipped with the game. Character sprites are looked
+# up in the sprites subdirectory by name, e.g. sprites/rust.png
+ASSETS_PATH = Path(__file__).resolve().parents[2] / "assets"
+SPRITES_PATH = ASSETS_PATH / "sprites"
+
+SCREEN_SIZE = (800, 600)
+FPS = 60
+
+BACKGROUND = (255, 255, 255)
+TEXT = (20, 20, 20)
+MUTED_TEXT = (110, 110, 110)
+PANEL = (235, 235, 240)
+BAR_BACKGROUND = (200, 200, 200)
+BAR_HIGH = (60, 170, 80)
+BAR_MEDIUM = (230, 170, 40)
+BAR_LOW = (200, 60, 50)
+
+FONT_SIZE = 24
+SMALL_FONT_SIZE = 20
+# Rendered text surfaces kept by the asset loader
+TEXT_CACHE_SIZE = 512
+
+# Layout of the battle screen, as (left, top, width, height)
+STATUS_RECT = (20, 16, 760, 30)
+PLAYER_SPRITE_RECT = (110, 60, 160, 160)
+ENEMY_SPRITE_RECT = (530, 60, 160, 160)
+PLAYER_BAR_RECT = (40, 236, 300, 48)
+ENEMY_BAR_RECT = (460, 236, 300, 48)
+LOG_RECT = (20, 300, 760, 230)
+ACTIONS_RECT = (20, 546, 760, 36)
+LOG_LINES = 9
@@ -0,0 +1,72 @@
+from dataclasses import replace
+from functools import partial
+from src.core import Battle, Character, Python, Rust
+from src.core.arena import BattleArena, simulate_shared
+from src.core.effects import Effect, EffectKind
+from src.core.rng import CounterRandom
+from src.core.roster import default_roster
+import pytest
+
+
+class TestArena:
+    """Test cases for the shared memory battle arena."""
+
+    @pytest.fixture
+    def setup(self):
+        """Setup two arenas holding the same battles."""
+
+        self.arenas = [BattleArena.create(4), BattleArena.create(4)]
+        for arena in self.arenas:
+            for index in range(4):
+                battle = Battle(
+                    False, Python(), Rust(), rng=CounterRandom(index), log_capacity=0
+                )
+                arena.store(index, battle)
+        yield
+        for arena in self.arenas:
+            arena.close()
+
+    def test_step_in_place(self, setup):
+        """Test that battles stepped in several calls match a single call."""
+
+        stepped, whole = self.arenas
+        played = stepped.step(0, 4, max_turns=6)
+        assert played == 24
+        assert stepped.result().timeouts == 4
+
+        attached = BattleArena.attach(stepped.name)
+        assert attached.load(2).current_turn == 6
+        attached.step(0, 4)
+        attached.close()
+
+        whole.step(0, 4)
+        assert bytes(stepped.memory.buf) == bytes(whole.memory.buf)
+        result = stepped.result()
+        assert result.matchup == ("Python", "Rust")
+        assert sum(result.wins) == 4 and result.timeouts == 0
+
+    def test_workers(self):
+        """Test that the result does not depend on the number of workers."""
+
+        single = simulate_shared((Python, Rust), 40, seed=3, workers=1, shard_size=7)
+        pooled = simulate_shared((Python, Rust), 40, seed=3, workers=2, shard_size=7)
+
+        assert single.wins == pooled.wins
+        assert single.turn_counts == pooled.turn_counts
+        assert sum(single.wins) + single.timeouts == 40
+
+    def test_modified_archetype(self):
+        """Test that battles keep archetypes missing from the default roster."""
+
+        archetype = replace(
+            default_roster()["Rust"], effects=(Effect(EffectKind.HEAL, 90),)
+        )
+        variant = partial(Character.from_archetype, archetype)
+
+        default = simulate_shared((Python, Rust), 300, seed=4, workers=1)
+        single = simulate_shared((Python, variant), 300, seed=4, workers=1)
+        pooled = simulate_shared((Python, variant), 300, seed=4, workers=2)
+
+        assert single.wins != default.wins
+        assert single.wins[1] > default.wins[1]
+        assert pooled.wins == single.wins
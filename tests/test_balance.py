@@ -0,0 +1,62 @@
+from src.core.balance import ResultCache, optimize
+from src.core.roster import default_roster
+import pytest
+
+
+class TestBalance:
+    """Test cases for the balance optimizer."""
+
+    @pytest.fixture
+    def setup(self, tmp_path):
+        """Setup a cache file and the default roster."""
+
+        self.path = tmp_path / "balance.json"
+        self.roster = list(default_roster().values())
+
+    def test_cache_is_incremental(self, setup):
+        """Test that cached matchups only simulate the battles they are missing."""
+
+        cache = ResultCache(self.path)
+        first, second = self.roster[:2]
+        counts = list(cache.counts(first, second, 50))
+        assert counts[0] == 50 and cache.simulated == 50
+
+        cache.save()
+        reloaded = ResultCache(self.path)
+        assert reloaded.counts(first, second, 30) == counts
+        assert reloaded.simulated == 0
+        assert reloaded.counts(first, second, 80)[0] == 80
+        assert reloaded.simulated == 30
+
+    def test_optimize(self, setup):
+        """Test that a repeated sweep finds the same stats from the cache alone."""
+
+        options = dict(candidates=6, min_battles=20, eta=2, rounds=2, seed=1)
+        result = optimize(self.roster, cache=ResultCache(self.path), **options)
+
+        assert result.simulated > 0
+        assert len(result.win_rates) == 3
+        for values in result.config:
+            assert 10 <= values[0] <= 30 and 1 <= values[3] <= 5
+        archetypes = result.archetypes(self.roster)
+        assert archetypes[0].max_hp == result.to_roster()[0]["max_hp"]
+
+        repeated = optimize(self.roster, cache=ResultCache(self.path), **options)
+        assert repeated.simulated == 0
+        assert repeated.config == result.config
+        assert repeated.score == result.score
+
+    @pytest.mark.parametrize(
+        "options", [dict(rounds=0), dict(eta=1), dict(candidates=0)]
+    )
+    def test_invalid_options(self, setup, options):
+        """Test that sweeps that could not evaluate any config are rejected."""
+
+        with pytest.raises(ValueError):
+            optimize(self.roster, cache=ResultCache(self.path), **options)
+
+    def test_single_archetype(self, setup):
+        """Test that rosters without opponents are rejected."""
+
+        with pytest.raises(ValueError):
+            optimize(self.roster[:1], cache=ResultCache(self.path))
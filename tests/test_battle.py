@@ -1,6 +1,8 @@
 from src.core import Battle
 from src.core import cPlusPlus, Python
 from src.core import ActionType
+from src.core.rng import PythonRandom
+import random
 import pytest
 
 
@@ -156,3 +158,41 @@ class TestBattle:
         output = capsys.readouterr()
 
         assert "Invalid input." in output.out
+
+    def test_seeded_battle(self, capsys):
+        """Test that a seeded battle is reproducible and leaves global random alone."""
+
+        def play(seed):
+            battle = Battle(False, Python(), cPlusPlus(), rng=seed)
+            while not battle._game_over:
+                action = battle.selected_character.get_enemy_action(battle.rng)
+                battle.handle_turn(action)
+            return battle.battle_log
+
+        random.seed(0)
+        state = random.getstate()
+        assert play(5) == play(5)
+        assert random.getstate() == state
+
+    def test_predraw_damage_rolls(self, setup):
+        """Test that pre-drawn damage rolls are used before drawing new ones."""
+
+        self.battle.rng = PythonRandom(3)
+        self.battle.predraw_damage_rolls(10)
+        rolls = list(self.battle._damage_rolls)
+
+        assert len(rolls) == 10
+        assert all(-5 <= roll <= 10 for roll in rolls)
+        assert [self.battle._damage_roll() for _ in range(10)] == rolls
+        # Once the pre-drawn rolls are used up, rolls are drawn one at a time
+        assert -5 <= self.battle._damage_roll() <= 10
+
+    def test_headless_battle(self, capsys):
+        """Test that a battle with a log capacity of 0 neither logs nor prints."""
+
+        battle = Battle(False, Python(), cPlusPlus(), rng=1, log_capacity=0)
+        while not battle._game_over:
+            battle.handle_turn(battle.selected_character.get_enemy_action(battle.rng))
+
+        assert battle.battle_log == []
+        assert capsys.readouterr().out == ""
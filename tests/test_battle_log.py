@@ -0,0 +1,47 @@
+from src.core.battle_log import BattleLog, LogEvent
+
+
+class TestBattleLog:
+    """Test cases for the BattleLog class."""
+
+    def test_record_and_render(self):
+        """Test that recorded events render like the original log messages."""
+
+        log = BattleLog()
+        log.record(LogEvent.ATTACK, "C++", "Rust", 12)
+        log.record(LogEvent.DEFEND, "Rust")
+        log.append("Custom message")
+
+        assert len(log) == 3
+        assert log[0] == "C++ attacks Rust for 12 damage!"
+        assert log[-2] == "Rust takes a defensive stance!"
+        assert log[-1] == "Custom message"
+        assert log == [
+            "C++ attacks Rust for 12 damage!",
+            "Rust takes a defensive stance!",
+            "Custom message",
+        ]
+        assert log.entries()[1] == (LogEvent.DEFEND, "Rust", None, None)
+
+    def test_capacity(self):
+        """Test that only the most recent entries are kept."""
+
+        log = BattleLog(capacity=3)
+        for turn in range(5):
+            log.append(str(turn))
+
+        assert log.total == 5
+        assert len(log) == 3
+        assert list(log) == ["2", "3", "4"]
+        assert log[0] == "2"
+        assert log[-1] == "4"
+        assert log[-3:] == ["2", "3", "4"]
+
+    def test_disabled(self):
+        """Test that a capacity of 0 disables logging."""
+
+        log = BattleLog(capacity=0)
+        log.append("Ignored")
+
+        assert not log
+        assert log == []
@@ -0,0 +1,76 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.core import ActionType, Battle, Python, Rust
+from src.ui.screens.battle_screen import BattleScreen
+from src.utils.asset_loader import AssetLoader, sprite_filename
+from src.utils.constants import ENEMY_BAR_RECT, LOG_RECT, SCREEN_SIZE
+import pygame
+import pytest
+
+
+class TestBattleScreen:
+    """Test cases for the graphical battle screen, rendered headless."""
+
+    @pytest.fixture
+    def setup(self, tmp_path):
+        """Setup a battle screen on the dummy video driver."""
+
+        pygame.init()
+        self.surface = pygame.display.set_mode(SCREEN_SIZE)
+        self.assets = AssetLoader(tmp_path)
+        self.battle = Battle(False, Python(player_character=True), Rust(), rng=4)
+        self.battle.print_outcome = False
+        self.screen = BattleScreen(self.battle, self.surface, self.assets)
+        yield
+        pygame.quit()
+
+    def test_dirty_rects(self, setup):
+        """Test that only regions whose state changed are redrawn."""
+
+        assert self.screen.render() == [self.surface.get_rect()]
+        assert self.screen.render() == []
+
+        self.screen.play(ActionType.ATTACK)
+        dirty = self.screen.render()
+
+        assert pygame.Rect(LOG_RECT) in dirty
+        assert self.surface.get_rect() not in dirty
+        assert self.screen.render() == []
+
+        self.battle.enemy_character.current_hp -= 10
+        assert self.screen.render() == [pygame.Rect(ENEMY_BAR_RECT)]
+
+        self.screen.invalidate()
+        assert self.screen.render() == [self.surface.get_rect()]
+
+    def test_asset_loader(self, setup, tmp_path):
+        """Test that sprites load lazily and surfaces are cached."""
+
+        image = pygame.Surface((8, 8))
+        image.fill((255, 0, 0))
+        pygame.image.save(image, str(tmp_path / sprite_filename("Rust")))
+
+        sprite = self.assets.sprite("Rust", (16, 16))
+        assert sprite.get_size() == (16, 16)
+        assert sprite.get_at((8, 8))[:3] == (255, 0, 0)
+        assert self.assets.sprite("Rust", (16, 16)) is sprite
+        # Characters without a sprite get a placeholder
+        assert self.assets.sprite("Python", (16, 16)).get_size() == (16, 16)
+
+        text = self.assets.text("Rust heals 30 HP!")
+        assert self.assets.text("Rust heals 30 HP!") is text
+        assert (self.assets.text_hits, self.assets.text_misses) == (1, 1)
+
+    def test_run(self, setup):
+        """Test that the screen plays key presses and stops when closed."""
+
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_2))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        self.screen.run(fps=0)
+
+        assert self.battle.current_turn == 2
+        assert self.battle.battle_log[0] == "Python takes a defensive stance!"
+        assert not self.screen.running
+        assert not pygame.get_init()
@@ -0,0 +1,78 @@
+from src.core import Character, Rust
+from src.core.campaign import (
+    XP_FOR_LOSS,
+    XP_FOR_WIN,
+    Campaign,
+    _binomial,
+    leveled,
+    simulate_campaigns,
+)
+from src.core.roster import default_roster
+import random
+import pytest
+
+
+class TestCampaign:
+    """Test cases for leveling campaigns."""
+
+    def test_gain_levels(self):
+        """Test that several levels are gained at once in closed form."""
+
+        character = Character("Test", 10, 5)
+        character.gain_experience(1050)
+
+        assert character.level == 11
+        assert character.experience == 50
+        assert character.max_hp == character.current_hp == 200
+        assert character.attack_points == 30
+        assert character.defense_points == 15
+
+        stepped = Character("Test", 10, 5)
+        for _ in range(21):
+            stepped.gain_experience(50)
+        assert stepped.level == character.level
+        assert stepped.experience == character.experience
+
+    def test_campaign(self):
+        """Test that a persistent character gains experience from every battle."""
+
+        campaign = Campaign(Rust(player_character=True), rng=3)
+        wins = campaign.run(30)
+        experience = wins * XP_FOR_WIN + (30 - wins) * XP_FOR_LOSS
+
+        assert campaign.battles == 30 and campaign.wins == wins
+        assert 0 < wins < 30
+        assert campaign.character.level == 1 + experience // 100
+        assert campaign.character.experience == experience % 100
+        assert campaign.character.max_hp == 100 + 10 * (campaign.character.level - 1)
+
+        rust = default_roster()["Rust"]
+        assert leveled(rust, 5).attack_points == rust.attack_points + 8
+
+    def test_simulate_campaigns(self):
+        """Test batched campaigns against their bounds and for reproducibility."""
+
+        rust = default_roster()["Rust"]
+        result = simulate_campaigns(rust, 100_000, 50, seed=1, estimate_battles=100)
+
+        assert sum(result.level_counts.values()) == 100_000
+        assert min(result.level_counts) >= 1 + 50 * XP_FOR_LOSS // 100
+        assert max(result.level_counts) <= 1 + 50 * XP_FOR_WIN // 100
+        # Each battle yields the loss experience plus the difference for a win
+        rate = result.win_rate()
+        expected = 1 + 50 * (XP_FOR_LOSS + (XP_FOR_WIN - XP_FOR_LOSS) * rate) / 100
+        assert 0 < rate < 1
+        assert result.mean_level() == pytest.approx(expected, abs=1)
+        assert simulate_campaigns(rust, 100_000, 50, seed=1, estimate_battles=100) == (
+            result
+        )
+
+    def test_binomial(self):
+        """Test the binomial sampler's mean and range."""
+
+        rng = random.Random(0)
+        draws = [_binomial(rng, 1000, 0.3) for _ in range(2000)]
+
+        assert sum(draws) / len(draws) == pytest.approx(300, rel=0.01)
+        assert all(0 <= draw <= 1000 for draw in draws)
+        assert _binomial(rng, 10, 0.0) == 0 and _binomial(rng, 10, 1.0) == 10
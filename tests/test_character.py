@@ -59,3 +59,17 @@ class TestCharacter:
         assert self.character.current_hp == 110
         assert self.character.attack_points == 12
         assert self.character.defense_points == 6
+
+    def test_character_archetype(self):
+        """Test that static data is shared between characters of the same kind."""
+
+        from src.core import cPlusPlus
+
+        first, second = cPlusPlus(), cPlusPlus(player_character=True)
+
+        assert first.archetype is second.archetype
+        assert first.name == "C++"
+        assert first.special_ability_name == "Memory Leak"
+        assert second.player_character and not first.player_character
+        # Combat state is slotted, so characters carry no per-instance dict
+        assert not hasattr(first, "__dict__")
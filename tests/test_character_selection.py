@@ -1,4 +1,5 @@
-from src.core import Menu
+from src.core import Menu, cPlusPlus, Python, Rust
+import random
 import pytest
 
 
@@ -39,3 +40,24 @@ class TestCharacterSelection:
         # Check that the player character is a player character
         assert self.menu.player_character.player_character
         assert not self.menu.non_player_character.player_character
+
+    def test_character_selection_without_prompt(self, setup):
+        """Test selecting the player character by index."""
+
+        player, npc = self.menu.character_selection(2, random.Random(0))
+
+        assert player.name == Menu.archetypes[2].name
+        assert player.player_character
+        assert npc is self.menu.non_player_character
+
+    def test_character_classes(self, setup, mock_user_input_text):
+        """Test that built-in characters are selected as their own classes."""
+
+        self.menu.run()
+        assert isinstance(self.menu.player_character, cPlusPlus)
+
+        classes = {"C++": cPlusPlus, "Python": Python, "Rust": Rust}
+        for index, archetype in enumerate(Menu.archetypes):
+            player, npc = self.menu.character_selection(index, random.Random(0))
+            assert type(player) is classes[archetype.name]
+            assert isinstance(npc, classes[npc.name])
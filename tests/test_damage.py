@@ -0,0 +1,89 @@
+from src.core import Battle, Character, ActionType
+from src.core.damage import (
+    DAMAGE_ROLL_MIN,
+    DAMAGE_ROLL_MAX,
+    MAX_TABLES,
+    _TABLES,
+    damage_table,
+    damage_tables,
+)
+from src.core.roster import load_roster, DEFAULT_ROSTER_PATH
+
+
+class TestDamageTable:
+    """Test cases for the precomputed damage tables."""
+
+    def test_table_matches_take_damage(self):
+        """Test that every entry follows the clamp and the defend halving."""
+
+        for defending in (False, True):
+            table = damage_table(12, 10, defending)
+            for roll in range(DAMAGE_ROLL_MIN, DAMAGE_ROLL_MAX + 1):
+                character = Character("Target", 0, 10)
+                character.is_defending = defending
+                expected = character.take_damage(max(0, 12 - 10 + roll))
+                assert table.rolls[roll - DAMAGE_ROLL_MIN] == expected
+
+    def test_distribution(self):
+        """Test that the distribution sums to one and matches the rolls."""
+
+        table = damage_table(20, 25, True)
+
+        assert sum(probability for _, probability in table.distribution) == 1.0
+        # Damage up to 0 is clamped, and damage of 1 is halved down to 0
+        assert table.distribution[0] == (0, 12 / 16)
+        assert [damage for damage, _ in table.distribution] == sorted(set(table.rolls))
+
+    def test_built_when_roster_loads(self):
+        """Test that loading a roster builds the tables of every pairing."""
+
+        roster = load_roster(DEFAULT_ROSTER_PATH)
+        for attacker in roster.values():
+            for defender in roster.values():
+                for defending in (False, True):
+                    key = (attacker.attack_points, defender.defense_points, defending)
+                    assert key in _TABLES
+
+    def test_leveled_attack(self):
+        """Test that an attack after a level up uses the new stats."""
+
+        attacker, target = Character("Attacker", 20, 10), Character("Target", 10, 10)
+        attacker.level_up()
+        battle = Battle(False, attacker, target, rng=3, log_capacity=0)
+        battle.predraw_damage_rolls(1)
+        roll = battle._damage_rolls[0]
+        battle.handle_turn(ActionType.ATTACK)
+
+        hits, _ = damage_tables(22, 10)
+        assert target.current_hp == 100 - hits.rolls[roll - DAMAGE_ROLL_MIN]
+        assert hits.rolls[roll - DAMAGE_ROLL_MIN] == 12 + roll
+
+    def test_tables_bounded(self):
+        """Test that building many tables evicts the oldest ones."""
+
+        built = dict(_TABLES)
+        try:
+            for attack in range(MAX_TABLES // 2 + 10):
+                damage_tables(1000 + attack, 0)
+
+            assert len(_TABLES) == MAX_TABLES
+            assert (1000, 0, False) not in _TABLES
+            assert damage_table(1000, 0, False).rolls[0] == 995
+        finally:
+            _TABLES.clear()
+            _TABLES.update(built)
+
+    def test_attack_uses_take_damage(self):
+        """Test that attacks go through Character.take_damage."""
+
+        class Armored(Character):
+            def take_damage(self, damage: int) -> int:
+                return super().take_damage(damage // 4)
+
+        target = Armored("Target", 10, 10)
+        battle = Battle(False, Character("Attacker", 30, 10), target, rng=3)
+        battle.predraw_damage_rolls(1)
+        roll = battle._damage_rolls[0]
+        battle.handle_turn(ActionType.ATTACK)
+
+        assert target.current_hp == 100 - (20 + roll) // 4
@@ -0,0 +1,157 @@
+from src.core import ActionType, Battle, Character, Rust, simulate
+from src.core.effects import Effect, EffectKind, Status, apply_effects, compile_effects
+from src.core.replay import record, replay
+from src.core.roster import load_roster
+from src.core.solver import solve
+from functools import partial
+import json
+import pytest
+
+
+class TestEffects:
+    """Test cases for special abilities composed of several effects."""
+
+    @pytest.fixture
+    def roster(self, tmp_path):
+        """Write a roster with a composite ability and load it."""
+
+        self.path = tmp_path / "characters.json"
+        self.path.write_text(
+            json.dumps(
+                {
+                    "characters": [
+                        {
+                            "name": "Go",
+                            "attack_points": 20,
+                            "defense_points": 10,
+                            "max_hp": 40,
+                            "special_ability": {
+                                "name": "Panic",
+                                "cooldown": 2,
+                                "effects": [
+                                    {"kind": "damage", "amount": 8},
+                                    {"kind": "heal", "amount": 5},
+                                    {"kind": "status", "status": "confused"},
+                                ],
+                            },
+                        },
+                        {
+                            "name": "Zig",
+                            "attack_points": 20,
+                            "defense_points": 10,
+                            "max_hp": 40,
+                            "special_ability": {
+                                "name": "Comptime",
+                                "effect": "skip_turn",
+                            },
+                        },
+                    ]
+                }
+            )
+        )
+        return load_roster(self.path)
+
+    def test_load(self, roster):
+        """Test parsing effects lists, legacy effects and the compiled cache."""
+
+        go, zig = roster["Go"], roster["Zig"]
+
+        assert go.effects == (
+            Effect(EffectKind.DAMAGE, 8),
+            Effect(EffectKind.HEAL, 5),
+            Effect(EffectKind.STATUS, status=Status.CONFUSED),
+        )
+        assert go.compiled_special == compile_effects(go.special_effects)
+        assert (go.compiled_special.damage, go.compiled_special.heal) == (8, 5)
+        assert go.compiled_special.cooldown == 2
+        assert zig.effects == (Effect(EffectKind.STATUS, status=Status.SKIP_TURN),)
+        # Loaded again from the compiled cache
+        assert load_roster(self.path) == roster
+
+    def test_special(self, roster):
+        """Test that every effect of an ability is applied and described."""
+
+        battle = Battle(
+            False,
+            Character.from_archetype(roster["Go"], True),
+            Rust(),
+            rng=1,
+        )
+        battle.player_character.current_hp = 30
+        battle.handle_turn(ActionType.SPECIAL)
+
+        assert battle.enemy_character.current_hp == battle.enemy_character.max_hp - 8
+        assert battle.enemy_character.confused
+        assert battle.player_character.current_hp == 35
+        # Set to the ability's cooldown, then decremented at the end of the turn
+        assert battle.player_character.special_cooldown == 1
+        assert battle.battle_log[-1] == (
+            "Go deals 8 damage to Rust! Go heals 5 HP! Go causes Rust to be confused!"
+        )
+
+    def test_kernels(self, roster):
+        """Test the replay and solver kernels against Battle and the simulation."""
+
+        for seed in range(10):
+            battle = record(
+                Character.from_archetype(roster["Go"], True),
+                Character.from_archetype(roster["Zig"]),
+                seed,
+            )
+            battle.print_outcome = False
+            while not battle._game_over:
+                battle.handle_turn(ActionType.SPECIAL)
+                if not battle._game_over:
+                    battle.enemy_turn()
+            replayed = replay(battle.recording, roster=roster)
+            assert replayed.current_turn == battle.current_turn
+            assert replayed.enemy_character.current_hp == (
+                battle.enemy_character.current_hp
+            )
+
+        matchup = tuple(
+            partial(Character.from_archetype, roster[name]) for name in ("Go", "Zig")
+        )
+        solution = solve(matchup)
+        result = simulate(matchup, 40_000, seed=5)
+        assert solution.win_probability() == pytest.approx(
+            result.win_rate(0), abs=0.015
+        )
+
+    def test_invalid(self, roster):
+        """Test that effects kernels cannot run are rejected."""
+
+        data = json.loads(self.path.read_text())
+        effects = data["characters"][0]["special_ability"]["effects"]
+        for invalid in (
+            [{"kind": "teleport"}],
+            [{"kind": "damage", "amount": -1}],
+            [{"kind": "status", "status": "asleep"}],
+            [
+                {"kind": "status", "status": "confused"},
+                {"kind": "status", "status": "skip_turn"},
+            ],
+        ):
+            effects[:] = invalid
+            self.path.write_text(json.dumps(data))
+            with pytest.raises(ValueError):
+                load_roster(self.path)
+
+    def test_apply_effects(self):
+        """Test applying effects directly to characters."""
+
+        actor = Character("Go", 20, 10)
+        target = Character("Zig", 20, 10)
+
+        descriptions = apply_effects(
+            actor,
+            target,
+            (
+                Effect(EffectKind.STATUS, status=Status.SKIP_TURN),
+                Effect(EffectKind.COOLDOWN, 4),
+            ),
+        )
+
+        assert descriptions == ["Zig skips their next turn!"]
+        assert target.skip_turn
+        assert actor.special_cooldown == 4
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+
+class TestImports:
+    """Test cases for what importing the core package loads."""
+
+    def loaded(self, code):
+        """Names of the modules imported by code, in a fresh interpreter."""
+
+        result = subprocess.run(
+            [sys.executable, "-c", f"{code}; import sys; print(*sys.modules)"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return set(result.stdout.split())
+
+    def test_no_pygame_without_gui(self):
+        """Test that text battles and simulations never import pygame."""
+
+        assert "pygame" not in self.loaded(
+            "from src.core import Battle, Menu, Rust, simulate; "
+            "Battle(False, Rust(player_character=True), Rust())"
+        )
+        assert "pygame" not in self.loaded("import src.core.tournament")
+
+    def test_lazy_exports(self):
+        """Test that the package only imports the modules whose names are used."""
+
+        import src.core
+
+        loaded = self.loaded("from src.core import simulate")
+        assert "src.core.simulation" in loaded
+        assert "src.core.battle" not in loaded
+        assert set(src.core.__all__) <= set(dir(src.core))
+        assert src.core.Rust is src.core.character.Rust
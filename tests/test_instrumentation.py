@@ -0,0 +1,100 @@
+from src.core import Battle, ActionType
+from src.core import cPlusPlus, Python, Rust
+from src.core.instrumentation import PHASES, Instrumentation
+import json
+import pytest
+
+
+class TestInstrumentation:
+    """Test cases for battle instrumentation."""
+
+    @pytest.fixture
+    def setup(self):
+        """Setup an instrumented battle and an identical plain one."""
+
+        self.instrumentation = Instrumentation()
+        self.battle = Battle(
+            False,
+            cPlusPlus(player_character=True),
+            Rust(),
+            rng=7,
+            instrumentation=self.instrumentation,
+        )
+        self.plain = Battle(False, cPlusPlus(player_character=True), Rust(), rng=7)
+
+    def play(self, battle):
+        while not battle._game_over:
+            battle.handle_turn(ActionType.SPECIAL)
+            if not battle._game_over:
+                battle.enemy_turn()
+
+    def test_same_battle(self, setup):
+        """Test that instrumented turns play out exactly like plain ones."""
+
+        self.play(self.battle)
+        self.play(self.plain)
+
+        assert self.battle.current_turn == self.plain.current_turn
+        assert self.battle.battle_log == self.plain.battle_log
+        assert self.plain.instrumentation is None
+
+    def test_hooks(self, setup):
+        """Test the order and arguments of hooks and action listeners."""
+
+        calls = []
+        self.instrumentation.pre_turn.append(
+            lambda battle, action: calls.append(("pre", action, battle.current_turn))
+        )
+        self.instrumentation.post_turn.append(
+            lambda battle, action: calls.append(("post", action, battle.current_turn))
+        )
+
+        @self.instrumentation.on_action
+        def listener(battle, action):
+            calls.append(("action", action, battle.current_turn))
+
+        self.battle.handle_turn(ActionType.SPECIAL)
+        # C++ confused Rust, so the requested action is replaced by a random one
+        self.battle.handle_turn(ActionType.DEFEND)
+        taken = calls[-1][1]
+
+        assert calls[:3] == [
+            ("pre", ActionType.SPECIAL, 0),
+            ("action", ActionType.SPECIAL, 1),
+            ("post", ActionType.SPECIAL, 1),
+        ]
+        assert calls[3] == ("pre", ActionType.DEFEND, 1)
+        assert calls[4:] == [("action", taken, 2), ("post", taken, 2)]
+
+    def test_metrics(self, setup):
+        """Test the aggregated metrics and their exports."""
+
+        self.play(self.battle)
+        metrics = json.loads(self.instrumentation.to_json())
+
+        assert metrics["turns"] == self.battle.current_turn
+        assert sum(metrics["actions"].values()) == self.battle.current_turn
+        assert list(metrics["phases"]) == list(PHASES)
+        assert sum(phase["seconds"] for phase in metrics["phases"].values()) > 0
+
+        text = self.instrumentation.to_prometheus()
+        assert f"battle_turns_total {self.battle.current_turn}\n" in text
+        assert 'battle_phase_seconds_sum{phase="dispatch"}' in text
+        assert "# TYPE battle_phase_seconds summary" in text
+
+        self.instrumentation.reset()
+        assert self.instrumentation.to_dict()["turns"] == 0
+
+    def test_shared_between_battles(self, setup):
+        """Test that one instance aggregates the turns of several battles."""
+
+        other = Battle(
+            False, Python(player_character=True), Rust(), rng=8, log_capacity=0
+        )
+        other.instrumentation = self.instrumentation
+        self.play(self.battle)
+        self.play(other)
+
+        assert (
+            self.instrumentation.turns == self.battle.current_turn + other.current_turn
+        )
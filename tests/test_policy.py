@@ -0,0 +1,112 @@
+from src.core import ActionType, Battle, Python, Rust
+from src.core.policy import (
+    Policy,
+    RandomPolicy,
+    ScriptedPolicy,
+    SearchPolicy,
+    TablePolicy,
+    ThresholdPolicy,
+    batch_states,
+    play_battles,
+)
+from src.core.search import SearchAI, State
+from src.core.vectorized import BatchState, run_batch
+import numpy as np
+import pytest
+
+
+class TestPolicy:
+    """Test cases for action policies in single battles and batches."""
+
+    @pytest.fixture
+    def setup(self):
+        """Setup a batch of battles in a few different states."""
+
+        self.states = BatchState([(Python, Rust)], [20])
+        self.states.hp[0, :10] = 40
+        self.states.cooldown[1, 3] = 2
+        self.states.is_defending[0, 5] = True
+        self.rng = np.random.default_rng(0)
+
+    def test_battle_run(self):
+        """Test that policies play both sides of Battle.run without input."""
+
+        battle = Battle(
+            False,
+            Python(player_character=True),
+            Rust(),
+            rng=1,
+            player_policy=ScriptedPolicy([ActionType.DEFEND, ActionType.ATTACK]),
+            enemy_ai=RandomPolicy(rng=1),
+            log_capacity=None,
+        )
+        battle.print_outcome = False
+        battle.run()
+
+        assert battle._game_over
+        assert battle.battle_log[0] == "Python takes a defensive stance!"
+
+    def test_threshold_batch(self):
+        """Test that the threshold policy reproduces the vectorized enemy AI."""
+
+        policies = (ThresholdPolicy(), ThresholdPolicy())
+        default = run_batch((Python, Rust), 500, seed=2)
+        result = run_batch((Python, Rust), 500, seed=2, policies=policies)
+
+        assert result.wins == default.wins
+        assert result.turn_counts == default.turn_counts
+
+    def test_table_batch(self, setup):
+        """Test that vectorized table lookups match looking up every battle."""
+
+        states = batch_states(self.states)
+        policy = TablePolicy({state: ActionType.DEFEND for state in states[:6:3]})
+        codes = policy.act_batch(self.states, self.rng)
+
+        assert list(codes) == list(Policy.act_batch(policy, self.states, self.rng))
+        assert list(codes[:5]) == [1, 1, 1, 1, 1]
+        assert codes[5] == 0 and codes[19] == 0
+
+    def test_table_batch_flags(self, setup):
+        """Test that vectorized lookups tell apart every field of the states."""
+
+        self.states.confused[1, 7] = True
+        self.states.skip_turn[0, 8] = True
+        self.states.current_turn = 1
+        states = batch_states(self.states)
+        policy = TablePolicy({state: ActionType.DEFEND for state in states[3:9]})
+        codes = policy.act_batch(self.states, self.rng)
+
+        assert list(codes) == list(Policy.act_batch(policy, self.states, self.rng))
+        assert list(codes[3:9]) == [1] * 6
+        assert codes[10] == 0
+
+    def test_abstract(self):
+        """Test that policies without act cannot be built."""
+
+        class Incomplete(Policy):
+            def choose(self, state: State) -> ActionType:
+                return ActionType.ATTACK
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_search_batch(self, setup):
+        """Test that the search policy chooses like it does in a battle."""
+
+        policy = SearchPolicy(SearchAI(max_depth=2))
+        battle = Battle(False, Python(player_character=True), Rust(), rng=0)
+
+        codes = policy.act_batch(self.states, self.rng)
+        assert list(ActionType)[codes[19]] == policy.choose_action(battle)
+
+    def test_engines_accept_policies(self):
+        """Test that the scalar and batched engines play the same policies."""
+
+        policies = (ScriptedPolicy([ActionType.ATTACK]), ThresholdPolicy(rng=3))
+        scalar = play_battles((Rust, Python), policies, 200, seed=3)
+        batched = run_batch((Rust, Python), 200, seed=3, policies=policies)
+
+        for result in (scalar, batched):
+            assert sum(result.wins) + result.timeouts == 200
+        assert abs(scalar.win_rate() - batched.win_rate()) < 0.15
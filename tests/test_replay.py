@@ -0,0 +1,100 @@
+from src.core import ActionType, cPlusPlus, Python, Rust
+from src.core.replay import Recording, read, record, replay, write
+import random
+import pytest
+
+
+class TestReplay:
+    """Test cases for battle recordings and replays."""
+
+    def play(self, seed, player, enemy):
+        """Record a battle where the player picks random actions against the AI."""
+
+        battle = record(player(player_character=True), enemy(), seed, log_capacity=None)
+        choices = random.Random(seed)
+        while not battle._game_over and battle.current_turn < 200:
+            battle.handle_turn(
+                choices.choice(
+                    [ActionType.ATTACK, ActionType.DEFEND, ActionType.SPECIAL]
+                )
+            )
+            if not battle._game_over:
+                battle.enemy_turn()
+        return battle
+
+    def state(self, battle):
+        """Combat state of a battle that a replay must reproduce."""
+
+        return (
+            battle.current_turn,
+            battle._game_over,
+            battle.selected_character.player_character,
+            battle.rng.getstate(),
+            *(
+                (
+                    character.current_hp,
+                    character.is_defending,
+                    character.special_cooldown,
+                    character.confused,
+                    character.skip_turn,
+                )
+                for character in (battle.player_character, battle.enemy_character)
+            ),
+        )
+
+    @pytest.mark.parametrize("player", [cPlusPlus, Python, Rust])
+    @pytest.mark.parametrize("enemy", [cPlusPlus, Python, Rust])
+    def test_replay(self, player, enemy, capsys):
+        """Test that replays reproduce recorded battles exactly."""
+
+        for seed in range(20):
+            battle = self.play(seed, player, enemy)
+            recording = battle.recording
+
+            assert len(recording) == battle.current_turn
+            assert self.state(replay(recording)) == self.state(battle)
+
+            logged = replay(recording, log_capacity=None)
+            assert self.state(logged) == self.state(battle)
+            assert logged.battle_log == battle.battle_log
+
+        # Replays never print the outcome
+        capsys.readouterr()
+        replay(recording)
+        replay(recording, log_capacity=None)
+        assert capsys.readouterr().out == ""
+
+    def test_fast_forward(self, capsys):
+        """Test rebuilding the state of a battle at any turn."""
+
+        battle = record(cPlusPlus(player_character=True), Rust(), seed=7)
+        states = [self.state(battle)]
+        for _ in range(10):
+            battle.enemy_turn()
+            states.append(self.state(battle))
+
+        for turn, state in enumerate(states):
+            assert self.state(replay(battle.recording, turn)) == state
+            assert self.state(replay(battle.recording, turn, log_capacity=10)) == state
+
+    def test_replay_diverged(self):
+        """Test that replays detect enemy AI choices that are no longer made."""
+
+        # The enemy AI never skips a turn by choice
+        recording = Recording(3, "Python", "Rust")
+        recording.append(ActionType.SKIP, by_ai=True)
+
+        with pytest.raises(ValueError):
+            replay(recording)
+        with pytest.raises(ValueError):
+            replay(Recording(1, "Python", "Go"))
+
+    def test_read_write(self, tmp_path):
+        """Test archiving recordings to a file."""
+
+        recordings = [self.play(seed, Python, Rust).recording for seed in range(5)]
+        path = tmp_path / "battles.replay"
+        write(path, recordings)
+
+        assert read(path) == recordings
+        assert path.stat().st_size < 20 + sum(40 + len(r) for r in recordings)
@@ -0,0 +1,97 @@
+from src.core import Battle, Python, Rust
+from src.core.battle_log import LogEvent
+from src.core.replay import Recording, read, write
+from src.core.results import BATTLES, FILENAMES, ResultReader, ResultSink
+from src.core.simulation import simulate
+import pytest
+
+
+class TestResults:
+    """Test cases for the columnar battle result sink."""
+
+    @pytest.fixture
+    def setup(self, tmp_path):
+        """Setup a result directory."""
+
+        self.directory = tmp_path / "results"
+
+    def test_simulated_summaries(self, setup):
+        """Test that simulated battles stream their summaries across chunks."""
+
+        with ResultSink(self.directory, chunk_rows=100) as sink:
+            result = simulate((Python, Rust), 1000, seed=5, sink=sink)
+        with ResultSink(self.directory, chunk_rows=100) as sink:
+            simulate((Rust, Python), 10, seed=5, sink=sink)
+
+        reader = ResultReader(self.directory)
+        assert len(reader.battles) == 1010
+        assert reader.names == ["Python", "Rust"]
+        winners = reader.battles.to_numpy("winner")
+        assert (winners[:1000] == 0).sum() == result.wins[0]
+        assert (winners[:1000] == 1).sum() == result.wins[1]
+        turns = reader.battles.to_numpy("turns")[:1000].sum()
+        assert turns == result.mean_turns() * 1000
+        assert sum(len(chunk) for chunk in reader.battles.column("hp0")) == 1010
+        assert list(reader.battles.to_numpy("first")[-2:]) == [1, 1]
+        assert list(reader.battles.to_numpy("battle")[-2:]) == [1008, 1009]
+
+    def test_battle_events(self, setup):
+        """Test that the events of a played battle are stored by turn and side."""
+
+        battle = Battle(False, Python(), Rust(), rng=2, log_capacity=None)
+        battle.print_outcome = False
+        while not battle._game_over:
+            battle.enemy_turn()
+        with ResultSink(self.directory) as sink:
+            assert sink.add_battle(battle) == 0
+
+        events = ResultReader(self.directory).events
+        assert len(events) == len(battle.battle_log)
+        turns = events.to_numpy("turn")
+        assert turns[0] == 1 and turns[-1] == battle.current_turn
+        attacks = events.to_numpy("event") == list(LogEvent).index(LogEvent.ATTACK)
+        actors = events.to_numpy("actor")[attacks]
+        assert list(actors) == [(turn - 1) % 2 for turn in turns[attacks]]
+        assert events.to_numpy("value")[attacks].min() > 0
+
+    def test_partial_chunk(self, setup):
+        """Test that a chunk cut short is ignored and overwritten by appends."""
+
+        with ResultSink(self.directory) as sink:
+            simulate((Python, Rust), 20, seed=1, sink=sink)
+        path = self.directory / FILENAMES[BATTLES]
+        with open(path, "ab") as file:
+            file.write(b"\x01\0\0\0\xff\0\0\0partial")
+
+        assert len(ResultReader(self.directory).battles) == 20
+        with ResultSink(self.directory) as sink:
+            simulate((Python, Rust), 5, seed=2, sink=sink)
+        assert len(ResultReader(self.directory).battles) == 25
+
+    def test_close(self, setup):
+        """Test that closing a reader releases its memory maps."""
+
+        with ResultSink(self.directory) as sink:
+            simulate((Python, Rust), 5, seed=1, sink=sink)
+        with ResultReader(self.directory) as reader:
+            turns = reader.battles.to_numpy("turns")
+        assert len(turns) == 5
+        assert reader.battles._data.closed and reader.events._data.closed
+        with pytest.raises(ValueError):
+            reader.battles.to_numpy("turns")
+
+    def test_replay_files_rejected(self, setup, tmp_path):
+        """Test that result tables and replay recordings reject each other."""
+
+        with ResultSink(self.directory) as sink:
+            simulate((Python, Rust), 5, seed=1, sink=sink)
+        with pytest.raises(ValueError, match="Not a battle recording file"):
+            read(self.directory / FILENAMES[BATTLES])
+
+        recordings = tmp_path / "battles.replay"
+        write(recordings, [Recording(1, "Python", "Rust")])
+        replay = tmp_path / "replay"
+        replay.mkdir()
+        recordings.rename(replay / FILENAMES[BATTLES])
+        with pytest.raises(ValueError, match="Not a battle results file"):
+            ResultReader(replay)
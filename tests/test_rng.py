@@ -0,0 +1,49 @@
+from src.core.rng import CounterRandom, PythonRandom, NumpyRandom, make_rng
+import pytest
+
+
+class TestRng:
+    """Test cases for the battle random sources."""
+
+    def test_make_rng(self):
+        """Test building random sources from seeds and existing sources."""
+
+        assert isinstance(make_rng(), PythonRandom)
+        assert make_rng(1).randints(-5, 10, 20) == make_rng(1).randints(-5, 10, 20)
+
+        source = PythonRandom(2)
+        assert make_rng(source) is source
+
+    def test_python_random_randints(self):
+        """Test bulk draws from the standard library generator."""
+
+        rolls = PythonRandom(1).randints(-5, 10, 1000)
+
+        assert len(rolls) == 1000
+        assert min(rolls) == -5
+        assert max(rolls) == 10
+
+    def test_counter_random(self):
+        """Test that the counter-based generator can resume from its state."""
+
+        source = CounterRandom(7)
+        rolls = source.randints(-5, 10, 1000)
+        assert min(rolls) == -5
+        assert max(rolls) == 10
+
+        resumed = CounterRandom(*CounterRandom(7, 500).getstate())
+        assert resumed.randints(-5, 10, 500) == rolls[500:]
+
+    def test_numpy_random(self):
+        """Test the NumPy Generator adapter."""
+
+        np = pytest.importorskip("numpy")
+
+        source = make_rng(np.random.Generator(np.random.Philox(4)))
+        assert isinstance(source, NumpyRandom)
+        assert -5 <= source.randint(-5, 10) <= 10
+        assert source.choice(["a", "b"]) in ["a", "b"]
+
+        rolls = NumpyRandom(4).randints(-5, 10, 100)
+        assert rolls == NumpyRandom(4).randints(-5, 10, 100)
+        assert all(isinstance(roll, int) for roll in rolls)
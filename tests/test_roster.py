@@ -0,0 +1,101 @@
+from src.core import Menu, Rust
+from src.core.roster import SpecialEffect, default_roster, load_roster
+import json
+import os
+import pytest
+
+
+class TestRoster:
+    """Test cases for loading the character roster."""
+
+    @pytest.fixture
+    def roster_file(self, tmp_path):
+        """Write a small roster file to a temporary directory."""
+
+        path = tmp_path / "characters.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "characters": [
+                        {
+                            "name": "Go",
+                            "attack_points": 18,
+                            "defense_points": 12,
+                            "speed": 15,
+                            "special_ability": {
+                                "name": "Goroutine",
+                                "cooldown": 2,
+                                "effect": "heal",
+                                "amount": 10,
+                            },
+                        }
+                    ]
+                }
+            )
+        )
+        return path
+
+    def test_default_roster(self):
+        """Test that the shipped roster defines the built-in characters."""
+
+        roster = default_roster()
+
+        assert list(roster) == ["C++", "Python", "Rust"]
+        assert roster["Rust"].special_effect is SpecialEffect.HEAL
+        assert roster["Rust"].special_amount == 30
+        assert Rust().archetype is roster["Rust"]
+        assert [archetype.name for archetype in Menu.archetypes] == list(roster)
+
+    def test_load_roster(self, roster_file):
+        """Test parsing a roster and defaulting optional fields."""
+
+        archetype = load_roster(roster_file)["Go"]
+
+        assert archetype.attack_points == 18
+        assert archetype.max_hp == 100
+        assert archetype.special_cooldown == 2
+        assert archetype.special_effect is SpecialEffect.HEAL
+        assert archetype.speed == 15
+        assert default_roster()["Rust"].speed == 10
+
+    def test_load_roster_cache(self, roster_file):
+        """Test that the compiled cache is used until the file content changes."""
+
+        cache = roster_file.with_name("characters.json.cache")
+        roster = load_roster(roster_file)
+        assert cache.exists()
+
+        # A stale timestamp with unchanged content still uses the cache
+        os.utime(roster_file, ns=(0, 0))
+        assert load_roster(roster_file) == roster
+
+        # A changed file is parsed again
+        data = json.loads(roster_file.read_text())
+        data["characters"][0]["attack_points"] = 25
+        roster_file.write_text(json.dumps(data))
+        assert load_roster(roster_file)["Go"].attack_points == 25
+
+    def test_load_roster_invalid(self, tmp_path):
+        """Test that invalid definitions are rejected."""
+
+        path = tmp_path / "characters.json"
+        path.write_text(json.dumps({"characters": [{"name": "Go"}]}))
+        with pytest.raises(ValueError):
+            load_roster(path)
+
+        path.write_text(
+            json.dumps(
+                {
+                    "characters": [
+                        {
+                            "name": "Go",
+                            "attack_points": 1,
+                            "defense_points": 1,
+                            "special_ability": {"effect": "teleport"},
+                        }
+                    ]
+                }
+            )
+        )
+        with pytest.raises(ValueError):
+            load_roster(path)
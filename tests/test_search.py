@@ -0,0 +1,92 @@
+from src.core import Battle, ActionType
+from src.core import cPlusPlus, Python, Rust
+from src.core.replay import record, replay
+from src.core.search import KEY_MAX_HP, SearchAI, battle_rules, battle_state
+import time
+import pytest
+
+
+class TestSearchAI:
+    """Test cases for the search based enemy AI."""
+
+    @pytest.fixture
+    def setup(self):
+        """Setup a battle where the enemy moves next."""
+
+        self.battle = Battle(False, Python(player_character=True), Rust(), rng=1)
+        self.battle.handle_turn(ActionType.DEFEND)
+
+    def test_choose_action(self, setup):
+        """Test that the AI picks a legal action within its time budget."""
+
+        ai = SearchAI(time_budget=0.02)
+
+        start = time.perf_counter()
+        action = ai.choose_action(self.battle)
+
+        assert action in (ActionType.ATTACK, ActionType.DEFEND, ActionType.SPECIAL)
+        assert time.perf_counter() - start < 0.5
+        assert ai.depth >= 1
+
+    def test_finishing_blow(self, setup):
+        """Test that the AI attacks when an attack always wins the battle."""
+
+        self.battle.player_character.current_hp = 1
+        self.battle.player_character.is_defending = False
+
+        assert SearchAI(max_depth=2).choose_action(self.battle) == ActionType.ATTACK
+
+    def test_transposition_table(self, setup):
+        """Test that the table stays bounded and is reused across moves."""
+
+        ai = SearchAI(time_budget=10, max_depth=3, table_size=500)
+
+        self.battle.handle_turn(ai.choose_action(self.battle))
+        self.battle.handle_turn(ActionType.ATTACK)
+        hits = ai.table_hits
+        ai.choose_action(self.battle)
+
+        assert len(ai.table) <= 500
+        assert ai.table_hits > hits
+
+    def test_table_reset_on_level_up(self, setup):
+        """Test that positions cached for other character stats are dropped."""
+
+        ai = SearchAI(time_budget=10, max_depth=2)
+        ai.choose_action(self.battle)
+        self.battle.enemy_character.level_up()
+        ai.table[-1] = (99, 0.0, None)
+
+        ai.choose_action(self.battle)
+
+        assert -1 not in ai.table
+
+    def test_battle_with_search_ai(self, capsys):
+        """Test a recorded battle against the search AI runs and replays."""
+
+        battle = record(cPlusPlus(player_character=True), Python(), seed=4)
+        battle.enemy_ai = SearchAI(time_budget=0.002)
+        while not battle._game_over and battle.current_turn < 200:
+            battle.handle_turn(ActionType.ATTACK)
+            if not battle._game_over:
+                battle.enemy_turn()
+
+        replayed = replay(battle.recording)
+        assert replayed.player_character.current_hp == (
+            battle.player_character.current_hp
+        )
+        assert replayed.enemy_character.current_hp == battle.enemy_character.current_hp
+
+    def test_key_fields(self, setup):
+        """Test that hp beyond the state key fields is rejected instead of colliding."""
+
+        state = battle_state(self.battle)
+        rules = battle_rules(self.battle)
+        ai = SearchAI(max_depth=2)
+        large = (KEY_MAX_HP, KEY_MAX_HP - 1, *state[2:])
+        largest = tuple((KEY_MAX_HP, *rule[1:]) for rule in rules)
+
+        assert ai.choose(large, largest) in ActionType
+        oversized = ((KEY_MAX_HP + 1, *rules[0][1:]), rules[1])
+        with pytest.raises(ValueError):
+            ai.choose(state, oversized)
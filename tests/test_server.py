@@ -0,0 +1,107 @@
+from src.core.server import BattleClient, BattleServer
+import asyncio
+import random
+import socket
+import pytest
+
+
+async def play(client, character, rng, reply=None):
+    """Play one battle with random actions, returning the end message."""
+
+    if reply is None:
+        reply = await client.request({"type": "select", "character": character})
+    while reply["type"] != "end":
+        action = rng.choice(["attack", "defend", "special"])
+        reply = await client.request({"type": "action", "action": action})
+    return reply
+
+
+class TestBattleServer:
+    """Test cases for the asyncio battle server."""
+
+    def test_session(self):
+        """Test a full session including invalid messages."""
+
+        async def session():
+            server = BattleServer(seed=1)
+            listener = await server.start()
+            port = listener.sockets[0].getsockname()[1]
+            client = await BattleClient.connect(port=port)
+
+            characters = (await client.receive())["characters"]
+            assert characters == list(server.roster)
+
+            client.writer.write(b"not json\n")
+            assert (await client.receive())["type"] == "error"
+            reply = await client.request({"type": "select", "character": "Nobody"})
+            assert reply["type"] == "error"
+
+            reply = await client.request({"type": "select", "character": "Rust"})
+            assert reply["type"] == "turn"
+            assert reply["events"] == []
+            assert reply["state"]["player"]["name"] == "Rust"
+            reply = await client.request({"type": "action", "action": "skip"})
+            assert reply["type"] == "error"
+
+            end = await play(client, "Rust", random.Random(0), reply)
+            assert end["winner"] in ("player", "enemy")
+            assert end["state"]["turn"] > 0
+            assert server.completed == 1
+
+            # A new battle can be selected once the last one is over
+            await play(client, "Python", random.Random(1))
+            assert server.completed == 2
+
+            await client.close()
+            await server.close()
+
+        asyncio.run(session())
+
+    def test_client_swarm(self):
+        """Test many clients playing at the same time."""
+
+        clients = 200
+
+        async def swarm():
+            server = BattleServer(seed=2)
+            listener = await server.start()
+            port = listener.sockets[0].getsockname()[1]
+
+            async def player(index):
+                client = await BattleClient.connect(port=port)
+                characters = (await client.receive())["characters"]
+                rng = random.Random(index)
+                end = await play(client, rng.choice(characters), rng)
+                await client.close()
+                return end
+
+            ends = await asyncio.gather(*(player(index) for index in range(clients)))
+            # Let the server notice the disconnections and close its transports
+            while server.active:
+                await asyncio.sleep(0.01)
+            await server.close()
+            return server, ends
+
+        server, ends = asyncio.run(swarm())
+
+        assert server.completed == clients
+        assert all(end["type"] == "end" for end in ends)
+        assert {end["winner"] for end in ends} == {"player", "enemy"}
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+    def test_unix_socket(self, tmp_path):
+        """Test serving over a Unix socket."""
+
+        path = tmp_path / "battle.sock"
+
+        async def session():
+            server = BattleServer(seed=3)
+            await server.start(path=path)
+            client = await BattleClient.connect(path=path)
+            await client.receive()
+            end = await play(client, "C++", random.Random(3))
+            await client.close()
+            await server.close()
+            return end
+
+        assert asyncio.run(session())["type"] == "end"
@@ -0,0 +1,72 @@
+from src.core import Battle, simulate
+from src.core import cPlusPlus, Python, Rust
+import random
+
+
+class TestSimulation:
+    """Test cases for the headless battle simulation."""
+
+    def test_simulate_totals(self):
+        """Test that every simulated battle is accounted for in the result."""
+
+        result = simulate((cPlusPlus, Rust), 500, seed=1)
+
+        assert result.matchup == ("C++", "Rust")
+        assert result.battles == 500
+        assert sum(result.wins) + result.timeouts == 500
+        assert sum(result.turn_counts.values()) == 500
+
+        # Every turn taken by a side is counted as exactly one action
+        total_actions = sum(sum(counts.values()) for counts in result.action_counts)
+        assert total_actions == sum(
+            turns * count for turns, count in result.turn_counts.items()
+        )
+
+    def test_simulate_deterministic(self):
+        """Test that the same seed reproduces the same result."""
+
+        assert simulate((Python, Rust), 200, seed=7) == simulate(
+            (Python, Rust), 200, seed=7
+        )
+
+    def test_simulate_max_turns(self):
+        """Test that battles exceeding the turn limit are counted as timeouts."""
+
+        result = simulate((Rust, Rust), 100, seed=1, max_turns=2)
+
+        assert result.timeouts + sum(result.wins) == 100
+        assert max(result.turn_counts) <= 2
+
+    def test_odd_max_turns(self):
+        """Test that an odd turn limit stops battles after the first side moves."""
+
+        result = simulate((Rust, Rust), 100, seed=1, max_turns=5)
+
+        assert max(result.turn_counts) == 5
+        assert result.turn_counts[5] >= result.timeouts > 0
+
+    def test_simulate_merge(self):
+        """Test merging the results of two batches."""
+
+        result = simulate((cPlusPlus, Python), 100, seed=1)
+        result.merge(simulate((cPlusPlus, Python), 100, seed=2))
+
+        assert result.battles == 200
+        assert sum(result.wins) + result.timeouts == 200
+
+    def test_simulate_matches_battle(self, capsys):
+        """Test that the simulation agrees with Battle.handle_turn statistically."""
+
+        n = 2000
+        random.seed(1)
+        wins = 0
+        for _ in range(n):
+            battle = Battle(False, cPlusPlus(player_character=True), Python())
+            while not battle._game_over:
+                battle.handle_turn(battle.selected_character.get_enemy_action())
+            wins += battle.enemy_character.current_hp <= 0
+
+        result = simulate((cPlusPlus, Python), n, seed=1)
+
+        # Both estimates come from 2000 samples, so allow a few standard errors
+        assert abs(result.win_rate(0) - wins / n) < 0.05
@@ -0,0 +1,114 @@
+from src.core import Battle, ActionType
+from src.core import Character, cPlusPlus, Python, Rust
+from src.core.rng import CounterRandom, PythonRandom
+from src.core.snapshot import (
+    HEADER,
+    SnapshotReader,
+    pack,
+    restore,
+    snapshot,
+    write,
+)
+import pytest
+
+
+class TestSnapshot:
+    """Test cases for battle snapshots."""
+
+    ACTIONS = [ActionType.SPECIAL, ActionType.ATTACK, ActionType.DEFEND] * 4
+
+    def play(self, battle, actions):
+        """Play a fixed sequence of actions and return the resulting log."""
+
+        for action in actions:
+            if battle._game_over:
+                break
+            battle.handle_turn(action)
+        return list(battle.battle_log)
+
+    @pytest.mark.parametrize("rng", [CounterRandom(3), PythonRandom(3)])
+    def test_snapshot_restore(self, rng, capsys):
+        """Test that a restored battle continues exactly like the original."""
+
+        battle = Battle(False, cPlusPlus(player_character=True), Rust(), rng=rng)
+        self.play(battle, self.ACTIONS[:5])
+
+        restored = restore(snapshot(battle))
+
+        assert restored.current_turn == battle.current_turn
+        assert restored.selected_character.name == battle.selected_character.name
+        assert restored.player_character.player_character
+        assert restored.enemy_character.special_cooldown == (
+            battle.enemy_character.special_cooldown
+        )
+
+        restored.battle_log.clear()
+        battle.battle_log.clear()
+        assert self.play(restored, self.ACTIONS) == self.play(battle, self.ACTIONS)
+
+    def test_snapshot_size(self):
+        """Test that battles with a counter-based random source stay small."""
+
+        battle = Battle(False, Python(), Rust(), rng=CounterRandom(1))
+
+        assert len(snapshot(battle)) < 150
+
+    def test_snapshot_reader(self, tmp_path):
+        """Test reading records in place from a memory-mapped file."""
+
+        battles = [
+            Battle(False, Python(), Rust(), rng=CounterRandom(seed))
+            for seed in range(10)
+        ]
+        battles[4].enemy_character.current_hp = 42
+        path = tmp_path / "battles.snapshot"
+        write(path, battles)
+
+        reader = SnapshotReader.open(path)
+
+        assert len(reader) == 10
+        assert reader.hit_points(4) == (100, 42)
+        assert reader.restore(4).enemy_character.current_hp == 42
+        with pytest.raises(IndexError):
+            reader.record(10)
+
+    def test_snapshot_custom_character(self):
+        """Test that characters missing from the roster keep their stats."""
+
+        battle = Battle(
+            False, Character("Test", 10, 5), Python(), rng=CounterRandom(1)
+        )
+        battle.player_character.level_up()
+
+        player = restore(snapshot(battle)).player_character
+
+        assert player.name == "Test"
+        assert player.level == 2
+        assert player.attack_points == 12
+
+    def test_snapshot_invalid(self):
+        """Test that unsupported input is rejected."""
+
+        with pytest.raises(ValueError):
+            SnapshotReader(b"not a snapshot at all")
+        with pytest.raises(ValueError):
+            pack(
+                [
+                    Battle(False, Python(), Rust(), rng=CounterRandom(1)),
+                    Battle(False, Python(), Rust(), rng=PythonRandom(1)),
+                ]
+            )
+
+    @pytest.mark.parametrize("rng", [CounterRandom(3), PythonRandom(3)])
+    def test_snapshot_version_1(self, rng):
+        """Test that only version 1 snapshots of unchanged random sources load."""
+
+        data = bytearray(snapshot(Battle(False, Python(), Rust(), rng=rng)))
+        magic, _, kind, count = HEADER.unpack_from(data, 0)
+        HEADER.pack_into(data, 0, magic, 1, kind, count)
+
+        if isinstance(rng, CounterRandom):
+            with pytest.raises(ValueError):
+                SnapshotReader(data)
+        else:
+            assert restore(bytes(data)).enemy_character.name == "Rust"
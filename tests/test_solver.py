@@ -0,0 +1,110 @@
+from src.core import ActionType, Character, simulate
+from src.core.roster import Archetype, SpecialEffect
+from src.core.solver import enemy_ai_policy, solve
+from functools import partial
+import pytest
+
+
+def archetype_factory(name, effect, amount=0):
+    """Factory for a character with little hp, which keeps the state space small."""
+
+    return partial(
+        Character.from_archetype,
+        Archetype(name, 20, 10, 40, name, special_effect=effect, special_amount=amount),
+    )
+
+
+class TestSolver:
+    """Test cases for the exact battle solver."""
+
+    @pytest.mark.parametrize(
+        "matchup",
+        [
+            (SpecialEffect.CONFUSE, SpecialEffect.SKIP_TURN),
+            (SpecialEffect.SKIP_TURN, SpecialEffect.HEAL),
+            (SpecialEffect.HEAL, SpecialEffect.HEAL),
+        ],
+    )
+    def test_solve_matches_simulation(self, matchup):
+        """Test the exact results against a large simulation."""
+
+        first = archetype_factory("First", matchup[0], 15)
+        second = archetype_factory("Second", matchup[1], 15)
+
+        solution = solve((first, second))
+        result = simulate((first, second), 40_000, seed=5)
+
+        assert solution.matchup == ("First", "Second")
+        assert solution.win_probability() == pytest.approx(
+            result.win_rate(0), abs=0.015
+        )
+        assert solution.expected_length() == pytest.approx(
+            result.mean_turns(), rel=0.03
+        )
+
+    def test_state_lookup(self):
+        """Test looking up states reached during a battle."""
+
+        first = archetype_factory("First", SpecialEffect.CONFUSE)
+        second = archetype_factory("Second", SpecialEffect.HEAL, 15)
+
+        def always_attack(state):
+            return ((ActionType.ATTACK, 1.0),)
+
+        solution = solve((first, second), (always_attack, enemy_ai_policy))
+
+        assert len(solution) > 1
+        assert all(0.0 <= value <= 1.0 for value in solution.win_probabilities)
+        assert all(turns >= 1.0 for turns in solution.expected_turns)
+        # Attacks deal at least 5 damage to a character that is not defending
+        finishing = [
+            state
+            for state in solution.index
+            if state[1] <= 5 and state[6] == 0 and state[4] == state[5] == 0
+        ]
+        assert finishing
+        for state in finishing:
+            assert solution.win_probability(state) == 1.0
+            assert solution.expected_length(state) == 1.0
+        with pytest.raises(KeyError):
+            solution.win_probability((40, 40, 0, 0, 0, 0, 1))
+
+    def test_custom_policy(self):
+        """Test solving with policies other than the enemy AI."""
+
+        first = archetype_factory("First", SpecialEffect.SKIP_TURN)
+        second = archetype_factory("Second", SpecialEffect.SKIP_TURN)
+
+        def always_attack(state):
+            return ((ActionType.ATTACK, 1.0),)
+
+        def always_defend(state):
+            return ((ActionType.DEFEND, 1.0),)
+
+        defending = solve((first, second), (always_attack, always_defend))
+        attacking = solve((first, second), (always_attack, enemy_ai_policy))
+
+        assert defending.win_probability() == 1.0
+        assert attacking.win_probability() > solve((first, second)).win_probability()
+        with pytest.raises(ValueError):
+            solve((first, second), (always_defend, always_defend))
+
+    def test_max_iterations(self):
+        """Test that components that do not converge in time raise an error."""
+
+        # Enough hp for heals to connect several hp pairs
+        healer = partial(
+            Character.from_archetype,
+            Archetype(
+                "Healer",
+                12,
+                5,
+                60,
+                "Heal",
+                special_effect=SpecialEffect.HEAL,
+                special_amount=20,
+            ),
+        )
+
+        with pytest.raises(ValueError, match="did not converge"):
+            solve((healer, healer), max_iterations=1)
@@ -0,0 +1,84 @@
+from src.core import Character, cPlusPlus, Python, Rust
+from src.core.roster import Archetype
+from src.core.team import TeamBattle, focus_target, random_target, simulate_teams
+from collections import Counter
+import pytest
+
+
+class TestTeamBattle:
+    """Test cases for battles between teams."""
+
+    @pytest.fixture
+    def setup(self):
+        """Setup a 5v5 battle between characters of different speeds."""
+
+        self.fast = Archetype("Fast", 20, 10, speed=20)
+        self.slow = Archetype("Slow", 20, 10, speed=10)
+        self.battle = TeamBattle(
+            [
+                [Character.from_archetype(self.fast) for _ in range(5)],
+                [Character.from_archetype(self.slow) for _ in range(5)],
+            ],
+            rng=3,
+            log_capacity=None,
+        )
+
+    def test_initiative(self, setup):
+        """Test that faster characters take proportionally more turns."""
+
+        actors = []
+
+        def targeting(battle, slot):
+            actors.append(slot)
+            return random_target(battle, slot)
+
+        self.battle.targeting = targeting
+        for _ in range(30):
+            self.battle.handle_turn()
+
+        # The fast team acts twice before the slow team's first turn
+        assert actors[:10] == [0, 1, 2, 3, 4] * 2
+        teams = Counter(self.battle.team_of[slot] for slot in actors)
+        assert teams[0] == 2 * teams[1]
+
+    def test_win_detection(self, setup):
+        """Test the alive counters and lists against the characters' hp."""
+
+        winner = self.battle.run()
+
+        assert winner is not None and self.battle.game_over
+        for team in (0, 1):
+            standing = {
+                slot
+                for slot, character in enumerate(self.battle.characters)
+                if self.battle.team_of[slot] == team and character.is_alive()
+            }
+            assert set(self.battle.alive[team]) == standing
+            assert self.battle.alive_counts[team] == len(standing)
+        assert self.battle.alive_counts[1 - winner] == 0
+        assert self.battle.battle_log[-1] == f"Team {winner} wins!"
+        assert sum(
+            entry.endswith("has been defeated!") for entry in self.battle.battle_log
+        ) == 10 - self.battle.alive_counts[winner]
+
+    def test_simulate_teams(self):
+        """Test that raid simulations are reproducible and complete."""
+
+        teams = [[cPlusPlus, Python, Rust, Rust, Python], [Python] * 5]
+        result = simulate_teams(teams, 50, seed=9, targeting=focus_target)
+
+        assert result.battles == 50
+        assert sum(result.wins) + result.timeouts == 50
+        assert result.mean_turns() > 0
+        assert simulate_teams(teams, 50, seed=9, targeting=focus_target) == result
+
+        raid = simulate_teams([[Rust] * 50, [cPlusPlus] * 50], 1, seed=9)
+        assert raid.wins[0] + raid.wins[1] == 1
+
+    def test_invalid_teams(self):
+        """Test that a battle needs exactly two non-empty teams."""
+
+        with pytest.raises(ValueError):
+            TeamBattle([[Rust()], []])
+        with pytest.raises(ValueError):
+            TeamBattle([[Rust()], [Python()], [cPlusPlus()]])
@@ -0,0 +1,44 @@
+from src.core import Menu, cPlusPlus, Rust
+from src.core.tournament import run_tournament, shard_seed
+import pytest
+
+
+class TestTournament:
+    """Test cases for the tournament runner."""
+
+    def test_run_tournament(self):
+        """Test that every ordered matchup of the menu roster is simulated."""
+
+        result = run_tournament(battles=200, seed=1)
+
+        assert result.names == [character().name for character in Menu.characters]
+        assert len(result.results) == len(Menu.characters) ** 2
+        assert all(matchup.battles == 200 for matchup in result.results.values())
+
+        matrix = result.win_rate_matrix()
+        assert len(matrix) == len(matrix[0]) == len(Menu.characters)
+        assert all(0 <= rate <= 1 for row in matrix for rate in row)
+
+    def test_run_tournament_sharding(self):
+        """Test that results do not depend on the number of worker processes."""
+
+        single = run_tournament([cPlusPlus, Rust], 250, seed=3, shard_size=100)
+        pooled = run_tournament(
+            [cPlusPlus, Rust], 250, seed=3, workers=2, shard_size=100
+        )
+
+        assert single.results == pooled.results
+
+    @pytest.mark.parametrize("options", [dict(battles=0), dict(shard_size=0)])
+    def test_invalid_options(self, options):
+        """Test that tournaments without battles or shards are rejected."""
+
+        with pytest.raises(ValueError):
+            run_tournament([cPlusPlus, Rust], **options)
+
+    def test_shard_seed(self):
+        """Test that shard seeds are reproducible and distinct."""
+
+        assert shard_seed(1, 0, 1, 2) == shard_seed(1, 0, 1, 2)
+        assert shard_seed(1, 0, 1, 2) != shard_seed(1, 1, 0, 2)
+        assert shard_seed(1, 0, 1, 2) != shard_seed(2, 0, 1, 2)
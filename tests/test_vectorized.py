@@ -0,0 +1,119 @@
+from src.core import Battle, ActionType, simulate
+from src.core import cPlusPlus, Python, Rust
+from src.core.rng import make_rng
+import pytest
+
+# The vectorized kernel is optional and needs numpy
+np = pytest.importorskip("numpy")
+
+from src.core.vectorized import (  # noqa: E402
+    ATTACK,
+    DEFEND,
+    SPECIAL,
+    SKIP,
+    BatchState,
+    step,
+    run_batch,
+    matchup_matrix,
+)
+
+
+class TestVectorized:
+    """Test cases for the vectorized battle kernel."""
+
+    @pytest.fixture
+    def setup(self):
+        """Setup a batch of battles and a scalar battle with the same characters."""
+
+        self.state = BatchState([(Python, cPlusPlus)], [4])
+        self.battle = Battle(False, Python(), cPlusPlus())
+        self.rng = np.random.default_rng(1)
+
+    def test_init(self, setup):
+        """Test the initial state of the batch."""
+
+        assert len(self.state) == 4
+        assert self.state.current_turn == 0
+        assert (self.state.hp == 100).all()
+        assert not self.state.finished().any()
+
+    def test_step_defend(self, setup):
+        """Test that a defend action matches Battle.handle_turn."""
+
+        step(self.state, np.full(4, DEFEND), self.rng)
+        self.battle.handle_turn(ActionType.DEFEND)
+
+        assert self.state.current_turn == self.battle.current_turn
+        assert (
+            self.state.is_defending[0] == self.battle.target_character.is_defending
+        ).all()
+
+    def test_step_special(self, setup):
+        """Test that a special action matches Battle.handle_turn."""
+
+        step(self.state, np.full(4, SPECIAL), self.rng)
+        self.battle.handle_turn(ActionType.SPECIAL)
+
+        assert (
+            self.state.cooldown[0] == self.battle.target_character.special_cooldown
+        ).all()
+        assert (
+            self.state.skip_turn[1] == self.battle.selected_character.skip_turn
+        ).all()
+
+        # The skipped turn overrides the chosen action
+        actions = step(self.state, np.full(4, ATTACK), self.rng)
+        assert (actions == SKIP).all()
+        assert (self.state.hp[0] == 100).all()
+
+    def test_step_attack(self, setup):
+        """Test that attack damage stays within the damage roll range."""
+
+        self.state.is_defending[1, :2] = True
+        step(self.state, np.full(4, ATTACK), self.rng)
+
+        damage = 100 - self.state.hp[1]
+        assert ((damage[:2] >= 2) & (damage[:2] <= 10)).all()
+        assert ((damage[2:] >= 5) & (damage[2:] <= 20)).all()
+        assert not self.state.is_defending.any()
+
+    def test_run_batch_matches_battle(self, capsys):
+        """Test that the kernel agrees with Battle.handle_turn statistically."""
+
+        n = 2000
+        # One seeded source for every battle, so the scalar side is deterministic
+        rng = make_rng(2)
+        wins = 0
+        turns = 0
+        for _ in range(n):
+            battle = Battle(False, Python(player_character=True), Rust(), rng=rng)
+            while not battle._game_over:
+                action = battle.selected_character.get_enemy_action(battle.rng)
+                battle.handle_turn(action)
+            wins += battle.enemy_character.current_hp <= 0
+            turns += battle.current_turn
+
+        result = run_batch((Python, Rust), 20000, seed=2)
+
+        assert sum(result.wins) + result.timeouts == 20000
+        # Allow a few standard errors of the 2000 sample scalar estimates
+        assert abs(result.win_rate(0) - wins / n) < 0.03
+        assert abs(result.mean_turns() - turns / n) < 3
+
+    def test_matchup_matrix(self):
+        """Test that every ordered pair of characters is simulated."""
+
+        matrix = matchup_matrix([cPlusPlus, Python, Rust], 100, seed=1)
+
+        assert len(matrix) == 9
+        assert all(result.battles == 100 for result in matrix.values())
+        # Rust heals, so it should win most battles against C++
+        assert matrix[("Rust", "C++")].win_rate(0) > 0.5
+
+    def test_max_turns_matches_simulate(self):
+        """Test that both engines stop at the same odd turn limit."""
+
+        batched = run_batch((Rust, Rust), 200, seed=2, max_turns=5)
+        scalar = simulate((Rust, Rust), 200, seed=2, max_turns=5)
+
+        assert max(batched.turn_counts) == max(scalar.turn_counts) == 5